@@ -69,6 +69,70 @@ class ChartGenerator:
         plt.savefig(output_path)
         plt.close(fig)
 
+    @staticmethod
+    def generate_latency_breakdown_chart(df: pd.DataFrame, output_path: str) -> None:
+        components = [
+            ('server_latency', 'Serwer (MySQL: performance_schema, MongoDB: RTT komendy w sterowniku)'),
+            ('queue_time', 'Kolejka (pula)'),
+            ('driver_time', 'Sterownik (kodowanie/dekodowanie)'),
+            ('unattributed_time', 'Nieprzypisane (klient minus zmierzone składniki)'),
+        ]
+        data = df[df['client_latency'] > 0]
+        if data.empty:
+            return
+        avg = data.groupby(['operation', 'database'])[[c for c, _ in components] + ['client_latency']].mean()
+        labels = [f"{operation}\n{database}" for operation, database in avg.index]
+        x = np.arange(len(labels))
+
+        fig, ax = plt.subplots(figsize=(max(12, len(labels) * 1.2), 8))
+        bottom = np.zeros(len(labels))
+        for column, label in components:
+            values = avg[column].to_numpy()
+            ax.bar(x, values, 0.6, bottom=bottom, label=label)
+            bottom += values
+        ax.scatter(x, avg['client_latency'], color='black', marker='_', s=400, label='Opóźnienie klienta', zorder=3)
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels)
+        ax.set_ylabel('Średni czas operacji (ms)')
+        ax.set_title('Rozkład opóźnienia: serwer, kolejka, sterownik, nieprzypisane')
+        ax.legend()
+        ax.grid(True, axis='y')
+        plt.tight_layout()
+        plt.savefig(output_path)
+        plt.close(fig)
+
+    @staticmethod
+    def generate_percentile_chart(rows: List[Dict], output_path: str) -> None:
+        if not rows:
+            return
+        df = pd.DataFrame(rows)
+        percentiles = [('p50', 'p50'), ('p90', 'p90'), ('p99', 'p99'), ('p999', 'p99.9'), ('max', 'max')]
+        operations = list(dict.fromkeys(df['operation']))
+        databases = sorted(df['database'].unique())
+        x = np.arange(len(percentiles))
+        width = 0.8 / len(databases)
+
+        fig, axs = plt.subplots(len(operations), 1, figsize=(12, 5 * len(operations)))
+        if len(operations) == 1:
+            axs = [axs]
+        for ax, operation in zip(axs, operations):
+            for i, database in enumerate(databases):
+                data = df[(df['database'] == database) & (df['operation'] == operation)]
+                if data.empty:
+                    continue
+                values = [data[column].iat[0] for column, _ in percentiles]
+                ax.bar(x + i * width, values, width, label=database)
+            ax.set_xticks(x + width * (len(databases) - 1) / 2)
+            ax.set_xticklabels([label for _, label in percentiles])
+            ax.set_yscale('log')
+            ax.set_ylabel('Opóźnienie (ms)')
+            ax.set_title(f'{operation}: percentyle opóźnienia klienta (wszystkie iteracje)')
+            ax.legend()
+            ax.grid(True, axis='y')
+        plt.tight_layout()
+        plt.savefig(output_path)
+        plt.close(fig)
+
     @staticmethod
     def generate_histogram_chart(df: pd.DataFrame, output_path: str) -> None:
         operations = sorted(df['operation'].unique())
@@ -135,3 +199,59 @@ class ChartGenerator:
         plt.tight_layout()
         plt.savefig(output_path)
         plt.close(fig)
+
+    @staticmethod
+    def generate_latency_vs_load_chart(rows: List[Dict], output_path: str) -> None:
+        if not rows:
+            return
+        df = pd.DataFrame(rows)
+        operations = sorted(df['operation'].unique())
+        databases = sorted(df['database'].unique())
+        fig, axs = plt.subplots(len(operations), 1, figsize=(12, 6 * len(operations)))
+        if len(operations) == 1:
+            axs = [axs]
+        for i, operation in enumerate(operations):
+            for database in databases:
+                data = df[(df['database'] == database) & (df['operation'] == operation)].sort_values('offered_rate')
+                if data.empty:
+                    continue
+                line, = axs[i].plot(data['offered_rate'], data['p99'], marker='o', label=f'{database} p99')
+                axs[i].plot(data['offered_rate'], data['p50'], marker='s', linestyle='--', color=line.get_color(),
+                            label=f'{database} p50')
+            axs[i].set_title(operation)
+            axs[i].set_xlabel('Zadane obciążenie (req/s)')
+            axs[i].set_ylabel('Opóźnienie (ms)')
+            axs[i].set_yscale('log')
+            axs[i].legend()
+            axs[i].grid(True)
+        plt.tight_layout()
+        plt.savefig(output_path)
+        plt.close(fig)
+
+    @staticmethod
+    def generate_workload_chart(rows: List[Dict], output_path: str) -> None:
+        if not rows:
+            return
+        df = pd.DataFrame(rows)
+        operations = list(dict.fromkeys(df['operation']))
+        databases = sorted(df['database'].unique())
+        x = np.arange(len(operations))
+        width = 0.8 / len(databases)
+
+        fig, axs = plt.subplots(1, 2, figsize=(16, 6))
+        for i, database in enumerate(databases):
+            data = df[df['database'] == database].set_index('operation').reindex(operations).fillna(0)
+            axs[0].bar(x + i * width, data['ops_per_sec'], width, label=database)
+            axs[1].bar(x + i * width, data['p99'], width, label=f'{database} p99')
+            axs[1].scatter(x + i * width, data['p50'], color='black', marker='_', s=200)
+
+        for ax, ylabel in zip(axs, ['Przepustowość (ops/s)', 'Opóźnienie p99 (ms), kreska = p50']):
+            ax.set_xticks(x + width * (len(databases) - 1) / 2)
+            ax.set_xticklabels(operations)
+            ax.set_ylabel(ylabel)
+            ax.legend()
+            ax.grid(True, axis='y')
+        fig.suptitle(f"Workload {str(df['workload'].iat[0]).upper()}")
+        plt.tight_layout()
+        plt.savefig(output_path)
+        plt.close(fig)
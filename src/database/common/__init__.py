@@ -1,7 +1,8 @@
 from .database_connection import DatabaseConnection
-from .connection_pool import ConnectionPool
+from .connection_pool import ConnectionPool, PoolMetrics, PoolTimeoutError
 from .query_executor import QueryExecutor
 from .repository import Repository
 from .index_manager import IndexManager
 from .retry_decorator import RetryDecorator
 from .index_types import IndexType
+from .resource_registry import ResourceRegistry
@@ -1,5 +1,5 @@
 import os
-from typing import Any
+from typing import Any, Dict
 
 
 class ConfigManager:
@@ -43,6 +43,12 @@ class ConfigManager:
     def get(self, key: str, default: Any = None) -> Any:
         return self._config.get(key, default)
 
+    def set(self, key: str, value: Any) -> None:
+        self._config[key] = value
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self._config)
+
     def get_mysql_connection_string(self) -> str:
         return f"mysql://{self.get('mysql_user')}:{self.get('mysql_password')}@{self.get('mysql_host')}:{self.get('mysql_port')}/{self.get('mysql_database')}"
 
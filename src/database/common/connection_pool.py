@@ -1,46 +1,266 @@
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List
+
 from ..utils.logging_config import ProgressLogger
 
+WAIT_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolTimeoutError(TimeoutError):
+    pass
+
+
+@dataclass
+class PoolMetrics:
+    pool_size: int = 0
+    created: int = 0
+    closed: int = 0
+    checkouts: int = 0
+    timeouts: int = 0
+    waits: int = 0
+    in_use: int = 0
+    max_in_use: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    warm_up_ms: float = 0.0
+    wait_histogram: List[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS_MS) + 1))
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                self.wait_histogram[i] += 1
+                return
+        self.wait_histogram[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={b}ms" for b in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]}ms"]
+        return {
+            "pool_size": self.pool_size,
+            "created": self.created,
+            "closed": self.closed,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "waits": self.waits,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "total_wait_ms": self.total_wait_ms,
+            "mean_wait_ms": self.total_wait_ms / self.checkouts if self.checkouts else 0.0,
+            "max_wait_ms": self.max_wait_ms,
+            "warm_up_ms": self.warm_up_ms,
+            "wait_histogram": dict(zip(labels, self.wait_histogram)),
+        }
+
+
+@dataclass
+class _ConnectionState:
+    created_at: float
+    last_used: float
+
+
+class _Waiter:
+    def __init__(self):
+        self.event = threading.Event()
+        self.connection = None
+        self.may_create = False
+
 
 class ConnectionPool:
-    def __init__(self, pool_size: int = 5):
+    def __init__(self, pool_size: int = 5, timeout: float = 30.0, max_lifetime: float = 0.0,
+                 idle_timeout: float = 0.0, validation_interval: float = 30.0):
         self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.validation_interval = validation_interval
         self._lock = threading.Lock()
-        self._connections = []
-        ProgressLogger.print(f'Initialized connection pool (size={pool_size})')
+        self._idle: Deque[Any] = deque()
+        self._waiters: Deque[_Waiter] = deque()
+        self._states: Dict[int, _ConnectionState] = {}
+        self._total = 0
+        self._closed = False
+        self.metrics = PoolMetrics(pool_size=pool_size)
+        ProgressLogger.print(f'Initialized connection pool (size={pool_size}, timeout={timeout}s)')
 
     def create_connection(self):
         raise NotImplementedError
 
-    def get_connection(self):
+    def _expired(self, conn, now: float) -> bool:
+        state = self._states.get(id(conn))
+        if state is None:
+            return True
+        if self.max_lifetime and now - state.created_at > self.max_lifetime:
+            return True
+        return bool(self.idle_timeout and now - state.last_used > self.idle_timeout)
+
+    def _needs_validation(self, conn, now: float) -> bool:
+        state = self._states.get(id(conn))
+        return bool(self.validation_interval and state and now - state.last_used > self.validation_interval)
+
+    def _new_connection(self):
+        try:
+            conn = self.create_connection()
+        except Exception:
+            with self._lock:
+                self._total -= 1
+                self._hand_over_slot()
+            raise
+        now = time.monotonic()
+        with self._lock:
+            self._states[id(conn)] = _ConnectionState(created_at=now, last_used=now)
+            self.metrics.created += 1
+        return conn
+
+    def _discard(self, conn) -> None:
+        try:
+            conn.close_connection()
+        except Exception as e:
+            ProgressLogger.error(f'Error closing connection: {e}')
         with self._lock:
-            for conn in self._connections:
-                if conn.is_connected():
-                    self._connections.remove(conn)
-                    return conn
-            if len(self._connections) < self.pool_size:
-                conn = self.create_connection()
-                ProgressLogger.print('Created new connection')
+            self._states.pop(id(conn), None)
+            self._total -= 1
+            self.metrics.closed += 1
+            self._hand_over_slot()
+
+    def _hand_over_slot(self) -> None:
+        if self._waiters and self._total < self.pool_size and not self._closed:
+            waiter = self._waiters.popleft()
+            self._total += 1
+            waiter.may_create = True
+            waiter.event.set()
+
+    def _checked_out(self, started: float) -> None:
+        with self._lock:
+            self.metrics.checkouts += 1
+            self.metrics.in_use += 1
+            self.metrics.max_in_use = max(self.metrics.max_in_use, self.metrics.in_use)
+            self.metrics.record_wait((time.perf_counter() - started) * 1000)
+
+    def _take(self, started: float):
+        deadline = started + self.timeout
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError('Connection pool is closed')
+                waiter = None
+                conn = None
+                create = False
+                if self._idle and not self._waiters:
+                    conn = self._idle.pop()
+                elif self._total < self.pool_size and not self._waiters:
+                    self._total += 1
+                    create = True
+                else:
+                    waiter = _Waiter()
+                    self._waiters.append(waiter)
+                    self.metrics.waits += 1
+
+            if waiter is not None:
+                if not waiter.event.wait(max(0.0, deadline - time.perf_counter())):
+                    with self._lock:
+                        if waiter in self._waiters:
+                            self._waiters.remove(waiter)
+                            self.metrics.timeouts += 1
+                            raise PoolTimeoutError(
+                                f'Timed out after {self.timeout}s waiting for a connection (size={self.pool_size})'
+                            )
+                conn = waiter.connection
+                create = waiter.may_create
+
+            if create:
+                return self._new_connection()
+            if conn is None:
+                continue
+            if self._usable(conn):
                 return conn
-            ProgressLogger.error(f'Connection limit reached ({self.pool_size})')
-            return self.create_connection()
+            return self._replace(conn)
+
+    def _usable(self, conn) -> bool:
+        now = time.monotonic()
+        if self._expired(conn, now) or not conn.is_connected():
+            return False
+        return not self._needs_validation(conn, now) or conn.ping()
+
+    def _replace(self, conn):
+        try:
+            conn.close_connection()
+        except Exception as e:
+            ProgressLogger.error(f'Error closing connection: {e}')
+        with self._lock:
+            self._states.pop(id(conn), None)
+            self.metrics.closed += 1
+        return self._new_connection()
+
+    def get_connection(self):
+        started = time.perf_counter()
+        conn = self._take(started)
+        self._checked_out(started)
+        return conn
 
     def release_connection(self, conn):
         if not conn:
             return
         with self._lock:
-            if conn.is_connected() and len(self._connections) < self.pool_size:
-                self._connections.append(conn)
-                return
-        conn.close_connection()
-        ProgressLogger.print('Closed connection')
+            self.metrics.in_use -= 1
+            state = self._states.get(id(conn))
+            if state is not None:
+                state.last_used = time.monotonic()
+        if self._closed or not conn.is_connected() or self._expired(conn, time.monotonic()):
+            self._discard(conn)
+            return
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.connection = conn
+                waiter.event.set()
+            else:
+                self._idle.append(conn)
+
+    def _warm_connection(self):
+        conn = self._new_connection()
+        if conn.ping():
+            return conn
+        self._discard(conn)
+        return None
+
+    def warm_up(self, connections: int = 0) -> float:
+        started = time.perf_counter()
+        with self._lock:
+            missing = max(0, min(self.pool_size, connections or self.pool_size) - self._total)
+            self._total += missing
+        warmed = []
+        if missing:
+            with ThreadPoolExecutor(max_workers=missing, thread_name_prefix="pool-warm-up") as executor:
+                for future in [executor.submit(self._warm_connection) for _ in range(missing)]:
+                    try:
+                        conn = future.result()
+                    except Exception as e:
+                        ProgressLogger.error(f'Error warming up connection: {e}')
+                        continue
+                    if conn is not None:
+                        warmed.append(conn)
+        with self._lock:
+            self._idle.extend(warmed)
+            self.metrics.warm_up_ms = (time.perf_counter() - started) * 1000
+        ProgressLogger.print(
+            f'Warmed up {len(warmed)}/{missing} connections in {self.metrics.warm_up_ms:.2f} ms'
+        )
+        return self.metrics.warm_up_ms
 
     def close_all(self):
         with self._lock:
-            for conn in self._connections:
-                try:
-                    conn.close_connection()
-                except Exception as e:
-                    ProgressLogger.error(f'Error closing connection: {e}')
-            self._connections.clear()
-            ProgressLogger.print('Closed all connections')
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for waiter in waiters:
+            waiter.event.set()
+        for conn in idle:
+            self._discard(conn)
+        ProgressLogger.print('Closed all connections')
@@ -14,6 +14,9 @@ class DatabaseConnection:
     def is_connected(self):
         pass
     
+    def ping(self) -> bool:
+        return self.is_connected()
+
     def __enter__(self):
         return self
     
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, asdict
+from typing import Any, Dict
+
+DICT = 'dict'
+TUPLE = 'tuple'
+STREAM = 'stream'
+RAW = 'raw'
+RAW_STREAM = 'raw_stream'
+MONGO_FETCH_MODES = (DICT, STREAM, RAW, RAW_STREAM)
+
+
+@dataclass
+class FetchStats:
+    calls: int = 0
+    rows: int = 0
+    batches: int = 0
+    client_time: float = 0.0
+    server_time: float = 0.0
+    decode_time: float = 0.0
+    round_trips: int = 0
+    first_row_time: float = 0.0
+    drain_time: float = 0.0
+
+    @property
+    def transfer_time(self) -> float:
+        return max(0.0, self.client_time - self.server_time - self.decode_time)
+
+    def add(self, other: 'FetchStats') -> None:
+        self.calls += other.calls
+        self.rows += other.rows
+        self.batches += other.batches
+        self.client_time += other.client_time
+        self.server_time += other.server_time
+        self.decode_time += other.decode_time
+        self.round_trips += other.round_trips
+        self.first_row_time += other.first_row_time
+        self.drain_time += other.drain_time
+
+    def mean_transfer_time(self) -> float:
+        return self.transfer_time / self.calls if self.calls else 0.0
+
+    def mean_decode_time(self) -> float:
+        return self.decode_time / self.calls if self.calls else 0.0
+
+    def mean_round_trips(self) -> float:
+        return self.round_trips / self.calls if self.calls else 0.0
+
+    def mean_first_row_time(self) -> float:
+        return self.first_row_time / self.calls if self.calls else 0.0
+
+    def mean_drain_time(self) -> float:
+        return self.drain_time / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        fields = asdict(self)
+        fields['transfer_time'] = self.transfer_time
+        return fields
@@ -0,0 +1,99 @@
+from typing import Any, Dict, Iterable, Optional
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+US_PER_MS = 1000
+
+PERCENTILES = (('p50', 50.0), ('p90', 90.0), ('p99', 99.0), ('p999', 99.9))
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    @staticmethod
+    def _index(value_us: int) -> int:
+        if value_us < SUB_BUCKETS:
+            return value_us
+        shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+        return SUB_BUCKETS + shift * SUB_BUCKETS + ((value_us >> shift) - SUB_BUCKETS)
+
+    @staticmethod
+    def _highest_equivalent(index: int) -> int:
+        if index < SUB_BUCKETS:
+            return index
+        shift, offset = divmod(index - SUB_BUCKETS, SUB_BUCKETS)
+        return ((SUB_BUCKETS + offset + 1) << shift) - 1
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        value_us = max(0, int(round(value_ms * US_PER_MS)))
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    @classmethod
+    def merged(cls, histograms: Iterable['LatencyHistogram']) -> 'LatencyHistogram':
+        result = cls()
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(-(-q * self.count // 100)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max_us) / US_PER_MS
+        return self.max_us / US_PER_MS
+
+    def mean(self) -> float:
+        return self.total_us / self.count / US_PER_MS if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        summary = {'count': self.count, 'mean': self.mean()}
+        summary.update({name: self.percentile(q) for name, q in PERCENTILES})
+        summary['max'] = self.max_us / US_PER_MS
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'unit': 'us',
+            'sub_bucket_bits': SUB_BUCKET_BITS,
+            'count': self.count,
+            'total': self.total_us,
+            'min': self.min_us or 0,
+            'max': self.max_us,
+            'buckets': [[index, self.counts[index]] for index in sorted(self.counts)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        if data.get('sub_bucket_bits', SUB_BUCKET_BITS) != SUB_BUCKET_BITS:
+            raise ValueError(f"Unsupported histogram resolution: {data.get('sub_bucket_bits')} sub-bucket bits")
+        histogram = cls()
+        histogram.counts = {int(index): int(count) for index, count in data.get('buckets', [])}
+        histogram.count = int(data.get('count', 0))
+        histogram.total_us = int(data.get('total', 0))
+        histogram.min_us = int(data['min']) if histogram.count else None
+        histogram.max_us = int(data.get('max', 0))
+        return histogram
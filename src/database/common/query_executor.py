@@ -1,3 +1,5 @@
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 import logging
 from ..utils.logging_config import ProgressLogger
@@ -7,21 +9,44 @@ class QueryExecutor:
     def __init__(self, connection_pool, max_workers: int):
         self.connection_pool = connection_pool
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self.executor_wait_ms = 0.0
 
     def shutdown(self):
         if self._executor:
             self._executor.shutdown(wait=True)
             ProgressLogger.print("ThreadPoolExecutor shutdown complete")
 
+    def warm_up(self) -> float:
+        return self.connection_pool.warm_up()
+
+    def pool_metrics(self) -> dict:
+        metrics = self.connection_pool.metrics.snapshot()
+        metrics["executor_wait_ms"] = self.executor_wait_ms
+        return metrics
+
+    def run(self, fn, *args):
+        submitted = time.perf_counter_ns()
+
+        def _run():
+            waited = (time.perf_counter_ns() - submitted) / 1e6
+            with self._lock:
+                self.executor_wait_ms += waited
+            conn = self.connection_pool.get_connection()
+            try:
+                return fn(conn, *args)
+            finally:
+                self.connection_pool.release_connection(conn)
+        return self._executor.submit(_run)
+
     def execute_query(self, query: str, params=None):
         def _run(query_text, parameters):
             conn = self.connection_pool.get_connection()
             try:
-                cursor = conn.get_cursor()
-                cursor.execute(query_text, parameters or ())
-                return cursor.fetchall()
+                with conn.get_cursor() as cursor:
+                    cursor.execute(query_text, parameters or ())
+                    return cursor.fetchall()
             finally:
-                cursor.close()
                 self.connection_pool.release_connection(conn)
         return self._executor.submit(_run, query, params)
 
@@ -29,10 +54,9 @@ class QueryExecutor:
         def _run(query_text, parameter_list):
             conn = self.connection_pool.get_connection()
             try:
-                cursor = conn.get_cursor()
-                cursor.executemany(query_text, parameter_list)
-                return cursor.rowcount
+                with conn.get_cursor() as cursor:
+                    cursor.executemany(query_text, parameter_list)
+                    return cursor.rowcount
             finally:
-                cursor.close()
                 self.connection_pool.release_connection(conn)
         return self._executor.submit(_run, query, params_list)
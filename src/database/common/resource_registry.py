@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+from .config_manager import ConfigManager
+from ..utils.logging_config import ProgressLogger
+
+
+class ResourceRegistry:
+    _lock = threading.Lock()
+    _resources: Dict[Tuple[str, ...], Any] = {}
+
+    @classmethod
+    def _get_or_create(cls, key: Tuple[str, ...], factory: Callable[[], Any]) -> Any:
+        with cls._lock:
+            resource = cls._resources.get(key)
+            if resource is None:
+                resource = factory()
+                cls._resources[key] = resource
+                ProgressLogger.print(f"Registered shared resource: {key[0]}")
+            return resource
+
+    @classmethod
+    def mysql_executor(cls, config_manager: ConfigManager):
+        from ..mysql.mysql_query_executor import MySQLQueryExecutor
+        return cls._get_or_create(
+            ("mysql_executor", config_manager.get_mysql_connection_string()),
+            lambda: MySQLQueryExecutor(config_manager=config_manager)
+        )
+
+    @classmethod
+    def mysql_connection(cls, config_manager: ConfigManager):
+        from ..mysql.mysql_connection import MySQLConnection
+        return cls._get_or_create(
+            ("mysql_connection", config_manager.get_mysql_connection_string()),
+            lambda: MySQLConnection(config_manager=config_manager)
+        )
+
+    @classmethod
+    def mongodb_connection(cls, connection_str: str, db_name: str, config_manager: ConfigManager):
+        from ..mongodb.mongodb_connection import MongoDBConnection
+        return cls._get_or_create(
+            ("mongodb_connection", connection_str, db_name),
+            lambda: MongoDBConnection(connection_str, db_name, config_manager)
+        )
+
+    @classmethod
+    def executor(cls, name: str, max_workers: int) -> ThreadPoolExecutor:
+        return cls._get_or_create(
+            ("executor", name),
+            lambda: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        )
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._lock:
+            resources = list(cls._resources.items())
+            cls._resources.clear()
+        for key, resource in resources:
+            try:
+                if isinstance(resource, ThreadPoolExecutor):
+                    resource.shutdown(wait=True)
+                elif hasattr(resource, "close"):
+                    resource.close()
+                else:
+                    resource.close_connection()
+                ProgressLogger.print(f"Closed shared resource: {key[0]}")
+            except Exception as e:
+                ProgressLogger.error(f"Error closing shared resource {key[0]}: {e}")
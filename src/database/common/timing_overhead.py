@@ -0,0 +1,40 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class TimingOverhead:
+    _current: ContextVar[Optional['TimingOverhead']] = ContextVar('timing_overhead', default=None)
+
+    def __init__(self):
+        self.ns = 0
+
+    @property
+    def ms(self) -> float:
+        return self.ns / 1e6
+
+    @classmethod
+    def add(cls, ns: int) -> None:
+        overhead = cls._current.get()
+        if overhead is not None:
+            overhead.ns += ns
+
+    @classmethod
+    @contextmanager
+    def excluded(cls) -> Iterator[None]:
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            cls.add(time.perf_counter_ns() - started)
+
+    @classmethod
+    @contextmanager
+    def measure(cls) -> Iterator['TimingOverhead']:
+        overhead = cls()
+        token = cls._current.set(overhead)
+        try:
+            yield overhead
+        finally:
+            cls._current.reset(token)
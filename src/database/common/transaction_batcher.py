@@ -0,0 +1,126 @@
+import threading
+import time
+from typing import Any, Callable, List, Tuple
+
+from .config_manager import ConfigManager
+from ..utils.logging_config import ProgressLogger
+
+AUTOCOMMIT = 'autocommit'
+TRANSACTION = 'transaction'
+TRANSACTION_MODES = (AUTOCOMMIT, TRANSACTION)
+
+BATCHES = 'batches'
+ROWS = 'rows'
+COMMIT_UNITS = (BATCHES, ROWS)
+
+
+class _TransactionState:
+    def __init__(self, handle: Any):
+        self.handle = handle
+        self.open = False
+        self.rows = 0
+        self.batches = 0
+
+
+class TransactionBatcher:
+    def __init__(
+            self,
+            interval: int,
+            unit: str,
+            acquire: Callable[[], Any],
+            begin: Callable[[Any], None],
+            commit: Callable[[Any], None],
+            abort: Callable[[Any], None],
+            release: Callable[[Any], None]
+    ):
+        self.interval = max(1, interval)
+        self.unit = unit
+        self._acquire = acquire
+        self._begin = begin
+        self._commit = commit
+        self._abort = abort
+        self._release = release
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._states: List[_TransactionState] = []
+        self.commit_time = 0.0
+        self.commits = 0
+
+    @classmethod
+    def from_config(cls, config_manager: ConfigManager, **callbacks) -> 'TransactionBatcher':
+        return cls(
+            int(config_manager.get('commit_interval', 1)),
+            config_manager.get('commit_unit', BATCHES),
+            **callbacks
+        )
+
+    def _state(self) -> _TransactionState:
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = _TransactionState(self._acquire())
+            self._local.state = state
+            with self._lock:
+                self._states.append(state)
+        return state
+
+    def handle(self) -> Any:
+        state = self._state()
+        if not state.open:
+            self._begin(state.handle)
+            state.open = True
+        return state.handle
+
+    def _commit_state(self, state: _TransactionState) -> None:
+        started = time.perf_counter()
+        self._commit(state.handle)
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.commit_time += elapsed
+            self.commits += 1
+        state.open = False
+        state.rows = 0
+        state.batches = 0
+
+    def record(self, rows: int) -> None:
+        state = self._state()
+        state.rows += rows
+        state.batches += 1
+        pending = state.rows if self.unit == ROWS else state.batches
+        if pending >= self.interval:
+            self._commit_state(state)
+
+    def abort(self) -> None:
+        state = self._state()
+        if not state.open:
+            return
+        ProgressLogger.error(f"Aborting transaction with {state.rows} uncommitted rows")
+        try:
+            self._abort(state.handle)
+        finally:
+            state.open = False
+            state.rows = 0
+            state.batches = 0
+
+    def commit_all(self) -> None:
+        with self._lock:
+            states = list(self._states)
+            self._states.clear()
+        self._local = threading.local()
+        for state in states:
+            try:
+                if state.open:
+                    self._commit_state(state)
+            finally:
+                self._release(state.handle)
+
+    def add_commit_stats(self, commit_time: float, commits: int) -> None:
+        with self._lock:
+            self.commit_time += commit_time
+            self.commits += commits
+
+    def take_commit_stats(self) -> Tuple[float, int]:
+        with self._lock:
+            stats = (self.commit_time, self.commits)
+            self.commit_time = 0.0
+            self.commits = 0
+        return stats
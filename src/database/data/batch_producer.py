@@ -0,0 +1,56 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+class BatchProducer(threading.Thread):
+    _DONE = object()
+    _PUT_TIMEOUT = 0.1
+
+    def __init__(self, batches: Iterable[List[Dict[str, Any]]], queue_depth: int):
+        super().__init__(name="batch-producer", daemon=True)
+        self._batches = batches
+        self._queue = queue.Queue(maxsize=max(1, queue_depth))
+        self._stopped = threading.Event()
+        self._error = None
+        self.wait_time = 0.0
+
+    def run(self):
+        try:
+            for batch in self._batches:
+                if not self._put(batch):
+                    return
+        except Exception as e:
+            self._error = e
+        finally:
+            self._put(self._DONE)
+
+    def _put(self, item) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=self._PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        while True:
+            started = time.perf_counter()
+            item = self._queue.get()
+            self.wait_time += (time.perf_counter() - started) * 1000
+            if item is self._DONE:
+                if self._error is not None:
+                    raise self._error
+                return
+            yield item
+
+    def stop(self):
+        self._stopped.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self.join()
@@ -0,0 +1,58 @@
+import uuid
+from typing import Dict, Iterator, List, Any, Optional
+
+import numpy as np
+
+from .data_generator import DataGenerator
+from .distributions import DistributionConfig
+
+
+class ClientDatasetView:
+    def __init__(self, dataset: 'ClientDataset', client_id: int):
+        self.dataset = dataset
+        self.client_id = client_id
+
+    def __len__(self) -> int:
+        return self.dataset.client_sizes[self.client_id]
+
+    def get_batch(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        return DataGenerator.columns_to_records(
+            self.dataset.columns, self.dataset.record_type, self.client_id, start, stop,
+            self.dataset.distribution
+        )
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        batch_size = max(1, batch_size)
+        for start in range(0, len(self), batch_size):
+            yield self.get_batch(start, min(start + batch_size, len(self)))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for batch in self.iter_batches(DataGenerator.STREAM_CHUNK_SIZE):
+            yield from batch
+
+
+class ClientDataset:
+    def __init__(self, columns: Dict[str, np.ndarray], record_type: str, num_clients: int,
+                 client_sizes: Optional[List[int]] = None, distribution: Optional[DistributionConfig] = None,
+                 key: Optional[str] = None):
+        self.columns = columns
+        self.key = key or uuid.uuid4().hex
+        self.record_type = record_type
+        self.num_clients = num_clients
+        self.distribution = distribution
+        self.client_sizes = client_sizes or [self.count] * num_clients
+        self.views = [ClientDatasetView(self, client_id) for client_id in range(num_clients)]
+
+    @property
+    def count(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __len__(self) -> int:
+        return sum(self.client_sizes)
+
+    def client(self, client_id: int) -> ClientDatasetView:
+        return self.views[client_id]
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        for view in self.views:
+            yield from view.iter_batches(batch_size)
@@ -1,7 +1,11 @@
-import random
 from dataclasses import dataclass
-from typing import Generator, List, Dict, Any
+from itertools import islice
+from typing import Generator, List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
 from ..common.record_types import RecordType
+from .distributions import DistributionConfig
 
 @dataclass
 class FullRecord:
@@ -39,8 +43,16 @@ class DataGenerator:
         "ul. Jana Pawła II 20, 10-001 Szczecin", "ul. Reymonta 11, 20-001 Bydgoszcz"
     ]
 
+    MIN_AGE = 18
+    MAX_AGE = 80
+    MIN_VALUE = 1
+    MAX_VALUE = 1000000
+    STREAM_CHUNK_SIZE = 10000
+
     _name_combinations = None
+    _emails = None
     _email_cache = {}
+    _vocabularies = {}
 
     @classmethod
     def _initialize_cache(cls):
@@ -50,6 +62,7 @@ class DataGenerator:
                 email_key = (first, last)
                 if email_key not in cls._email_cache:
                     cls._email_cache[email_key] = f"{first.lower()}.{last.lower()}@example.com"
+            cls._emails = [cls._email_cache[key] for key in cls._name_combinations]
 
     @classmethod
     def generate_email(cls, first_name: str, last_name: str) -> str:
@@ -62,61 +75,112 @@ class DataGenerator:
         cls._email_cache[email_key] = email
         return email
 
-
+    @staticmethod
+    def _expand(values: List[str], cardinality: int, suffix_format: str) -> List[str]:
+        if cardinality <= 0:
+            return values
+        return [
+            values[i % len(values)] + (suffix_format.format(i // len(values)) if i >= len(values) else '')
+            for i in range(cardinality)
+        ]
 
     @classmethod
-    def generate_people_list(cls, count: int, client_id: int, record_type: str) -> List[Dict[str, Any]]:
-        if record_type.lower() == RecordType.SMALL.value:
-            return cls._generate_simple_records(count, client_id)
+    def _vocabulary(cls, distribution: Optional[DistributionConfig]) -> Tuple[List[Tuple[str, str]], List[str], List[str]]:
         if cls._name_combinations is None:
             cls._initialize_cache()
+        key = (
+            (distribution.first_name_cardinality, distribution.last_name_cardinality, distribution.address_cardinality)
+            if distribution else (0, 0, 0)
+        )
+        if key == (0, 0, 0):
+            return cls._name_combinations, cls._emails, cls.addresses
+        if key not in cls._vocabularies:
+            first_names = cls._expand(cls.first_names, key[0], "{}")
+            last_names = cls._expand(cls.last_names, key[1], "{}")
+            addresses = cls._expand(cls.addresses, key[2], ", lok. {}")
+            name_combinations = [(first, last) for first in first_names for last in last_names]
+            emails = [cls.generate_email(first, last) for first, last in name_combinations]
+            cls._vocabularies[key] = (name_combinations, emails, addresses)
+        return cls._vocabularies[key]
+
+    @classmethod
+    def generate_columns(cls, count: int, record_type: str, seed: Optional[int] = None,
+                         distribution: Optional[DistributionConfig] = None) -> Dict[str, np.ndarray]:
+        rng = np.random.default_rng(seed)
+        distribution = distribution or DistributionConfig()
+        if record_type.lower() == RecordType.SMALL.value:
+            return {
+                'value': distribution.draw(rng, cls.MIN_VALUE, cls.MAX_VALUE, count)
+            }
+        name_combinations, _, addresses = cls._vocabulary(distribution)
+        return {
+            'name_idx': distribution.draw(rng, 0, len(name_combinations) - 1, count),
+            'address_idx': distribution.draw(rng, 0, len(addresses) - 1, count),
+            'age': distribution.draw(rng, cls.MIN_AGE, cls.MAX_AGE, count),
+        }
+
+    @classmethod
+    def columns_to_records(
+            cls,
+            columns: Dict[str, np.ndarray],
+            record_type: str,
+            client_id: int,
+            start: int = 0,
+            stop: Optional[int] = None,
+            distribution: Optional[DistributionConfig] = None
+    ) -> List[Dict[str, Any]]:
+        if record_type.lower() == RecordType.SMALL.value:
+            return [
+                {'value': value, 'client_id': client_id}
+                for value in columns['value'][start:stop].tolist()
+            ]
+        name_combinations, emails, addresses = cls._vocabulary(distribution)
         result = []
-        name_combinations = cls._name_combinations
-        addresses = cls.addresses
-        email_cache = cls._email_cache
-        for _ in range(count):
-            first_name, last_name = random.choice(name_combinations)
+        for name_idx, address_idx, age in zip(
+                columns['name_idx'][start:stop].tolist(),
+                columns['address_idx'][start:stop].tolist(),
+                columns['age'][start:stop].tolist()
+        ):
+            first_name, last_name = name_combinations[name_idx]
             result.append({
                 'first_name': first_name,
                 'last_name': last_name,
-                'email': email_cache[(first_name, last_name)],
-                'address': random.choice(addresses),
-                'age': random.randint(18, 80),
+                'email': emails[name_idx],
+                'address': addresses[address_idx],
+                'age': age,
                 'client_id': client_id
             })
         return result
 
     @classmethod
-    def _generate_simple_records(cls, count: int, client_id: int) -> List[Dict[str, Any]]:
-        result = []
-        for _ in range(count):
-            result.append({
-                'value': random.randint(1, 1000000),
-                'client_id': client_id
-            })
-        return result
+    def generate_people_list(cls, count: int, client_id: int, record_type: str,
+                             seed: Optional[int] = None,
+                             distribution: Optional[DistributionConfig] = None) -> List[Dict[str, Any]]:
+        columns = cls.generate_columns(count, record_type, seed, distribution)
+        return cls.columns_to_records(columns, record_type, client_id, distribution=distribution)
 
     @classmethod
-    def generate_records_stream(cls, count: int, client_id: int, record_type: str) -> Generator[Dict[str, Any], None, None]:
-        if record_type.lower() == RecordType.SMALL.value:
-            for _ in range(count):
-                yield {
-                    'value': random.randint(1, 1000000),
-                    'client_id': client_id
-                }
-            return
-        if cls._name_combinations is None:
-            cls._initialize_cache()
-        name_combinations = cls._name_combinations
-        addresses = cls.addresses
-        email_cache = cls._email_cache
-        for _ in range(count):
-            first_name, last_name = random.choice(name_combinations)
-            yield {
-                'first_name': first_name,
-                'last_name': last_name,
-                'email': email_cache[(first_name, last_name)],
-                'address': random.choice(addresses),
-                'age': random.randint(18, 80),
-                'client_id': client_id
-            }
\ No newline at end of file
+    def _generate_simple_records(cls, count: int, client_id: int, seed: Optional[int] = None,
+                                 distribution: Optional[DistributionConfig] = None) -> List[Dict[str, Any]]:
+        return cls.generate_people_list(count, client_id, RecordType.SMALL.value, seed, distribution)
+
+    @classmethod
+    def generate_records_stream(cls, count: int, client_id: int, record_type: str,
+                                seed: Optional[int] = None,
+                                distribution: Optional[DistributionConfig] = None) -> Generator[Dict[str, Any], None, None]:
+        rng = np.random.default_rng(seed)
+        for start in range(0, count, cls.STREAM_CHUNK_SIZE):
+            chunk_size = min(cls.STREAM_CHUNK_SIZE, count - start)
+            columns = cls.generate_columns(chunk_size, record_type, rng, distribution)
+            yield from cls.columns_to_records(columns, record_type, client_id, distribution=distribution)
+
+    @classmethod
+    def generate_batches_stream(cls, count: int, client_id: int, record_type: str, batch_size: int,
+                                seed: Optional[int] = None,
+                                distribution: Optional[DistributionConfig] = None) -> Generator[List[Dict[str, Any]], None, None]:
+        stream = cls.generate_records_stream(count, client_id, record_type, seed, distribution)
+        while True:
+            batch = list(islice(stream, max(1, batch_size)))
+            if not batch:
+                return
+            yield batch
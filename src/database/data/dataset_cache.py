@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..utils.logging_config import ProgressLogger
+
+
+class DatasetCache:
+    SCHEMA_VERSION = 2
+    META_FILE = "meta.json"
+    TMP_SUFFIX = ".tmp"
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._remove_stale_builds()
+
+    @classmethod
+    def build_key(cls, seed: int, record_type: str, records: int, clients: int, variant: str = '') -> str:
+        key = f"v{cls.SCHEMA_VERSION}_{record_type.lower()}_r{records}_c{clients}_s{seed}"
+        return f"{key}_{variant}" if variant else key
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _remove_stale_builds(self) -> None:
+        for name in os.listdir(self.cache_dir):
+            _, sep, pid = name.rpartition(self.TMP_SUFFIX)
+            if not sep:
+                continue
+            if pid.isdigit() and int(pid) != os.getpid() and self._pid_alive(int(pid)):
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            ProgressLogger.important_info(f"Removed unfinished dataset cache build {name}")
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        entry_dir = self._entry_dir(key)
+        meta_path = os.path.join(entry_dir, self.META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            columns = {
+                name: np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode='r')
+                for name in meta['columns']
+            }
+            os.utime(meta_path)
+            ProgressLogger.important_info(f"Loaded dataset {key} from cache")
+            return columns
+        except Exception as e:
+            ProgressLogger.error(f"Could not load cached dataset {key}: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+    def store(self, key: str, columns: Dict[str, np.ndarray]) -> None:
+        entry_dir = self._entry_dir(key)
+        tmp_dir = f"{entry_dir}{self.TMP_SUFFIX}{os.getpid()}"
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+            for name, column in columns.items():
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), column)
+            with open(os.path.join(tmp_dir, self.META_FILE), 'w') as f:
+                json.dump({
+                    'schema_version': self.SCHEMA_VERSION,
+                    'columns': list(columns),
+                    'created': time.time(),
+                }, f)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            ProgressLogger.important_info(f"Stored dataset {key} in cache")
+        except Exception as e:
+            ProgressLogger.error(f"Could not store dataset {key} in cache: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self._evict(keep=key)
+
+    def _entry_size(self, entry_dir: str) -> int:
+        return sum(
+            os.path.getsize(os.path.join(entry_dir, name))
+            for name in os.listdir(entry_dir)
+        )
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            meta_path = os.path.join(self._entry_dir(key), self.META_FILE)
+            if os.path.exists(meta_path):
+                entries.append((os.path.getmtime(meta_path), key, self._entry_size(self._entry_dir(key))))
+
+        total = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= size
+            ProgressLogger.important_info(f"Evicted dataset {key} from cache")
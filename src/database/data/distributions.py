@@ -0,0 +1,111 @@
+import hashlib
+import json
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..common.config_manager import ConfigManager
+
+UNIFORM = 'uniform'
+ZIPF = 'zipf'
+PARETO = 'pareto'
+LATEST = 'latest'
+
+CLIENT_SIZE_DISTRIBUTIONS = (UNIFORM, ZIPF, PARETO)
+VALUE_DISTRIBUTIONS = (UNIFORM, ZIPF)
+ACCESS_DISTRIBUTIONS = (UNIFORM, ZIPF, LATEST)
+
+CLIENT_SIZE_STREAM = 1
+ACCESS_STREAM = 2
+
+
+def zipf_weights(n: int, skew: float) -> np.ndarray:
+    weights = 1.0 / np.power(np.arange(1, n + 1, dtype=np.float64), skew)
+    return weights / weights.sum()
+
+
+def zipf_ranks(rng: np.random.Generator, n: int, skew: float, size: int) -> np.ndarray:
+    cdf = np.cumsum(zipf_weights(n, skew))
+    cdf[-1] = 1.0
+    return np.searchsorted(cdf, rng.random(size), side='right').astype(np.int32)
+
+
+@dataclass(frozen=True)
+class DistributionConfig:
+    client_sizes: str = UNIFORM
+    client_size_skew: float = 1.2
+    values: str = UNIFORM
+    value_skew: float = 1.1
+    access: str = UNIFORM
+    access_skew: float = 1.1
+    first_name_cardinality: int = 0
+    last_name_cardinality: int = 0
+    address_cardinality: int = 0
+
+    @classmethod
+    def from_config(cls, config_manager: ConfigManager) -> 'DistributionConfig':
+        defaults = cls()
+        return cls(
+            client_sizes=config_manager.get('client_size_dist', defaults.client_sizes),
+            client_size_skew=float(config_manager.get('client_size_skew', defaults.client_size_skew)),
+            values=config_manager.get('value_dist', defaults.values),
+            value_skew=float(config_manager.get('value_skew', defaults.value_skew)),
+            access=config_manager.get('access_dist', defaults.access),
+            access_skew=float(config_manager.get('access_skew', defaults.access_skew)),
+            first_name_cardinality=int(config_manager.get('first_name_cardinality', 0)),
+            last_name_cardinality=int(config_manager.get('last_name_cardinality', 0)),
+            address_cardinality=int(config_manager.get('address_cardinality', 0)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def cache_key(self) -> str:
+        if self == DistributionConfig():
+            return ''
+        digest = hashlib.sha1(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()
+        return digest[:10]
+
+    def draw(self, rng: np.random.Generator, low: int, high: int, size: int) -> np.ndarray:
+        if self.values == ZIPF:
+            return zipf_ranks(rng, high - low + 1, self.value_skew, size) + low
+        return rng.integers(low, high + 1, size=size, dtype=np.int32)
+
+    def client_record_counts(self, records: int, clients: int, seed: Optional[int]) -> List[int]:
+        if self.client_sizes == UNIFORM or clients <= 1:
+            return [records] * clients
+
+        if self.client_sizes == ZIPF:
+            weights = zipf_weights(clients, self.client_size_skew)
+        else:
+            rng = np.random.default_rng(None if seed is None else [seed, CLIENT_SIZE_STREAM])
+            weights = rng.pareto(self.client_size_skew, size=clients) + 1.0
+            weights = weights / weights.sum()
+
+        total = records * clients
+        counts = np.maximum(1, np.floor(weights * total).astype(np.int64))
+        counts[0] += max(0, total - int(counts.sum()))
+        excess = int(counts.sum()) - total
+        for i in np.argsort(-counts, kind='stable'):
+            if excess <= 0:
+                break
+            taken = min(excess, int(counts[i]) - 1)
+            counts[i] -= taken
+            excess -= taken
+        return counts.tolist()
+
+    def pick_targets(self, clients: int, seed: Optional[int], phase: int, unique: bool = False) -> List[int]:
+        if self.access == UNIFORM or clients <= 1:
+            return list(range(clients))
+
+        weights = zipf_weights(clients, self.access_skew)
+        if self.access == LATEST:
+            weights = weights[::-1]
+
+        rng = np.random.default_rng(None if seed is None else [seed, ACCESS_STREAM, phase])
+        targets = rng.choice(clients, size=clients, replace=True, p=weights)
+        if unique:
+            _, first = np.unique(targets, return_index=True)
+            targets = targets[np.sort(first)]
+        return targets.tolist()
@@ -1,23 +1,54 @@
-import gc
-from typing import List, Dict, Any
-from .data_generator import DataGenerator
-from ..common.record_types import RecordType
+from typing import List, Optional
+from .client_dataset import ClientDataset, ClientDatasetView
+from .dataset_cache import DatasetCache
+from .distributions import DistributionConfig
+from .parallel_data_generator import ParallelDataGenerator
 
 
 class MultiClientDataGenerator:
 
     @classmethod
-    def generate_data_for_clients(cls, total_count: int, num_clients: int, record_type: str) -> List[List[Dict[str, Any]]]:
+    def generate_dataset(cls, total_count: int, num_clients: int, record_type: str,
+                         seed: Optional[int] = None,
+                         distribution: Optional[DistributionConfig] = None,
+                         workers: Optional[int] = None) -> ClientDataset:
+        distribution = distribution or DistributionConfig()
+        client_sizes = distribution.client_record_counts(total_count, num_clients, seed)
+        base_columns = ParallelDataGenerator.generate_columns(
+            max(client_sizes, default=0), record_type, seed, distribution, workers
+        )
+        return ClientDataset(base_columns, record_type, num_clients, client_sizes, distribution,
+                             cls.dataset_key(total_count, num_clients, record_type, seed, distribution))
 
-        base_users = DataGenerator.generate_people_list(total_count, 0, record_type)
+    @staticmethod
+    def dataset_key(total_count: int, num_clients: int, record_type: str, seed: Optional[int],
+                    distribution: DistributionConfig) -> Optional[str]:
+        if seed is None:
+            return None
+        return DatasetCache.build_key(seed, record_type, total_count, num_clients, distribution.cache_key())
 
-        results: List[List[Dict[str, Any]]] = []
-        for client_id in range(num_clients):
-            batch = [
-                {**user, 'client_id': client_id}
-                for user in base_users
-            ]
-            results.append(batch)
+    @classmethod
+    def generate_data_for_clients(cls, total_count: int, num_clients: int, record_type: str,
+                                  seed: Optional[int] = None,
+                                  distribution: Optional[DistributionConfig] = None,
+                                  workers: Optional[int] = None) -> List[ClientDatasetView]:
+        return cls.generate_dataset(total_count, num_clients, record_type, seed, distribution, workers).views
+
+    @classmethod
+    def load_or_generate_dataset(cls, total_count: int, num_clients: int, record_type: str, seed: int,
+                                 cache: Optional[DatasetCache] = None,
+                                 distribution: Optional[DistributionConfig] = None,
+                                 workers: Optional[int] = None) -> ClientDataset:
+        if cache is None:
+            return cls.generate_dataset(total_count, num_clients, record_type, seed, distribution, workers)
+
+        distribution = distribution or DistributionConfig()
+        key = cls.dataset_key(total_count, num_clients, record_type, seed, distribution)
+        columns = cache.load(key)
+        if columns is not None:
+            client_sizes = distribution.client_record_counts(total_count, num_clients, seed)
+            return ClientDataset(columns, record_type, num_clients, client_sizes, distribution, key)
 
-        gc.collect()
-        return results
+        dataset = cls.generate_dataset(total_count, num_clients, record_type, seed, distribution, workers)
+        cache.store(key, dataset.columns)
+        return dataset
@@ -0,0 +1,87 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .data_generator import DataGenerator
+from .distributions import DistributionConfig
+from ..common.record_types import RecordType
+
+
+def _generate_chunk(
+        shm_names: Dict[str, str],
+        total: int,
+        start: int,
+        stop: int,
+        record_type: str,
+        seed_sequence: np.random.SeedSequence,
+        distribution: DistributionConfig
+) -> int:
+    columns = DataGenerator.generate_columns(stop - start, record_type, seed_sequence, distribution)
+    for name, shm_name in shm_names.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            target = np.ndarray((total,), dtype=ParallelDataGenerator.COLUMN_DTYPE, buffer=shm.buf)
+            target[start:stop] = columns[name]
+            del target
+        finally:
+            shm.close()
+    return stop - start
+
+
+class ParallelDataGenerator:
+    CHUNK_SIZE = 250000
+    COLUMN_DTYPE = np.int32
+
+    @staticmethod
+    def column_names(record_type: str) -> List[str]:
+        if record_type.lower() == RecordType.SMALL.value:
+            return ['value']
+        return ['name_idx', 'address_idx', 'age']
+
+    @classmethod
+    def _chunks(cls, count: int, seed: Optional[int]) -> List[Tuple[int, int, np.random.SeedSequence]]:
+        bounds = [(start, min(start + cls.CHUNK_SIZE, count)) for start in range(0, count, cls.CHUNK_SIZE)]
+        seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+        return [(start, stop, child) for (start, stop), child in zip(bounds, seeds)]
+
+    @classmethod
+    def generate_columns(cls, count: int, record_type: str, seed: Optional[int] = None,
+                         distribution: Optional[DistributionConfig] = None,
+                         workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+        distribution = distribution or DistributionConfig()
+        chunks = cls._chunks(count, seed)
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+        if workers <= 1:
+            columns = {name: np.empty(count, dtype=cls.COLUMN_DTYPE) for name in cls.column_names(record_type)}
+            for start, stop, child in chunks:
+                chunk = DataGenerator.generate_columns(stop - start, record_type, child, distribution)
+                for name, column in columns.items():
+                    column[start:stop] = chunk[name]
+            return columns
+
+        nbytes = count * np.dtype(cls.COLUMN_DTYPE).itemsize
+        buffers = {
+            name: shared_memory.SharedMemory(create=True, size=nbytes)
+            for name in cls.column_names(record_type)
+        }
+        try:
+            shm_names = {name: shm.name for name, shm in buffers.items()}
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_generate_chunk, shm_names, count, start, stop, record_type, child, distribution)
+                    for start, stop, child in chunks
+                ]
+                for future in futures:
+                    future.result()
+            return {
+                name: np.ndarray((count,), dtype=cls.COLUMN_DTYPE, buffer=shm.buf).copy()
+                for name, shm in buffers.items()
+            }
+        finally:
+            for shm in buffers.values():
+                shm.close()
+                shm.unlink()
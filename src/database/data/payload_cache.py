@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional
+
+from ..utils.logging_config import ProgressLogger
+
+
+@dataclass
+class EncodedBatch:
+    encoding: str
+    columns: List[str]
+    payload: Any
+    rows: int
+    nbytes: int
+    keys: Optional[List[Any]] = None
+
+
+class PayloadCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, EncodedBatch]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    def get(self, key: Hashable) -> Optional[EncodedBatch]:
+        with self._lock:
+            batch = self._entries.get(key)
+            if batch is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return batch
+
+    def put(self, key: Hashable, batch: EncodedBatch) -> bool:
+        with self._lock:
+            if batch.nbytes > self.max_bytes:
+                self.rejected += 1
+                return False
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous.nbytes
+            while self._entries and self.bytes + batch.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+            self._entries[key] = batch
+            self.bytes += batch.nbytes
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+        ProgressLogger.print("Cleared payload cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,103 @@
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import AsyncMongoClient, WriteConcern
+
+from .mongodb_command_monitor import MongoDBCommandMonitor, COMMAND, PROFILER
+from ..common.config_manager import ConfigManager
+from ..common.record_types import RecordType
+from ..common.timing_overhead import TimingOverhead
+from ..repositories.async_user_repository import AsyncUserRepository
+from ..utils.logging_config import ProgressLogger
+
+
+class MongoDBAsyncUserRepository(AsyncUserRepository):
+    def __init__(self, collection_name: str, config_manager: Optional[ConfigManager] = None):
+        self.config_manager = config_manager or ConfigManager()
+        self.collection_name = collection_name
+        self.client = None
+        self.collection = None
+        self.system_profile = None
+        self.timing = self.config_manager.get('mongo_timing', COMMAND)
+        self.monitor = MongoDBCommandMonitor()
+
+    def use(self, name: str) -> None:
+        self.collection_name = name
+        if self.client is not None:
+            self.collection = self.client[self.config_manager.get('mongodb_database')][name]
+
+    async def connect(self):
+        if self.client is not None:
+            return
+        max_pool_size = self.config_manager.get('mongodb_pool_size')
+        self.client = AsyncMongoClient(
+            self.config_manager.get_mongodb_connection_string(),
+            maxPoolSize=max_pool_size,
+            maxIdleTimeMS=30000,
+            waitQueueTimeoutMS=10000,
+            connectTimeoutMS=5000,
+            socketTimeoutMS=30000,
+            serverSelectionTimeoutMS=5000,
+            retryWrites=True,
+            w=1,
+            journal=False,
+            event_listeners=[self.monitor]
+        )
+        db = self.client[self.config_manager.get('mongodb_database')]
+        self.collection = db[self.collection_name]
+        self.system_profile = db["system.profile"]
+        await self.client.admin.command('ping')
+        ProgressLogger.print(f'Initialized async MongoDB client (max_pool_size={max_pool_size})')
+
+    def _begin(self) -> str:
+        token = uuid.uuid4().hex
+        self.monitor.begin(token)
+        return token
+
+    async def _op_time(self, token: str) -> float:
+        commands = self.monitor.end(token)
+        if self.timing != PROFILER:
+            return commands.server_time
+        with TimingOverhead.excluded():
+            entries = await self.system_profile.find({
+                "$or": [
+                    {"command.comment": token},
+                    {"originatingCommand.comment": token},
+                ]
+            }).to_list()
+        return sum(op.get("millis", 0) for op in entries)
+
+    async def create_users_bulk(self, docs: List[Dict]) -> Tuple[List[str], float]:
+        token = self._begin()
+        res = await self.collection.with_options(write_concern=WriteConcern(w=1)).insert_many(
+            docs, ordered=True, comment=token
+        )
+        return [str(_id) for _id in res.inserted_ids], await self._op_time(token)
+
+    async def get_all_users(self, client_id: int = None) -> Tuple[List[Dict], float]:
+        token = self._begin()
+        result = await self.collection.find({"client_id": client_id}, comment=token).to_list()
+        return result, await self._op_time(token)
+
+    async def update_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
+        token = self._begin()
+        if record_type == RecordType.SMALL.value:
+            update_data = {"$inc": {"value": 1}}
+        else:
+            update_data = {"$set": {"age": 30, "first_name": "test_name"}}
+        result = await self.collection.update_many({"client_id": client_id}, update_data, comment=token)
+        return result.modified_count, await self._op_time(token)
+
+    async def delete_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
+        token = self._begin()
+        result = await self.collection.delete_many({"client_id": client_id}, comment=token)
+        return result.deleted_count, await self._op_time(token)
+
+    async def clear_collection(self) -> bool:
+        await self.collection.drop()
+        return True
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
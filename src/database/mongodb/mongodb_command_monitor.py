@@ -0,0 +1,131 @@
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+GET_MORE = 'getMore'
+
+COMMAND = 'command'
+PROFILER = 'profiler'
+MONGO_TIMING_MODES = (COMMAND, PROFILER)
+
+
+@dataclass
+class CommandSample:
+    token: str
+    command_name: str
+    batch: int
+    duration_micros: int
+    documents: int
+    failed: bool = False
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_micros / 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        fields = asdict(self)
+        fields['duration_ms'] = self.duration_ms
+        return fields
+
+
+@dataclass
+class CommandStats:
+    commands: Dict[str, int] = field(default_factory=dict)
+    duration_micros: Dict[str, int] = field(default_factory=dict)
+    samples: List[CommandSample] = field(default_factory=list)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.commands.values())
+
+    @property
+    def get_more(self) -> int:
+        return self.commands.get(GET_MORE, 0)
+
+    @property
+    def server_time(self) -> float:
+        return sum(self.duration_micros.values()) / 1000
+
+    def _count(self, name: str) -> None:
+        self.commands[name] = self.commands.get(name, 0) + 1
+
+    def _add(self, sample: CommandSample) -> None:
+        self.duration_micros[sample.command_name] = (
+            self.duration_micros.get(sample.command_name, 0) + sample.duration_micros
+        )
+        self.samples.append(sample)
+
+
+def _documents(reply: Any) -> int:
+    if not reply:
+        return 0
+    cursor = reply.get('cursor')
+    if cursor:
+        batch = cursor.get('firstBatch')
+        if batch is None:
+            batch = cursor.get('nextBatch')
+        return len(batch or [])
+    return int(reply.get('n', 0) or 0)
+
+
+class MongoDBCommandMonitor(monitoring.CommandListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scopes: Dict[str, CommandStats] = {}
+        self._pending: Dict[Tuple[Any, int], Tuple[str, str, int, Optional[int]]] = {}
+        self._cursors: Dict[int, Tuple[str, int]] = {}
+
+    def begin(self, token: str) -> None:
+        with self._lock:
+            self._scopes[token] = CommandStats()
+
+    def end(self, token: str) -> CommandStats:
+        with self._lock:
+            stats = self._scopes.pop(token, None) or CommandStats()
+            for cursor_id in [c for c, (t, _) in self._cursors.items() if t == token]:
+                del self._cursors[cursor_id]
+        return stats
+
+    def _attribute(self, event) -> Optional[Tuple[str, int, Optional[int]]]:
+        if event.command_name == GET_MORE:
+            cursor_id = event.command.get(GET_MORE)
+            owner = self._cursors.get(cursor_id)
+            if owner is None:
+                return None
+            return owner[0], owner[1] + 1, cursor_id
+        token = event.command.get('comment')
+        if not isinstance(token, str):
+            return None
+        return token, 0, None
+
+    def started(self, event) -> None:
+        with self._lock:
+            attribution = self._attribute(event)
+            if attribution is None or attribution[0] not in self._scopes:
+                return
+            token, batch, cursor_id = attribution
+            self._scopes[token]._count(event.command_name)
+            self._pending[(event.connection_id, event.request_id)] = (token, event.command_name, batch, cursor_id)
+
+    def _finish(self, event, reply: Any, failed: bool) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+            if pending is None:
+                return
+            token, name, batch, cursor_id = pending
+            if cursor_id is not None:
+                self._cursors.pop(cursor_id, None)
+            cursor = reply.get('cursor') if reply else None
+            if cursor and cursor.get('id'):
+                self._cursors[cursor.get('id')] = (token, batch)
+            stats = self._scopes.get(token)
+            if stats is not None:
+                stats._add(CommandSample(token, name, batch, event.duration_micros, _documents(reply), failed))
+
+    def succeeded(self, event) -> None:
+        self._finish(event, event.reply, False)
+
+    def failed(self, event) -> None:
+        self._finish(event, None, True)
@@ -1,6 +1,10 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pymongo import MongoClient
 from ..common.config_manager import ConfigManager
+from .mongodb_command_monitor import MongoDBCommandMonitor
+from .mongodb_pool_monitor import MongoDBPoolMonitor
 from ..common.database_connection import DatabaseConnection
 from ..utils.logging_config import ProgressLogger
 
@@ -13,6 +17,8 @@ class MongoDBConnection(DatabaseConnection):
         self.max_pool_size = self.config_manager.get('mongodb_pool_size')
         self.client = None
         self.connection = None
+        self.monitor = MongoDBCommandMonitor()
+        self.pool_monitor = MongoDBPoolMonitor(int(self.max_pool_size or 100))
         self._initialize_connection()
 
     def _initialize_connection(self):
@@ -28,19 +34,24 @@ class MongoDBConnection(DatabaseConnection):
                 serverSelectionTimeoutMS=5000,
                 retryWrites=True,
                 w=1,
-                journal=False
+                journal=False,
+                event_listeners=[self.monitor, self.pool_monitor]
             )
             self.connection = self.client[self.db_name]
             self.client.admin.command('ping')
-            try:
-                self.connection.command({'profile': 2})
-            except Exception as profile_error:
-                ProgressLogger.error(f"Cannot enable MongoDB profiling: {profile_error}")
             ProgressLogger.important_info(f"Successfully connected to MongoDB database: {self.db_name}")
         except Exception as e:
             ProgressLogger.error(f"Cannot create MongoDB connection: {e}")
             raise
 
+    def warm_up(self, connections: int) -> float:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="mongo-warm-up") as executor:
+            list(executor.map(lambda _: self.client.admin.command('ping'), range(connections)))
+        elapsed = (time.perf_counter() - started) * 1000
+        ProgressLogger.print(f"Warmed up {connections} MongoDB connections in {elapsed:.2f} ms")
+        return elapsed
+
     def get_collection(self, collection_name: str):
         if self.connection is None:
             raise Exception("Database connection has not been established.")
@@ -60,6 +71,9 @@ class MongoDBConnection(DatabaseConnection):
                 self.connection = None
 
     def is_connected(self):
+        return self.client is not None
+
+    def ping(self) -> bool:
         if not self.client:
             return False
         try:
@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Any, Dict
+
+from pymongo import monitoring
+
+from ..common.connection_pool import PoolMetrics
+
+TIMEOUT = 'timeout'
+
+
+class MongoDBPoolMonitor(monitoring.ConnectionPoolListener):
+    def __init__(self, pool_size: int):
+        self.metrics = PoolMetrics(pool_size=pool_size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return self.metrics.snapshot()
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self.metrics.created += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self.metrics.closed += 1
+
+    def connection_check_out_started(self, event) -> None:
+        self._local.started = time.perf_counter_ns()
+
+    def _waited_ms(self) -> float:
+        started = getattr(self._local, 'started', None)
+        self._local.started = None
+        return (time.perf_counter_ns() - started) / 1e6 if started is not None else 0.0
+
+    def connection_check_out_failed(self, event) -> None:
+        waited = self._waited_ms()
+        with self._lock:
+            self.metrics.total_wait_ms += waited
+            if str(event.reason) == TIMEOUT:
+                self.metrics.timeouts += 1
+
+    def connection_checked_out(self, event) -> None:
+        waited = self._waited_ms()
+        with self._lock:
+            self.metrics.checkouts += 1
+            self.metrics.in_use += 1
+            self.metrics.max_in_use = max(self.metrics.max_in_use, self.metrics.in_use)
+            self.metrics.record_wait(waited)
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self.metrics.in_use -= 1
@@ -1,26 +1,51 @@
+import random
+import threading
 import time
-from typing import Dict, List, Tuple, Optional, Union
+import uuid
+from typing import Any, Callable, Dict, List, Tuple, Optional, Union
 
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
 from pymongo import ASCENDING, WriteConcern
+from pymongo.client_session import ClientSession
+from pymongo.errors import BulkWriteError
 
+from .mongodb_command_monitor import CommandSample, CommandStats, COMMAND, PROFILER
 from .mongodb_connection import MongoDBConnection
 from ..common.config_manager import ConfigManager
+from ..common.resource_registry import ResourceRegistry
+from ..common.fetch_stats import FetchStats, DICT, STREAM, RAW, RAW_STREAM
+from ..common.timing_overhead import TimingOverhead
+from ..data.payload_cache import EncodedBatch
+from ..common.transaction_batcher import TransactionBatcher, AUTOCOMMIT, TRANSACTION
 from ..common.repository import Repository
 from ..common.index_types import IndexType
 from ..common.record_types import RecordType
+from ..repositories.database_type import DatabaseType
 from ..utils.logging_config import ProgressLogger
 
 
+ORDERED = 'ordered'
+UNORDERED = 'unordered'
+PARALLEL = 'parallel'
+MONGO_INSERT_MODES = (ORDERED, UNORDERED, PARALLEL)
+
+
 class MongoDBUserRepository(Repository):
+    KEY_FIELD = "_id"
+
     def __init__(
             self,
             connection_str: Optional[str] = None,
             db_name: Optional[str] = None,
             collection_name: Optional[str] = None,
             config_manager: Optional[ConfigManager] = None,
+            connection: Optional[MongoDBConnection] = None,
     ):
         cfg = config_manager or ConfigManager()
-        self.conn = MongoDBConnection(
+        self._owns_connection = connection is None
+        self.conn = connection or MongoDBConnection(
             connection_str or cfg.get_mongodb_connection_string(),
             db_name or cfg.get("mongodb_database"),
             cfg,
@@ -28,43 +53,123 @@ class MongoDBUserRepository(Repository):
         with self.conn as c:
             self.collection = c.get_collection(collection_name)
             self.system_profile = c.get_collection("system.profile")
+        self.transactions = self._transaction_batcher(cfg)
+        self.fetch_mode = cfg.get('mongo_fetch_mode', DICT)
+        self.batch_size = int(cfg.get('mongo_batch_size', 0))
+        fields = [f.strip() for f in str(cfg.get('mongo_projection') or '').split(',') if f.strip()]
+        self.projection = {f: 1 for f in fields} or None
+        self._raw_collection = self.collection.with_options(
+            codec_options=self.collection.codec_options.with_options(document_class=RawBSONDocument)
+        )
+        self.fetch_stats = FetchStats()
+        self._stats_lock = threading.Lock()
+        self.insert_mode = cfg.get('mongo_insert_mode', ORDERED)
+        self.insert_splits = max(1, int(cfg.get('mongo_insert_splits', 4)))
+        self.insert_strategy = f"insert_many_{self.insert_mode}"
+        self.insert_failures = 0
+        self._insert_executor = None
+        self.timing = cfg.get('mongo_timing', COMMAND)
+        self.profiler_sample_rate = float(cfg.get('mongo_profiler_sample_rate', 0.0))
+        self.max_samples = int(cfg.get('timing_max_samples', 100000))
+        self.command_samples: List[CommandSample] = []
+        self.dropped_samples = 0
+        self.profiler_checks: List[Dict[str, Any]] = []
+        if self.insert_mode == PARALLEL:
+            workers = int(cfg.get('mongodb_pool_size') or 100)
+            self._insert_executor = ResourceRegistry.executor("mongodb_insert", workers)
 
-    def _op_time(self, operation_type: str) -> float:
-        crud_ops = {
-            "insert": {"op": {"$in": ["insert", "command"]}, "command.insert": {"$exists": True}},
-            "find": {"op": {"$in": ["query", "getmore", "command"]}, "command.find": {"$exists": True}},
-            "update": [
-                {"op": {"$in": ["update", "command"]}, "command.updateMany": {"$exists": True}},
-                {"op": {"$in": ["update", "command"]}, "command.u": {"$exists": True}},
-            ],
-            "delete": [
-                {"op": "remove"},
-                {"op": "command", "command.delete": {"$exists": True}},
-            ]
-        }
+    def _transaction_batcher(self, cfg: ConfigManager) -> Optional[TransactionBatcher]:
+        if cfg.get('transaction_mode', AUTOCOMMIT) != TRANSACTION:
+            return None
+        return TransactionBatcher.from_config(
+            cfg,
+            acquire=self.conn.client.start_session,
+            begin=lambda session: session.start_transaction(),
+            commit=lambda session: session.commit_transaction(),
+            abort=lambda session: session.abort_transaction(),
+            release=lambda session: session.end_session(),
+        )
 
-        # Fix: Handle both single objects and lists properly for $or operator
-        op_conditions = crud_ops[operation_type]
-        if isinstance(op_conditions, list):
-            query = {"$or": op_conditions}
-        else:
-            query = op_conditions
+    def _write(self, op: Callable[[Optional[ClientSession]], Any], count: Callable[[Any], int]) -> Any:
+        if self.transactions is None:
+            return op(None)
+        session = self.transactions.handle()
+        try:
+            result = op(session)
+        except Exception:
+            self.transactions.abort()
+            raise
+        self.transactions.record(count(result))
+        return result
 
-        latest = self.system_profile.find_one(query, sort=[("ts", -1)])
-        if not latest:
-            raise Exception("Nie znaleziono operacji.")
+    def commit_pending(self) -> Tuple[float, int]:
+        if self.transactions is None:
+            return 0.0, 0
+        self.transactions.commit_all()
+        return self.transactions.take_commit_stats()
 
-        lsid = latest.get("command", {}).get("lsid")
-        if not lsid:
-            return latest.get("millis", 0)
+    def _begin(self) -> str:
+        token = uuid.uuid4().hex
+        self.conn.monitor.begin(token)
+        return token
 
-        cursor = self.system_profile.find({
-            "command.lsid": lsid,
-            "op": {"$in": ["query", "getmore", "insert", "update", "remove", "command"]}
+    def _profiler_time(self, token: str) -> float:
+        entries = self.system_profile.find({
+            "$or": [
+                {"command.comment": token},
+                {"originatingCommand.comment": token},
+            ]
         })
+        return sum(op.get("millis", 0) for op in entries)
 
-        i = sum(op.get("millis", 0) for op in cursor)
-        return i
+    def _finish(self, token: str) -> Tuple[float, CommandStats]:
+        commands = self.conn.monitor.end(token)
+        with self._stats_lock:
+            room = max(0, self.max_samples - len(self.command_samples))
+            self.command_samples.extend(commands.samples[:room])
+            self.dropped_samples += len(commands.samples) - min(room, len(commands.samples))
+        if self.timing == PROFILER:
+            with TimingOverhead.excluded():
+                return self._profiler_time(token), commands
+        if self.profiler_sample_rate and random.random() < self.profiler_sample_rate:
+            with TimingOverhead.excluded():
+                profiler_ms = self._profiler_time(token)
+            check = {
+                "command_ms": commands.server_time,
+                "profiler_ms": profiler_ms,
+                "round_trips": commands.round_trips,
+            }
+            with self._stats_lock:
+                self.profiler_checks.append(check)
+        return commands.server_time, commands
+
+    def _op_time(self, token: str) -> float:
+        return self._finish(token)[0]
+
+    def take_statement_samples(self) -> Tuple[List[CommandSample], int]:
+        with self._stats_lock:
+            samples, dropped = self.command_samples, self.dropped_samples
+            self.command_samples = []
+            self.dropped_samples = 0
+        return samples, dropped
+
+    def take_profiler_checks(self) -> List[Dict[str, Any]]:
+        with self._stats_lock:
+            checks = self.profiler_checks
+            self.profiler_checks = []
+        return checks
+
+    def merge_client_stats(self, stats: Dict[str, Any]) -> None:
+        samples, dropped = stats.get('statement_samples', ([], 0))
+        with self._stats_lock:
+            if 'fetch_stats' in stats:
+                self.fetch_stats.add(stats['fetch_stats'])
+            room = max(0, self.max_samples - len(self.command_samples))
+            self.command_samples.extend(samples[:room])
+            self.dropped_samples += dropped + len(samples) - min(room, len(samples))
+            self.profiler_checks.extend(stats.get('profiler_checks', []))
+        if 'commits' in stats and self.transactions is not None:
+            self.transactions.add_commit_stats(*stats['commits'])
 
     def clear_collection(self) -> bool:
         self.collection.drop()
@@ -82,28 +187,133 @@ class MongoDBUserRepository(Repository):
     def setup_profiling(self) -> None:
         db = self.collection.database
         db.command("profile", 0)
-        db["system.profile"].drop()
-        db.command("profile", 2, slowms=0)
+        if self.timing == PROFILER or self.profiler_sample_rate:
+            db["system.profile"].drop()
+            db.command("profile", 2, slowms=0)
+
+    def _insert_many(self, collection, docs: List, token: str, session: Optional[ClientSession] = None,
+                     keys: Optional[List] = None) -> List:
+        ordered = self.insert_mode == ORDERED
+        try:
+            result = collection.insert_many(docs, ordered=ordered, comment=token, session=session)
+            return result.inserted_ids or list(keys or [])
+        except BulkWriteError as e:
+            if session is not None:
+                raise
+            errors = e.details.get("writeErrors", [])
+            inserted = e.details.get("nInserted", 0)
+            with self._stats_lock:
+                self.insert_failures += len(docs) - inserted
+            ProgressLogger.error(
+                f"Bulk insert into {collection.name}: {len(docs) - inserted}/{len(docs)} documents failed"
+                + (f", first error: {errors[0].get('errmsg')}" if errors else "")
+            )
+            keys = keys if keys is not None else [doc["_id"] for doc in docs]
+            if ordered:
+                return keys[:inserted]
+            failed = {err["index"] for err in errors}
+            return [key for i, key in enumerate(keys) if i not in failed]
+
+    def _insert_parallel(self, collection, docs: List, token: str, keys: Optional[List] = None) -> List:
+        size = -(-len(docs) // self.insert_splits)
+        futures = [
+            self._insert_executor.submit(
+                self._insert_many, collection, docs[start:start + size], token, None,
+                keys[start:start + size] if keys is not None else None
+            )
+            for start in range(0, len(docs), size)
+        ]
+        inserted = []
+        for future in futures:
+            inserted.extend(future.result())
+        return inserted
+
+    def create_users_bulk(self, docs: List, keys: Optional[List] = None) -> Tuple[List[str], float]:
+        token = self._begin()
+        collection = self.collection if self.transactions else self.collection.with_options(
+            write_concern=WriteConcern(w=1)
+        )
+        if self.insert_mode == PARALLEL and self.transactions is None and len(docs) > 1:
+            inserted = self._insert_parallel(collection, docs, token, keys)
+        else:
+            inserted = self._write(lambda session: self._insert_many(collection, docs, token, session, keys), len)
+
+        op_time = self._op_time(token)
+        return [str(_id) for _id in inserted], op_time
 
-    def create_users_bulk(self, docs: List[Dict]) -> Tuple[List[str], float]:
-        self.setup_profiling()
+    @property
+    def payload_encoding(self) -> str:
+        return "bson"
 
-        res = self.collection.with_options(write_concern=WriteConcern(w=1)).insert_many(docs, ordered=True)
+    @property
+    def encoded_insert_strategy(self) -> str:
+        return f"{self.insert_strategy}_raw_bson"
 
-        op_time = self._op_time('insert')
-        return [str(_id) for _id in res.inserted_ids], op_time
+    def encode_batch(self, docs: List[Dict]) -> EncodedBatch:
+        keys = []
+        payload = []
+        for doc in docs:
+            key = doc.get("_id")
+            if key is None:
+                key = ObjectId()
+                doc = {"_id": key, **doc}
+            keys.append(key)
+            payload.append(RawBSONDocument(bson.encode(doc)))
+        nbytes = sum(len(raw.raw) for raw in payload)
+        return EncodedBatch(self.payload_encoding, list(docs[0]) if docs else [], payload, len(payload), nbytes, keys)
 
-    def get_all_users(self, client_id: int = None) -> Tuple[List[Dict], float]:
-        self.setup_profiling()
+    def create_users_encoded(self, batch: EncodedBatch) -> Tuple[List[str], float]:
+        return self.create_users_bulk(batch.payload, batch.keys)
+
+    def take_insert_failures(self) -> int:
+        with self._stats_lock:
+            failures = self.insert_failures
+            self.insert_failures = 0
+        return failures
+
+    def get_all_users(self, client_id: int = None) -> Tuple[Union[List, int], float]:
+        token = self._begin()
         flt = {"client_id": client_id}
-        q = self.collection.find(flt)
-        result = list(q)
-        op_time = self._op_time('find')
+        raw = self.fetch_mode in (RAW, RAW_STREAM)
+        streaming = self.fetch_mode in (STREAM, RAW_STREAM)
+        stats = FetchStats(calls=1)
+        decode_ns = 0
+        result = []
+
+        started = time.perf_counter_ns()
+        if self.fetch_mode == DICT:
+            result = list(self.collection.find(flt, self.projection, comment=token, batch_size=self.batch_size))
+            stats.rows = len(result)
+        else:
+            cursor = self._raw_collection.find(flt, self.projection, comment=token, batch_size=self.batch_size)
+            for doc in cursor:
+                if not raw:
+                    decode_started = time.perf_counter_ns()
+                    doc = bson.decode(doc.raw, codec_options=self.collection.codec_options)
+                    decode_ns += time.perf_counter_ns() - decode_started
+                stats.rows += 1
+                if not streaming:
+                    result.append(doc)
+        stats.client_time = (time.perf_counter_ns() - started) / 1e6
+
+        op_time, commands = self._finish(token)
+        stats.server_time = op_time
+        stats.decode_time = decode_ns / 1e6
+        stats.round_trips = commands.round_trips
+        stats.batches = commands.round_trips
+        with self._stats_lock:
+            self.fetch_stats.add(stats)
+
+        return (stats.rows if streaming else result), op_time
 
-        return result, op_time
+    def take_fetch_stats(self) -> FetchStats:
+        with self._stats_lock:
+            stats = self.fetch_stats
+            self.fetch_stats = FetchStats()
+        return stats
 
     def update_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
-        self.setup_profiling()
+        token = self._begin()
         flt = {"client_id": client_id}
 
         if record_type == RecordType.SMALL.value:
@@ -111,20 +321,57 @@ class MongoDBUserRepository(Repository):
         else:
             update_data = {"$set": {"age": 30, "first_name": "test_name"}}
 
-        result = self.collection.update_many(flt, update_data)
-        op_time = self._op_time('update')
+        result = self._write(
+            lambda session: self.collection.update_many(flt, update_data, comment=token, session=session),
+            lambda r: r.modified_count
+        )
+        op_time = self._op_time(token)
 
         return result.modified_count, op_time
 
     def delete_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
-        self.setup_profiling()
+        token = self._begin()
         flt = {"client_id": client_id}
 
-        result = self.collection.delete_many(flt)
-        op_time = self._op_time('delete')
+        result = self._write(
+            lambda session: self.collection.delete_many(flt, comment=token, session=session),
+            lambda r: r.deleted_count
+        )
+        op_time = self._op_time(token)
 
         return result.deleted_count, op_time
 
+    def read_user(self, key: int) -> Tuple[Optional[Dict], float]:
+        token = self._begin()
+        doc = self.collection.find_one({self.KEY_FIELD: key}, comment=token)
+        return doc, self._op_time(token)
+
+    def update_user(self, key: int, record_type: str) -> Tuple[int, float]:
+        token = self._begin()
+        if record_type == RecordType.SMALL.value:
+            update_data = {"$inc": {"value": 1}}
+        else:
+            update_data = {"$inc": {"age": 1}, "$set": {"first_name": "test_name"}}
+        result = self._write(
+            lambda session: self.collection.update_one({self.KEY_FIELD: key}, update_data, comment=token, session=session),
+            lambda r: r.modified_count
+        )
+        return result.modified_count, self._op_time(token)
+
+    def insert_user(self, user_data: Dict) -> Tuple[int, float]:
+        token = self._begin()
+        self._write(
+            lambda session: self.collection.insert_one(user_data, comment=token, session=session),
+            lambda r: 1
+        )
+        return 1, self._op_time(token)
+
+    def scan_users(self, start_key: int, limit: int) -> Tuple[List[Dict], float]:
+        token = self._begin()
+        cursor = self.collection.find({self.KEY_FIELD: {"$gte": start_key}}, comment=token)
+        result = list(cursor.sort(self.KEY_FIELD, ASCENDING).limit(limit))
+        return result, self._op_time(token)
+
     def _create_idx(self, spec, name) -> bool:
         try:
             self.collection.create_index(spec, name=name)
@@ -137,6 +384,15 @@ class MongoDBUserRepository(Repository):
     def ensure_foreign_key_index(self) -> bool:
         return self._create_idx([("client_id", ASCENDING)], "client_id_index")
 
+    def warm_up(self) -> float:
+        return self.conn.warm_up(int(self.conn.max_pool_size or 1))
+
+    def pool_metrics(self) -> Dict[str, Any]:
+        return self.conn.pool_monitor.snapshot()
+
+    def repository_spec(self) -> Tuple[str, str]:
+        return DatabaseType.MONGO.value, self.collection.name
+
     def create_indexes(self, index_type: IndexType, collection_name: str) -> bool:
         mapper = {
             IndexType.FOREIGN_KEY.value: self.ensure_foreign_key_index,
@@ -145,4 +401,9 @@ class MongoDBUserRepository(Repository):
         return fn() if fn else False
 
     def close(self) -> None:
-        self.conn.client.close()
+        try:
+            self.commit_pending()
+        except Exception as e:
+            ProgressLogger.error(f"Error committing pending transactions: {e}")
+        if self._owns_connection:
+            self.conn.close_connection()
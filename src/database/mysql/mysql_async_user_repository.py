@@ -0,0 +1,171 @@
+import asyncio
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiomysql
+
+from ..common.config_manager import ConfigManager
+from ..common.record_types import RecordType
+from ..common.timing_overhead import TimingOverhead
+from ..repositories.async_user_repository import AsyncUserRepository
+from .mysql_connection import MySQLConnection
+from .mysql_timing_collector import MySQLTimingCollector
+from ..utils.logging_config import ProgressLogger
+
+
+class MySQLAsyncUserRepository(AsyncUserRepository):
+    def __init__(self, table_name: str, config_manager: Optional[ConfigManager] = None):
+        self.config_manager = config_manager or ConfigManager()
+        self.table_name = table_name
+        self.record_type = self.config_manager.get('record_type', RecordType.BIG.value).lower()
+        self._pool = None
+        self.history_overflows = 0
+        self._threads: 'weakref.WeakKeyDictionary[Any, List[int]]' = weakref.WeakKeyDictionary()
+
+    def use(self, name: str) -> None:
+        self.table_name = name
+
+    async def connect(self):
+        if self._pool is not None:
+            return
+        size = int(self.config_manager.get('mysql_pool_size', 5))
+        started = time.perf_counter()
+        self._pool = await aiomysql.create_pool(
+            host=self.config_manager.get('mysql_host'),
+            port=int(self.config_manager.get('mysql_port')),
+            user=self.config_manager.get('mysql_user'),
+            password=self.config_manager.get('mysql_password'),
+            db=self.config_manager.get('mysql_database'),
+            charset='utf8mb4',
+            autocommit=True,
+            init_command=MySQLConnection.SESSION_INIT,
+            minsize=size,
+            maxsize=size,
+        )
+        connections = [await self._pool.acquire() for _ in range(size)]
+        try:
+            await asyncio.gather(*(self._bind(conn) for conn in connections))
+        finally:
+            for conn in connections:
+                self._pool.release(conn)
+        ProgressLogger.print(
+            f'Initialized async MySQL pool (size={size}), warmed up in {(time.perf_counter() - started) * 1000:.2f} ms'
+        )
+
+    async def _bind(self, conn) -> None:
+        if conn in self._threads:
+            return
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(MySQLTimingCollector.BIND_QUERY)
+                row = await cursor.fetchone()
+            self._threads[conn] = [int(row["thread_id"]), int(row["event_id"])]
+        except Exception as e:
+            ProgressLogger.error(f"Could not map async connection to performance_schema thread: {e}")
+
+    def _record_overflow(self, thread_id: int, watermark: int) -> None:
+        self.history_overflows += 1
+        if self.history_overflows == 1:
+            ProgressLogger.warn(
+                f"events_statements_history_long overwrote statements of async thread {thread_id} after event "
+                f"{watermark}; server time is undercounted, raise performance_schema_events_statements_history_long_size"
+            )
+
+    async def _statement_time(self, conn, operation: str) -> float:
+        thread = self._threads.get(conn)
+        if thread is None:
+            return 0.0
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(MySQLTimingCollector.COLLECT_QUERY, (thread[1], thread[0]))
+                rows = await cursor.fetchall()
+        except Exception as e:
+            ProgressLogger.error(f"Could not collect statement timings: {e}")
+            return 0.0
+        samples = MySQLTimingCollector.to_samples(thread[0], rows, thread[1])
+        if MySQLTimingCollector.history_lost(rows, thread[1]):
+            self._record_overflow(thread[0], thread[1])
+        if rows:
+            thread[1] = int(rows[0]["watermark"])
+        return MySQLTimingCollector.server_time(samples, operation)
+
+    async def _execute(self, operation: str, query: str, params=None, many: bool = False, fetch: bool = False):
+        async with self._pool.acquire() as conn:
+            bind_started = time.perf_counter_ns()
+            await self._bind(conn)
+            overhead_ns = time.perf_counter_ns() - bind_started
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                if many:
+                    await cursor.executemany(query, params)
+                else:
+                    await cursor.execute(query, params or ())
+                rows = await cursor.fetchall() if fetch else None
+                rowcount = cursor.rowcount
+            collect_started = time.perf_counter_ns()
+            execution_time = await self._statement_time(conn, operation)
+            overhead_ns += time.perf_counter_ns() - collect_started
+        TimingOverhead.add(overhead_ns)
+        return rows, rowcount, execution_time
+
+    async def create_users_bulk(self, users_data: List[Dict[str, Any]]) -> Tuple[List[str], float]:
+        if self.record_type == RecordType.SMALL.value:
+            insert_query = (
+                f"INSERT INTO {self.table_name} (value, client_id) "
+                "VALUES (%(value)s, %(client_id)s)"
+            )
+        else:
+            insert_query = (
+                f"INSERT INTO {self.table_name} "
+                "(first_name, last_name, email, address, age, client_id) "
+                "VALUES (%(first_name)s, %(last_name)s, %(email)s, %(address)s, %(age)s, %(client_id)s)"
+            )
+        try:
+            _, rowcount, execution_time = await self._execute('insert', insert_query, users_data, many=True)
+            return [str(i) for i in range(rowcount if rowcount and rowcount > 0 else len(users_data))], execution_time
+        except Exception as e:
+            ProgressLogger.error(f"Error inserting users: {e}")
+            return [], 0.0
+
+    async def get_all_users(self, client_id: int) -> Tuple[List[Dict[str, Any]], float]:
+        try:
+            rows, _, execution_time = await self._execute(
+                'select', f"SELECT * FROM {self.table_name} WHERE client_id = %s", (client_id,), fetch=True
+            )
+            return list(rows), execution_time
+        except Exception as e:
+            ProgressLogger.error(f"Error fetching users: {e}")
+            return [], 0.0
+
+    async def update_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
+        if record_type == RecordType.SMALL.value:
+            update_query = f"UPDATE {self.table_name} SET value = value + 1 WHERE client_id = %s"
+        else:
+            update_query = f"UPDATE {self.table_name} SET age = 30, first_name = 'test_name' WHERE client_id = %s"
+        try:
+            _, rowcount, execution_time = await self._execute('update', update_query, (client_id,))
+            return rowcount, execution_time
+        except Exception as e:
+            ProgressLogger.error(f"Error updating users: {e}")
+            return 0, 0.0
+
+    async def delete_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
+        _, rowcount, execution_time = await self._execute(
+            'delete', f"DELETE FROM {self.table_name} WHERE client_id = %s", (client_id,)
+        )
+        return rowcount, execution_time
+
+    async def clear_collection(self) -> bool:
+        try:
+            await self._execute('delete', f"DELETE FROM {self.table_name}")
+            return True
+        except Exception as e:
+            ProgressLogger.error(f"Error clearing table {self.table_name}: {e}")
+            return False
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+        ProgressLogger.print("Async MySQL repository resources closed")
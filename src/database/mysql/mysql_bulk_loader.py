@@ -0,0 +1,123 @@
+import csv
+import io
+import os
+import tempfile
+from typing import Any, List, Sequence, Tuple
+
+from pymysql.converters import escape_item
+
+from ..utils.logging_config import ProgressLogger
+
+EXECUTEMANY = 'executemany'
+MULTI_VALUES = 'multi_values'
+LOAD_DATA = 'load_data'
+PREPARED = 'prepared'
+INSERT_STRATEGIES = (EXECUTEMANY, MULTI_VALUES, LOAD_DATA, PREPARED)
+
+STRATEGY_EVENTS = {
+    EXECUTEMANY: ('insert',),
+    MULTI_VALUES: ('insert',),
+    LOAD_DATA: ('load',),
+    PREPARED: ('prepare_sql', 'set_option', 'execute_sql'),
+}
+
+PACKET_HEADROOM = 1024
+MAX_PREPARED_ROWS = 1000
+MAX_PREPARED_PLACEHOLDERS = 65535
+SHM_DIR = '/dev/shm'
+CHARSET = 'utf8mb4'
+
+
+class MySQLBulkLoader:
+    @staticmethod
+    def max_packet(conn) -> int:
+        if conn.max_allowed_packet is None:
+            with conn.get_cursor() as cursor:
+                cursor.execute("SELECT @@max_allowed_packet AS max_allowed_packet")
+                conn.max_allowed_packet = int(cursor.fetchone()["max_allowed_packet"])
+        return conn.max_allowed_packet
+
+    @staticmethod
+    def escape_rows(rows: Sequence[Tuple[Any, ...]], charset: str = CHARSET) -> List[str]:
+        return ["(" + ",".join(escape_item(v, charset) for v in row) + ")" for row in rows]
+
+    @staticmethod
+    def send_values(conn, table: str, columns: List[str], literals: Sequence[str]) -> int:
+        limit = MySQLBulkLoader.max_packet(conn) - PACKET_HEADROOM
+        prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        inserted = 0
+        statements = 0
+
+        with conn.get_cursor() as cursor:
+            chunk: List[str] = []
+            size = len(prefix)
+            for literal in literals:
+                literal_size = len(literal.encode('utf8')) + 1
+                if chunk and size + literal_size > limit:
+                    inserted += cursor.execute(prefix + ",".join(chunk))
+                    statements += 1
+                    chunk, size = [], len(prefix)
+                chunk.append(literal)
+                size += literal_size
+            if chunk:
+                inserted += cursor.execute(prefix + ",".join(chunk))
+                statements += 1
+
+        ProgressLogger.print(f"multi_values: {inserted} rows in {statements} statements (packet limit {limit} B)")
+        return inserted
+
+    @staticmethod
+    def multi_values(conn, table: str, columns: List[str], rows: Sequence[Tuple[Any, ...]]) -> int:
+        return MySQLBulkLoader.send_values(conn, table, columns, MySQLBulkLoader.escape_rows(rows))
+
+    @staticmethod
+    def csv_text(rows: Sequence[Tuple[Any, ...]]) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        for row in rows:
+            writer.writerow(['NULL' if v is None else v for v in row])
+        return buffer.getvalue()
+
+    @staticmethod
+    def load_csv(conn, table: str, columns: List[str], text: str) -> int:
+        directory = SHM_DIR if os.path.isdir(SHM_DIR) else None
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', dir=directory, encoding='utf8') as f:
+            f.write(text)
+            f.flush()
+            sql = (
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                "LINES TERMINATED BY '\\n' "
+                f"({', '.join(columns)})"
+            )
+            with conn.get_cursor() as cursor:
+                return cursor.execute(sql, (f.name,))
+
+    @staticmethod
+    def load_data(conn, table: str, columns: List[str], rows: Sequence[Tuple[Any, ...]]) -> int:
+        return MySQLBulkLoader.load_csv(conn, table, columns, MySQLBulkLoader.csv_text(rows))
+
+    @staticmethod
+    def _prepare(cursor, conn, table: str, columns: List[str], row_count: int) -> str:
+        name = f"bulk_{table}_{len(columns)}_{row_count}"
+        if name not in conn.prepared_statements:
+            placeholders = ",".join(["(" + ",".join("?" * len(columns)) + ")"] * row_count)
+            statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES {placeholders}"
+            cursor.execute(f"PREPARE {name} FROM %s", (statement,))
+            conn.prepared_statements.add(name)
+        return name
+
+    @staticmethod
+    def prepared(conn, table: str, columns: List[str], rows: Sequence[Tuple[Any, ...]]) -> int:
+        per_statement = max(1, min(MAX_PREPARED_ROWS, MAX_PREPARED_PLACEHOLDERS // len(columns)))
+        inserted = 0
+        with conn.get_cursor() as cursor:
+            for start in range(0, len(rows), per_statement):
+                chunk = rows[start:start + per_statement]
+                name = MySQLBulkLoader._prepare(cursor, conn, table, columns, len(chunk))
+                values = [v for row in chunk for v in row]
+                variables = [f"@p{i}" for i in range(len(values))]
+                cursor.execute("SET " + ", ".join(f"{var} = %s" for var in variables), values)
+                inserted += cursor.execute(f"EXECUTE {name} USING {', '.join(variables)}")
+        return inserted
@@ -1,13 +1,28 @@
 import logging
+import threading
 import pymysql
 from ..common.database_connection import DatabaseConnection
 from ..common.config_manager import ConfigManager
+from .mysql_bulk_loader import LOAD_DATA
 from ..utils.logging_config import ProgressLogger
 
 class MySQLConnection(DatabaseConnection):
+    SESSION_INIT = (
+        "SET SESSION sql_mode='STRICT_TRANS_TABLES', "
+        "innodb_lock_wait_timeout=50, "
+        "wait_timeout=28800, "
+        "interactive_timeout=28800, "
+        "transaction_isolation='READ-COMMITTED'"
+    )
+
     def __init__(self, config_manager: ConfigManager, connection=None):
         self.config_manager = config_manager
         self.connection = connection
+        self.lock = threading.Lock()
+        self.max_allowed_packet = None
+        self.prepared_statements = set()
+        self.thread_id = None
+        self.event_watermark = 0
         if self.connection is None:
             self._create_connection()
 
@@ -27,16 +42,14 @@ class MySQLConnection(DatabaseConnection):
                 database=database,
                 charset='utf8mb4',
                 autocommit=True,
-                cursorclass=pymysql.cursors.DictCursor
+                cursorclass=pymysql.cursors.DictCursor,
+                init_command=self.SESSION_INIT,
+                local_infile=self.config_manager.get('mysql_insert_strategy') == LOAD_DATA
             )
-
-            cursor = self.connection.cursor()
-            cursor.execute("SET SESSION sql_mode='STRICT_TRANS_TABLES'")
-            cursor.execute("SET SESSION innodb_lock_wait_timeout=50")
-            cursor.execute("SET SESSION wait_timeout=28800")
-            cursor.execute("SET SESSION interactive_timeout=28800")
-            cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
-            cursor.close()
+            self.max_allowed_packet = None
+            self.prepared_statements = set()
+            self.thread_id = None
+            self.event_watermark = 0
 
             ProgressLogger.print("Created new MySQL connection")
         except Exception as e:
@@ -65,6 +78,15 @@ class MySQLConnection(DatabaseConnection):
         finally:
             self.connection = None
 
+    def ping(self) -> bool:
+        if not self.is_connected():
+            return False
+        try:
+            self.connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
     def is_connected(self):
         return (
             self.connection is not None and
@@ -9,7 +9,12 @@ class MySQLConnectionPool(ConnectionPool):
     def __init__(self, config_manager=None):
         self.config_manager = config_manager or ConfigManager()
         size = int(self.config_manager.get('mysql_pool_size', 5))
-        super().__init__(size)
+        super().__init__(
+            size,
+            timeout=float(self.config_manager.get('mysql_pool_timeout', 30.0)),
+            max_lifetime=float(self.config_manager.get('mysql_pool_max_lifetime', 0.0)),
+            idle_timeout=float(self.config_manager.get('mysql_pool_idle_timeout', 0.0)),
+        )
         ProgressLogger.print(f'Initialized MySQL connection pool (size={size})')
 
     def create_connection(self):
@@ -0,0 +1,167 @@
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .mysql_connection import MySQLConnection
+from ..utils.logging_config import ProgressLogger
+
+PS_PER_MS = 1_000_000_000
+
+
+@dataclass
+class StatementSample:
+    thread_id: int
+    event_id: int
+    event_name: str
+    digest: Optional[str]
+    timer_wait_ps: int
+    lock_time_ps: int
+    rows_affected: int
+    rows_sent: int
+    rows_examined: int
+
+    @property
+    def duration_ms(self) -> float:
+        return self.timer_wait_ps / PS_PER_MS
+
+    def to_dict(self) -> Dict[str, Any]:
+        fields = asdict(self)
+        fields['duration_ms'] = self.duration_ms
+        return fields
+
+
+class MySQLTimingCollector:
+    CONSUMERS = ('events_statements_current', 'events_statements_history_long')
+
+    BIND_QUERY = (
+        "SELECT THREAD_ID AS thread_id, EVENT_ID AS event_id "
+        "FROM performance_schema.events_statements_current "
+        "WHERE THREAD_ID = PS_CURRENT_THREAD_ID() AND NESTING_EVENT_ID IS NULL"
+    )
+
+    COLLECT_QUERY = (
+        "SELECT c.EVENT_ID AS watermark, h.EVENT_ID AS event_id, h.EVENT_NAME AS event_name, "
+        "h.DIGEST AS digest, h.TIMER_WAIT AS timer_wait, h.LOCK_TIME AS lock_time, "
+        "h.ROWS_AFFECTED AS rows_affected, h.ROWS_SENT AS rows_sent, h.ROWS_EXAMINED AS rows_examined "
+        "FROM performance_schema.events_statements_current c "
+        "LEFT JOIN performance_schema.events_statements_history_long h "
+        "ON h.THREAD_ID = c.THREAD_ID AND h.EVENT_ID >= %s AND h.NESTING_EVENT_ID IS NULL "
+        "WHERE c.THREAD_ID = %s AND c.NESTING_EVENT_ID IS NULL "
+        "ORDER BY h.EVENT_ID"
+    )
+
+    def __init__(self, monitor: MySQLConnection, max_samples: int = 100000):
+        self.monitor = monitor
+        self.max_samples = max_samples
+        self.samples: List[StatementSample] = []
+        self.dropped = 0
+        self.overflows = 0
+        self._lock = threading.Lock()
+        self._enabled = False
+
+    def enable(self) -> None:
+        if self._enabled:
+            return
+        try:
+            with self.monitor.lock, self.monitor.get_cursor() as cursor:
+                placeholders = ", ".join(["%s"] * len(self.CONSUMERS))
+                cursor.execute(
+                    f"UPDATE performance_schema.setup_consumers SET ENABLED = 'YES' WHERE NAME IN ({placeholders})",
+                    self.CONSUMERS
+                )
+                cursor.execute("SELECT @@performance_schema_events_statements_history_long_size AS size")
+                size = (cursor.fetchone() or {}).get("size")
+            self._enabled = True
+            ProgressLogger.print(f"Statement timing from events_statements_history_long (size {size})")
+        except Exception as e:
+            ProgressLogger.error(f"Could not enable statement history consumers: {e}")
+
+    def bind(self, conn: MySQLConnection) -> None:
+        if conn.thread_id is not None:
+            return
+        try:
+            with conn.get_cursor() as cursor:
+                cursor.execute(self.BIND_QUERY)
+                row = cursor.fetchone()
+            conn.thread_id = int(row["thread_id"])
+            conn.event_watermark = int(row["event_id"])
+        except Exception as e:
+            ProgressLogger.error(f"Could not map connection to performance_schema thread: {e}")
+
+    def collect(self, conn: MySQLConnection) -> List[StatementSample]:
+        if conn.thread_id is None:
+            return []
+        try:
+            with conn.get_cursor() as cursor:
+                cursor.execute(self.COLLECT_QUERY, (conn.event_watermark, conn.thread_id))
+                rows = cursor.fetchall()
+        except Exception as e:
+            ProgressLogger.error(f"Could not collect statement timings: {e}")
+            return []
+
+        samples = self.to_samples(conn.thread_id, rows, conn.event_watermark)
+        if self.history_lost(rows, conn.event_watermark):
+            self.record_overflow(conn.thread_id, conn.event_watermark)
+        if rows:
+            conn.event_watermark = int(rows[0]["watermark"])
+        self.keep(samples)
+        return samples
+
+    @staticmethod
+    def history_lost(rows: Sequence[Dict[str, Any]], watermark: int) -> bool:
+        return bool(rows) and not any(row["event_id"] == watermark for row in rows)
+
+    def record_overflow(self, thread_id: int, watermark: int) -> None:
+        with self._lock:
+            self.overflows += 1
+            first = self.overflows == 1
+        if first:
+            ProgressLogger.warn(
+                f"events_statements_history_long overwrote statements of thread {thread_id} after event {watermark}; "
+                f"server time is undercounted, raise performance_schema_events_statements_history_long_size"
+            )
+
+    def add_overflows(self, overflows: int) -> None:
+        with self._lock:
+            self.overflows += overflows
+
+    def take_overflows(self) -> int:
+        with self._lock:
+            overflows = self.overflows
+            self.overflows = 0
+        return overflows
+
+    @staticmethod
+    def to_samples(thread_id: int, rows: Sequence[Dict[str, Any]], watermark: int = 0) -> List[StatementSample]:
+        return [
+            StatementSample(
+                thread_id=thread_id,
+                event_id=int(row["event_id"]),
+                event_name=row["event_name"],
+                digest=row["digest"],
+                timer_wait_ps=int(row["timer_wait"] or 0),
+                lock_time_ps=int(row["lock_time"] or 0),
+                rows_affected=int(row["rows_affected"] or 0),
+                rows_sent=int(row["rows_sent"] or 0),
+                rows_examined=int(row["rows_examined"] or 0),
+            )
+            for row in rows if row["event_id"] is not None and int(row["event_id"]) > watermark
+        ]
+
+    def keep(self, samples: List[StatementSample], dropped: int = 0) -> None:
+        with self._lock:
+            room = max(0, self.max_samples - len(self.samples))
+            self.samples.extend(samples[:room])
+            self.dropped += dropped + len(samples) - min(room, len(samples))
+
+    @staticmethod
+    def server_time(samples: Sequence[StatementSample], *operations: str) -> float:
+        prefixes = tuple(f"statement/sql/{operation.lower()}" for operation in operations)
+        return sum(s.timer_wait_ps for s in samples if s.event_name.startswith(prefixes)) / PS_PER_MS
+
+    def take_samples(self) -> Tuple[List[StatementSample], int]:
+        with self._lock:
+            samples, dropped = self.samples, self.dropped
+            self.samples = []
+            self.dropped = 0
+        return samples, dropped
@@ -1,93 +1,250 @@
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+import time
+from typing import Dict, List, Tuple, Optional, Any, Union
+
+import pymysql
 
 from ..common import IndexType
 from ..common.record_types import RecordType
 from ..common.repository import Repository
 from ..common.retry_decorator import RetryDecorator
 from ..common.config_manager import ConfigManager
+from ..common.fetch_stats import FetchStats, DICT, TUPLE, STREAM
+from ..common.timing_overhead import TimingOverhead
+from ..common.transaction_batcher import TransactionBatcher, AUTOCOMMIT, TRANSACTION
+from ..repositories.database_type import DatabaseType
+from ..data.payload_cache import EncodedBatch
+from .mysql_bulk_loader import MySQLBulkLoader, EXECUTEMANY, MULTI_VALUES, LOAD_DATA, STRATEGY_EVENTS
 from .mysql_query_executor import MySQLQueryExecutor
 from .mysql_index_manager import MySQLIndexManager
 from .mysql_connection import MySQLConnection
+from .mysql_timing_collector import MySQLTimingCollector, StatementSample
 from ..utils.logging_config import ProgressLogger
 
 
 class MySQLUserRepository(Repository):
+    KEY_FIELD = "id"
+
     def __init__(
             self,
             table_name: str,
             query_executor: Optional[MySQLQueryExecutor] = None,
-            config_manager: Optional[ConfigManager] = None
+            config_manager: Optional[ConfigManager] = None,
+            connection: Optional[MySQLConnection] = None
     ):
         self.config_manager = config_manager or ConfigManager()
+        self._owns_executor = query_executor is None
+        self._owns_connection = connection is None
         self._query_executor = query_executor or MySQLQueryExecutor(config_manager=self.config_manager)
         self._index_manager = MySQLIndexManager(self._query_executor)
-        self.db = MySQLConnection(config_manager=self.config_manager)
+        self.db = connection or MySQLConnection(config_manager=self.config_manager)
         self.cursor = self.db.get_cursor()
         self.table_name = table_name
+        self.insert_strategy = self.config_manager.get('mysql_insert_strategy', EXECUTEMANY)
+        self.transactions = self._transaction_batcher()
+        self.fetch_mode = self.config_manager.get('fetch_mode', DICT)
+        self.fetch_size = int(self.config_manager.get('fetch_size', 10000))
+        self.fetch_stats = FetchStats()
+        self._stats_lock = threading.Lock()
+        self.timing = MySQLTimingCollector(self.db, int(self.config_manager.get('timing_max_samples', 100000)))
         self._ensure_table_exists()
 
-    def setup_profiling(self) -> None:
+    def _transaction_batcher(self) -> Optional[TransactionBatcher]:
+        if self.config_manager.get('transaction_mode', AUTOCOMMIT) != TRANSACTION:
+            return None
+        pool = self._query_executor.connection_pool
+        return TransactionBatcher.from_config(
+            self.config_manager,
+            acquire=pool.get_connection,
+            begin=lambda conn: conn.connection.begin(),
+            commit=lambda conn: conn.connection.commit(),
+            abort=lambda conn: conn.connection.rollback(),
+            release=pool.release_connection,
+        )
+
+    @staticmethod
+    def _execute(conn: MySQLConnection, query: str, params: Any = None) -> int:
+        with conn.get_cursor() as cursor:
+            return cursor.execute(query, params)
+
+    @staticmethod
+    def _execute_many(conn: MySQLConnection, query: str, params_list: List[Dict[str, Any]]) -> int:
+        with conn.get_cursor() as cursor:
+            cursor.executemany(query, params_list)
+            return cursor.rowcount
+
+    @staticmethod
+    def _select(conn: MySQLConnection, query: str, params: Any = None) -> List[Dict[str, Any]]:
+        with conn.get_cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def _timed(self, conn: MySQLConnection, fn, *args) -> Tuple[Any, List[StatementSample], int]:
+        started = time.perf_counter_ns()
+        self.timing.bind(conn)
+        bound = time.perf_counter_ns()
+        result = fn(conn, *args)
+        finished = time.perf_counter_ns()
+        samples = self.timing.collect(conn)
+        return result, samples, (bound - started) + (time.perf_counter_ns() - finished)
+
+    def _read(self, fn, *args) -> Tuple[Any, List[StatementSample]]:
+        result, samples, overhead_ns = self._query_executor.run(self._timed, fn, *args).result()
+        TimingOverhead.add(overhead_ns)
+        return result, samples
+
+    def _write(self, fn, *args) -> Tuple[int, List[StatementSample]]:
+        if self.transactions is None:
+            return self._read(fn, *args)
+        conn = self.transactions.handle()
         try:
-            self.cursor.execute("TRUNCATE TABLE performance_schema.events_statements_summary_by_digest")
-            self.cursor.execute("TRUNCATE TABLE performance_schema.events_statements_history")
-        except Exception as e:
-            ProgressLogger.error(f"Could not reset performance_schema: {e}")
+            rows, samples, overhead_ns = self._timed(conn, fn, *args)
+        except Exception:
+            self.transactions.abort()
+            raise
+        TimingOverhead.add(overhead_ns)
+        self.transactions.record(rows)
+        return rows, samples
+
+    def commit_pending(self) -> Tuple[float, int]:
+        if self.transactions is None:
+            return 0.0, 0
+        self.transactions.commit_all()
+        return self.transactions.take_commit_stats()
 
-    def _get_query_time(self, operation: str) -> float:
-        try:
-            sql = (
-                "SELECT SUM(TIMER_WAIT)/1000000000 AS execution_time_ms "
-                "FROM performance_schema.events_statements_history "
-                "WHERE EVENT_NAME LIKE %s"
-            )
-            pattern = f"statement/sql/{operation.lower()}%"
-            self.cursor.execute(sql, (pattern,))
-            result = self.cursor.fetchone() or {}
-            f = float(result.get("execution_time_ms", 0.0))
-            return f
-        except Exception as e:
-            ProgressLogger.error(f"Could not get query time: {e}")
-            return 0.0
+    def setup_profiling(self) -> None:
+        self.timing.enable()
+
+    def take_statement_samples(self) -> Tuple[List[StatementSample], int]:
+        return self.timing.take_samples()
+
+    def take_timing_overflows(self) -> int:
+        return self.timing.take_overflows()
+
+    def merge_client_stats(self, stats: Dict[str, Any]) -> None:
+        if 'fetch_stats' in stats:
+            with self._stats_lock:
+                self.fetch_stats.add(stats['fetch_stats'])
+        if 'statement_samples' in stats:
+            self.timing.keep(*stats['statement_samples'])
+        if stats.get('timing_overflows'):
+            self.timing.add_overflows(stats['timing_overflows'])
+        if 'commits' in stats and self.transactions is not None:
+            self.transactions.add_commit_stats(*stats['commits'])
+
+    def _insert_columns(self, sample: Dict[str, Any]) -> List[str]:
+        record_type = self.config_manager.get('record_type')
+        if record_type.lower() == RecordType.SMALL.value:
+            columns = ["value", "client_id"]
+        else:
+            columns = ["first_name", "last_name", "email", "address", "age", "client_id"]
+        if self.KEY_FIELD in sample:
+            columns.insert(0, self.KEY_FIELD)
+        return columns
+
+    def _insert_query(self, sample: Dict[str, Any]) -> str:
+        columns = self._insert_columns(sample)
+        placeholders = ", ".join(f"%({c})s" for c in columns)
+        return f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
 
     @RetryDecorator.retry_on_error()
     def create_users_bulk(self, users_data: List[Dict[str, Any]]) -> Tuple[List[str], float]:
-        self.setup_profiling()
         try:
-            record_type = self.config_manager.get('record_type')
-
-            if record_type.lower() == RecordType.SMALL.value:
-                insert_query = (
-                    f"INSERT INTO {self.table_name} "
-                    "(value, client_id) "
-                    "VALUES (%(value)s, %(client_id)s)"
-                )
+            if self.insert_strategy == EXECUTEMANY:
+                insert_query = self._insert_query(users_data[0] if users_data else {})
+                inserted, samples = self._write(self._execute_many, insert_query, users_data)
             else:
-                insert_query = (
-                    f"INSERT INTO {self.table_name} "
-                    "(first_name, last_name, email, address, age, client_id) "
-                    "VALUES (%(first_name)s, %(last_name)s, %(email)s, %(address)s, %(age)s, %(client_id)s)"
-                )
+                columns = self._insert_columns(users_data[0] if users_data else {})
+                rows = [tuple(user[c] for c in columns) for user in users_data]
+                loader = getattr(MySQLBulkLoader, self.insert_strategy)
+                inserted, samples = self._write(loader, self.table_name, columns, rows)
 
-            future = self._query_executor.execute_many(insert_query, users_data)
-            result = future.result()
+            inserted_ids = [str(i) for i in range(inserted if inserted and inserted > 0 else len(users_data))]
 
-            if result and hasattr(result, 'rowcount') and result.rowcount > 0:
-                inserted_ids = [str(i) for i in range(result.rowcount)]
+            execution_time = self.timing.server_time(samples, *STRATEGY_EVENTS[self.insert_strategy])
+            return inserted_ids, execution_time
+        except Exception as e:
+            ProgressLogger.error(f"Error inserting users: {e}")
+            return [], 0.0
+
+    @property
+    def payload_encoding(self) -> Optional[str]:
+        if self.insert_strategy == LOAD_DATA:
+            return LOAD_DATA
+        if self.insert_strategy in (EXECUTEMANY, MULTI_VALUES):
+            return MULTI_VALUES
+        return None
+
+    @property
+    def encoded_insert_strategy(self) -> Optional[str]:
+        return self.payload_encoding
+
+    def encode_batch(self, users_data: List[Dict[str, Any]]) -> EncodedBatch:
+        columns = self._insert_columns(users_data[0] if users_data else {})
+        rows = [tuple(user[c] for c in columns) for user in users_data]
+        if self.payload_encoding == LOAD_DATA:
+            payload = MySQLBulkLoader.csv_text(rows)
+            nbytes = len(payload)
+        else:
+            payload = MySQLBulkLoader.escape_rows(rows)
+            nbytes = sum(len(literal) for literal in payload)
+        return EncodedBatch(self.payload_encoding, columns, payload, len(rows), nbytes)
+
+    @RetryDecorator.retry_on_error()
+    def create_users_encoded(self, batch: EncodedBatch) -> Tuple[List[str], float]:
+        try:
+            if batch.encoding == LOAD_DATA:
+                inserted, samples = self._write(MySQLBulkLoader.load_csv, self.table_name, batch.columns, batch.payload)
             else:
-                inserted_ids = [str(i) for i in range(len(users_data))]
+                inserted, samples = self._write(MySQLBulkLoader.send_values, self.table_name, batch.columns, batch.payload)
+
+            inserted_ids = [str(i) for i in range(inserted if inserted and inserted > 0 else batch.rows)]
 
-            execution_time = self._get_query_time('insert')
+            execution_time = self.timing.server_time(samples, *STRATEGY_EVENTS[batch.encoding])
             return inserted_ids, execution_time
         except Exception as e:
-            ProgressLogger.error(f"Error inserting users: {e}")
+            ProgressLogger.error(f"Error inserting encoded users: {e}")
             return [], 0.0
 
+    def _fetch(self, conn: MySQLConnection, query: str, params: Tuple[Any, ...]) -> Tuple[Union[List, int], FetchStats]:
+        stats = FetchStats(calls=1)
+        started = time.perf_counter()
+        if self.fetch_mode == STREAM:
+            cursor = conn.connection.cursor(pymysql.cursors.SSCursor)
+            try:
+                cursor.execute(query, params)
+                rows = cursor.fetchmany(self.fetch_size)
+                first_row = time.perf_counter()
+                while rows:
+                    stats.rows += len(rows)
+                    stats.batches += 1
+                    rows = cursor.fetchmany(self.fetch_size)
+            finally:
+                cursor.close()
+            result = stats.rows
+            stats.first_row_time = (first_row - started) * 1000
+            stats.drain_time = (time.perf_counter() - first_row) * 1000
+        else:
+            cursor_class = pymysql.cursors.Cursor if self.fetch_mode == TUPLE else pymysql.cursors.DictCursor
+            with conn.connection.cursor(cursor_class) as cursor:
+                cursor.execute(query, params)
+                result = cursor.fetchall()
+            stats.rows = len(result)
+            stats.batches = 1
+        stats.client_time = (time.perf_counter() - started) * 1000
+        return result, stats
+
+    def take_fetch_stats(self) -> FetchStats:
+        with self._stats_lock:
+            stats = self.fetch_stats
+            self.fetch_stats = FetchStats()
+        return stats
+
     @RetryDecorator.retry_on_error()
     def get_all_users(
             self,
             client_id: int
-    ) -> Tuple[List[Dict[str, Any]], float]:
-        self.setup_profiling()
+    ) -> Tuple[Union[List[Dict[str, Any]], int], float]:
         try:
             query = f"SELECT * FROM {self.table_name}"
             params: List[Any] = []
@@ -96,10 +253,12 @@ class MySQLUserRepository(Repository):
                 query += " WHERE client_id = %s"
                 params.append(client_id)
 
-            future = self._query_executor.execute_query(query, tuple(params))
-            result = future.result()
+            (result, stats), samples = self._read(self._fetch, query, tuple(params))
 
-            execution_time = self._get_query_time('select')
+            execution_time = self.timing.server_time(samples, 'select')
+            stats.server_time = execution_time
+            with self._stats_lock:
+                self.fetch_stats.add(stats)
             return result, execution_time
         except Exception as e:
             ProgressLogger.error(f"Error fetching users: {e}")
@@ -111,19 +270,14 @@ class MySQLUserRepository(Repository):
             client_id: int,
             record_type: str
     ) -> Tuple[int, float]:
-        self.setup_profiling()
         try:
             if record_type == RecordType.SMALL.value:
                 update_query = f"UPDATE {self.table_name} SET value = value + 1 WHERE client_id = %s"
             else:
                 update_query = f"UPDATE {self.table_name} SET age = 30, first_name = 'test_name' WHERE client_id = %s"
 
-            params = [client_id]
-            future = self._query_executor.execute_query(update_query, tuple(params))
-            result = future.result()
-
-            modified_count = result.rowcount if result and hasattr(result, 'rowcount') else 0
-            execution_time = self._get_query_time('update')
+            modified_count, samples = self._write(self._execute, update_query, (client_id,))
+            execution_time = self.timing.server_time(samples, 'update')
             return modified_count, execution_time
         except Exception as e:
             ProgressLogger.error(f"Error updating users: {e}")
@@ -135,18 +289,37 @@ class MySQLUserRepository(Repository):
             client_id: int,
             record_type: str
     ) -> Tuple[int, float]:
-        self.setup_profiling()
         delete_query = f"DELETE FROM {self.table_name} WHERE client_id = %s"
-        params = [client_id]
+        deleted_count, samples = self._write(self._execute, delete_query, (client_id,))
+        execution_time = self.timing.server_time(samples, 'delete')
 
-        future = self._query_executor.execute_query(delete_query, tuple(params))
+        return deleted_count, execution_time
 
-        result = future.result()
+    @RetryDecorator.retry_on_error()
+    def read_user(self, key: int) -> Tuple[Optional[Dict[str, Any]], float]:
+        query = f"SELECT * FROM {self.table_name} WHERE {self.KEY_FIELD} = %s"
+        rows, samples = self._read(self._select, query, (key,))
+        return (rows[0] if rows else None), self.timing.server_time(samples, 'select')
 
-        deleted_count = result.rowcount if result and hasattr(result, 'rowcount') else 0
-        execution_time = self._get_query_time('delete')
+    @RetryDecorator.retry_on_error()
+    def update_user(self, key: int, record_type: str) -> Tuple[int, float]:
+        if record_type == RecordType.SMALL.value:
+            query = f"UPDATE {self.table_name} SET value = value + 1 WHERE {self.KEY_FIELD} = %s"
+        else:
+            query = f"UPDATE {self.table_name} SET age = age + 1, first_name = 'test_name' WHERE {self.KEY_FIELD} = %s"
+        modified, samples = self._write(self._execute, query, (key,))
+        return modified, self.timing.server_time(samples, 'update')
 
-        return deleted_count, execution_time
+    @RetryDecorator.retry_on_error()
+    def insert_user(self, user_data: Dict[str, Any]) -> Tuple[int, float]:
+        inserted, samples = self._write(self._execute, self._insert_query(user_data), user_data)
+        return inserted, self.timing.server_time(samples, 'insert')
+
+    @RetryDecorator.retry_on_error()
+    def scan_users(self, start_key: int, limit: int) -> Tuple[List[Dict[str, Any]], float]:
+        query = f"SELECT * FROM {self.table_name} WHERE {self.KEY_FIELD} >= %s ORDER BY {self.KEY_FIELD} LIMIT %s"
+        rows, samples = self._read(self._select, query, (start_key, limit))
+        return list(rows), self.timing.server_time(samples, 'select')
 
     @RetryDecorator.retry_on_error()
     def clear_collection(self) -> bool:
@@ -158,6 +331,15 @@ class MySQLUserRepository(Repository):
             ProgressLogger.error(f"Error clearing table {self.table_name}: {e}")
             return False
 
+    def warm_up(self) -> float:
+        return self._query_executor.warm_up()
+
+    def pool_metrics(self) -> Dict[str, Any]:
+        return self._query_executor.pool_metrics()
+
+    def repository_spec(self) -> Tuple[str, str]:
+        return DatabaseType.MYSQL.value, self.table_name
+
     def create_indexes(self, index_type: IndexType, table_name: str) -> bool:
         return self._index_manager.create_indexes(index_type, table_name)
 
@@ -199,6 +381,11 @@ class MySQLUserRepository(Repository):
             return False
 
     def close(self) -> None:
+        try:
+            self.commit_pending()
+        except Exception as e:
+            ProgressLogger.error(f"Error committing pending transactions: {e}")
+
         if hasattr(self, 'cursor') and self.cursor:
             try:
                 self.cursor.close()
@@ -206,13 +393,13 @@ class MySQLUserRepository(Repository):
                 ProgressLogger.error(f"Error closing cursor: {e}")
             self.cursor = None
 
-        if hasattr(self, '_query_executor') and self._query_executor:
+        if hasattr(self, '_query_executor') and self._query_executor and self._owns_executor:
             try:
                 self._query_executor.close()
             except Exception as e:
                 ProgressLogger.error(f"Error closing query executor: {e}")
 
-        if hasattr(self, 'db') and self.db:
+        if hasattr(self, 'db') and self.db and self._owns_connection:
             try:
                 self.db.close_connection()
             except Exception as e:
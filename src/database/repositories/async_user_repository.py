@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+
+class AsyncUserRepository(ABC):
+    @abstractmethod
+    def use(self, name: str):
+        pass
+
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def create_users_bulk(self, users_data: List[Dict]) -> Tuple[List[str], float]:
+        pass
+
+    @abstractmethod
+    async def get_all_users(self, client_id: int) -> Tuple[List[Dict], float]:
+        pass
+
+    @abstractmethod
+    async def clear_collection(self):
+        pass
+
+    @abstractmethod
+    async def delete_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
+        pass
+
+    @abstractmethod
+    async def update_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
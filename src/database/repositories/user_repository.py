@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 class UserRepository():
     @abstractmethod
@@ -28,4 +28,20 @@ class UserRepository():
 
     @abstractmethod
     def update_users(self, client_id: int, record_type: str) -> Tuple[int, float]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def read_user(self, key: int) -> Tuple[Optional[Dict], float]:
+        pass
+
+    @abstractmethod
+    def update_user(self, key: int, record_type: str) -> Tuple[int, float]:
+        pass
+
+    @abstractmethod
+    def insert_user(self, user_data: Dict) -> Tuple[int, float]:
+        pass
+
+    @abstractmethod
+    def scan_users(self, start_key: int, limit: int) -> Tuple[List[Dict], float]:
+        pass
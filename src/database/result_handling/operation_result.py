@@ -12,3 +12,29 @@ class OperationResult:
     indexes_type: str
     threads: int
     iteration: int
+    wall_time: float = 0.0
+    ops_per_sec: float = 0.0
+    rows_per_sec: float = 0.0
+    fairness: float = 0.0
+    client_driver: str = ''
+    insert_strategy: str = ''
+    commit_time: float = 0.0
+    commits: int = 0
+    producer_wait_time: float = 0.0
+    fetch_mode: str = ''
+    transfer_time: float = 0.0
+    decode_time: float = 0.0
+    round_trips: float = 0.0
+    first_row_time: float = 0.0
+    drain_time: float = 0.0
+    failed_records: int = 0
+    client_latency: float = 0.0
+    server_latency: float = 0.0
+    queue_time: float = 0.0
+    driver_time: float = 0.0
+    unattributed_time: float = 0.0
+    p50: float = 0.0
+    p90: float = 0.0
+    p99: float = 0.0
+    p999: float = 0.0
+    max_latency: float = 0.0
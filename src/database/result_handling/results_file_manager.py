@@ -3,7 +3,7 @@ import json
 import pandas as pd
 from dataclasses import asdict
 from datetime import datetime
-from typing import List
+from typing import List, Dict, Any, Optional
 
 from .operation_result import OperationResult
 from ..utils.logging_config import ProgressLogger
@@ -39,25 +39,44 @@ class ResultsFileManager:
         self.current_results_dir = os.path.join(self.main_results_dir, folder)
         os.makedirs(self.current_results_dir, exist_ok=True)
 
-    def save_results(self, results: List[OperationResult], df: pd.DataFrame):
+    def save_results(self, results: List[OperationResult], df: pd.DataFrame,
+                     metadata: Optional[Dict[str, Any]] = None):
         records = df['records'].iat[0] if not df.empty else 0
         self._save_csv(df, records)
-        self._save_json(results, records)
+        self._save_json(results, records, metadata)
 
     def _save_csv(self, df: pd.DataFrame, records: int):
         path = os.path.join(self.current_results_dir, f"results_{records}.csv")
         df.to_csv(path, index=False)
         ProgressLogger.print(f"Results saved to CSV: {path}")
 
-    def _save_json(self, results: List[OperationResult], records: int):
+    def _save_json(self, results: List[OperationResult], records: int,
+                   metadata: Optional[Dict[str, Any]] = None):
         path = os.path.join(self.current_results_dir, f"results_{records}.json")
         data = {'results': [asdict(r) for r in results]}
         for r in data['results']:
             r['timestamp'] = r['timestamp'].isoformat()
+        if metadata:
+            data['metadata'] = metadata
         with open(path, 'w') as f:
             json.dump(data, f, indent=2)
         ProgressLogger.print(f"Results saved to JSON: {path}")
 
+    def save_table(self, name: str, records: int, rows: List[Dict[str, Any]]):
+        csv_path = os.path.join(self.current_results_dir, f"{name}_{records}.csv")
+        pd.DataFrame(rows).to_csv(csv_path, index=False)
+        json_path = os.path.join(self.current_results_dir, f"{name}_{records}.json")
+        with open(json_path, 'w') as f:
+            json.dump({name: rows}, f, indent=2)
+        ProgressLogger.print(f"Results saved to CSV: {csv_path}")
+        ProgressLogger.print(f"Results saved to JSON: {json_path}")
+
+    def save_histograms(self, records: int, data: Dict[str, Any]):
+        path = os.path.join(self.current_results_dir, f"latency_histograms_{records}.json")
+        with open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        ProgressLogger.print(f"Latency histograms saved to JSON: {path}")
+
     def get_chart_path(self, method: str, records: int, suffix: str = None) -> str:
         name = f"chart_{method}_{records}"
         if suffix:
@@ -1,5 +1,5 @@
 import pandas as pd
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Union, Optional, Any
 import os
 
 from .operation_result import OperationResult
@@ -19,6 +19,7 @@ class ResultsVisualizer:
             indexes_type: Union[str, IndexType]
     ):
         self.results: List[OperationResult] = []
+        self.metadata: Dict[str, Any] = {}
         self.iterations = iterations
         self.indexes_type = (
             indexes_type.value if isinstance(indexes_type, IndexType) else indexes_type
@@ -31,9 +32,12 @@ class ResultsVisualizer:
         )
         self.results_dir = self.file_manager.main_results_dir
 
+    def set_metadata(self, key: str, value: Any):
+        self.metadata[key] = value
+
     def add_result(self, database: str, operation: str, records: int, time: float,
                    timing_method: str, indexes_type: str,
-                   threads: int, iteration: int):
+                   threads: int, iteration: int, **metrics):
         if indexes_type:
             self.indexes_type = indexes_type
             self.file_manager = ResultsFileManager(
@@ -45,7 +49,7 @@ class ResultsVisualizer:
             database=database, operation=operation, records=records,
             time=time, timestamp=pd.Timestamp.now(),
             timing_method=timing_method, indexes_type=self.indexes_type,
-            threads=threads, iteration=iteration
+            threads=threads, iteration=iteration, **metrics
         )
         self.results.append(result)
 
@@ -73,11 +77,12 @@ class ResultsVisualizer:
                 results_dir=self.results_dir
             )
             self._show_standard_chart(df)
+            self._show_latency_breakdown_chart(df)
             if self.iterations > 1:
                 self._show_histogram_chart(df)
                 self._show_iterations_comparison_chart(df)
             ProgressLogger.print(df.to_string(index=False))
-            self.file_manager.save_results(results, df)
+            self.file_manager.save_results(results, df, self.metadata)
 
     def _show_standard_chart(self, df: pd.DataFrame):
         if df.empty:
@@ -87,6 +92,14 @@ class ResultsVisualizer:
         chart_path = self.file_manager.get_chart_path(method, records)
         ChartGenerator.generate_standard_chart(df, chart_path)
 
+    def _show_latency_breakdown_chart(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        method = df['timing_method'].iat[0]
+        records = df['records'].iat[0]
+        chart_path = self.file_manager.get_chart_path(method, records, suffix="latency_breakdown")
+        ChartGenerator.generate_latency_breakdown_chart(df, chart_path)
+
     def _show_histogram_chart(self, df: pd.DataFrame):
         if df.empty:
             return
@@ -103,6 +116,49 @@ class ResultsVisualizer:
         chart_path = self.file_manager.get_chart_path(method, records, suffix="iterations_comparison")
         ChartGenerator.generate_iterations_comparison_chart(df, chart_path)
 
+    def _use_index_folder(self, records: int, indexes_type: Optional[str]):
+        current_index = indexes_type or self.indexes_type
+        if self.file_manager.indexes_type != current_index:
+            self.file_manager = ResultsFileManager(
+                self.file_manager.base_dir,
+                records,
+                "database",
+                current_index,
+                results_dir=self.results_dir
+            )
+
+    def show_open_loop_results(self, rows: List[Dict], records: int, indexes_type: Optional[str] = None):
+        if not rows:
+            return
+        self._use_index_folder(records, indexes_type)
+        self.file_manager.save_table("open_loop", records, rows)
+        chart_path = self.file_manager.get_chart_path("database", records, suffix="open_loop")
+        ChartGenerator.generate_latency_vs_load_chart(rows, chart_path)
+
+    def show_workload_results(self, rows: List[Dict], records: int, indexes_type: Optional[str] = None):
+        if not rows:
+            return
+        self._use_index_folder(records, indexes_type)
+        self.file_manager.save_table("workloads", records, rows)
+        for workload in sorted({r["workload"] for r in rows}):
+            chart_path = self.file_manager.get_chart_path("database", records, suffix=f"workload_{workload}")
+            ChartGenerator.generate_workload_chart([r for r in rows if r["workload"] == workload], chart_path)
+
+    def save_statement_samples(self, rows: List[Dict], records: int, indexes_type: Optional[str] = None):
+        if not rows:
+            return
+        self._use_index_folder(records, indexes_type)
+        self.file_manager.save_table("statement_samples", records, rows)
+
+    def save_latency_histograms(self, iterations: List[Dict], merged: List[Dict], records: int,
+                                indexes_type: Optional[str] = None):
+        if not merged:
+            return
+        self._use_index_folder(records, indexes_type)
+        self.file_manager.save_histograms(records, {"iterations": iterations, "merged": merged})
+        chart_path = self.file_manager.get_chart_path("database", records, suffix="percentiles")
+        ChartGenerator.generate_percentile_chart(merged, chart_path)
+
     def show_clients_comparison_chart(self, database: str, client_results: List[Dict], records: int,
                                       indexes_type: Optional[str] = None):
         if not client_results:
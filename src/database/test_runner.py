@@ -1,13 +1,23 @@
 import gc
-from typing import List, Dict, Any
+import os
+import secrets
+from typing import List, Dict, Any, Optional
 
 from .repositories.database_type import DatabaseType
 from .testers.mongodb_tester import MongoDBTester
 from .testers.mysql_tester import MySQLTester
 from .result_handling.results_visualizer import ResultsVisualizer
+from .data.client_dataset import ClientDataset
+from .data.dataset_cache import DatasetCache
+from .data.payload_cache import PayloadCache
+from .data.distributions import DistributionConfig
+from .data.multi_client_data_generator import MultiClientDataGenerator
 from .utils.logging_config import ProgressLogger
 from .common.index_types import IndexType
 from .common.config_manager import ConfigManager
+from .common.resource_registry import ResourceRegistry
+from .common.latency_histogram import LatencyHistogram
+from .common.fetch_stats import DICT, STREAM
 
 class TestRunner:
     DB_LIST = ("MongoDB", "MySQL")
@@ -34,6 +44,56 @@ class TestRunner:
         )
 
         self.client_results = {db: {idx: [] for idx in self.index_types} for db in self.DB_LIST}
+        self.warm_ups: List[Dict[str, Any]] = []
+        self.statement_samples: List[Dict[str, Any]] = []
+        self.timing_overflows: List[Dict[str, Any]] = []
+        self.latency_histograms: List[Dict[str, Any]] = []
+        self.visualizer.set_metadata('pool_warm_up', self.warm_ups)
+        self.visualizer.set_metadata('statement_history_overflows', self.timing_overflows)
+
+        seeded = self.config_manager.get('seed') is not None
+        if not seeded:
+            self.config_manager.set('seed', secrets.randbits(32))
+        ProgressLogger.important_info(f"Using test data seed: {self.config_manager.get('seed')}")
+
+        self.distribution = DistributionConfig.from_config(self.config_manager)
+        self.visualizer.set_metadata('seed', self.config_manager.get('seed'))
+        self.visualizer.set_metadata('distribution', self.distribution.to_dict())
+        if self.config_manager.get('fetch_mode', DICT) == STREAM:
+            self.visualizer.set_metadata('mysql_stream_fetch_timing', {
+                'server_time': 'TIMER_WAIT of the SSCursor SELECT; it keeps running while the client drains rows, '
+                               'so it already includes transfer and transfer_time stays near 0',
+                'first_row_time': 'client time from execute until the first fetchmany batch arrived',
+                'drain_time': 'client time spent reading the remaining batches',
+            })
+
+        self.dataset_cache = None
+        use_dataset_cache = str(self.config_manager.get('dataset_cache', 'True')).lower() == 'true'
+        if use_dataset_cache and not seeded:
+            ProgressLogger.important_info("Dataset cache skipped: no --seed given, a random dataset is never reused")
+            use_dataset_cache = False
+        if use_dataset_cache:
+            cache_dir = os.path.join(self.visualizer.file_manager.base_dir, 'cache')
+            max_bytes = int(self.config_manager.get('dataset_cache_size_mb', 2048)) * 1024 * 1024
+            self.dataset_cache = DatasetCache(cache_dir, max_bytes)
+
+        self.payload_cache = None
+        if str(self.config_manager.get('payload_cache', 'False')).lower() == 'true':
+            max_bytes = int(self.config_manager.get('payload_cache_size_mb', 1024)) * 1024 * 1024
+            self.payload_cache = PayloadCache(max_bytes)
+            for tester in self.testers.values():
+                tester.payload_cache = self.payload_cache
+
+    def _load_test_data(self) -> Optional[ClientDataset]:
+        if self.config_manager.get('insert_mode', 'batch') == 'stream':
+            return None
+        record_type = self.config_manager.get('record_type')
+        clients = self.config_manager.get('clients', 1)
+        ProgressLogger.important_info(f"Preparing test data with type: {record_type}")
+        return MultiClientDataGenerator.load_or_generate_dataset(
+            self.total_records, clients, record_type, self.config_manager.get('seed'), self.dataset_cache,
+            self.distribution, self.config_manager.get('generator_workers')
+        )
 
     def _drop_test_collections(self, tester) -> None:
         repo = tester.repository
@@ -63,35 +123,152 @@ class TestRunner:
             except Exception as e:
                 ProgressLogger.error(f"Error cleaning {db}: {e}")
 
+    def _add_result(self, db: str, operation: str, t: float, idx: str, iteration: int) -> None:
+        metrics = self.testers[db].phase_metrics.get(operation)
+        extra = metrics.as_result_fields() if metrics else {}
+        threads = self.config_manager.get('clients', 1) if metrics else 1
+        self.visualizer.add_result(db, operation, self.total_records, t, "database", idx, threads, iteration, **extra)
+
     def _save_results(self, db: str, idx: str, iteration: int, insert_t: float, fetch_t: float, inserted: int, results: List[Dict]) -> None:
         for r in results:
             r["iteration"] = iteration
         self.client_results.setdefault(db, {}).setdefault(idx, []).extend(results)
 
-        self.visualizer.add_result(db, "Insert", self.total_records, insert_t, "database", idx, 1, iteration)
-        self.visualizer.add_result(db, "Select", self.total_records, fetch_t, "database", idx, 1, iteration)
+        encode = self.testers[db].phase_metrics.get("Encode")
+        if encode:
+            self._add_result(db, "Encode", encode.wall_time, idx, iteration)
+        self._add_result(db, "Insert", insert_t, idx, iteration)
+        self._add_result(db, "Select", fetch_t, idx, iteration)
 
     def _save_update_results(self, db: str, idx: str, iteration: int, update_t: float, updated: int, results: List[Dict]) -> None:
         for r in results:
             r["iteration"] = iteration
         self.client_results.setdefault(db, {}).setdefault(idx, []).extend(results)
 
-        self.visualizer.add_result(db, "Update", self.total_records, update_t, "database", idx, 1, iteration)
+        self._add_result(db, "Update", update_t, idx, iteration)
 
     def _save_delete_results(self, db: str, idx: str, iteration: int, delete_t: float, deleted: int, results: List[Dict]) -> None:
         for r in results:
             r["iteration"] = iteration
         self.client_results.setdefault(db, {}).setdefault(idx, []).extend(results)
 
-        self.visualizer.add_result(db, "Delete", self.total_records, delete_t, "database", idx, 1, iteration)
+        self._add_result(db, "Delete", delete_t, idx, iteration)
+
+    def _collect_statement_samples(self, db: str, idx: str, iteration: int) -> None:
+        repo = self.testers[db].repository
+        if not hasattr(repo, "take_statement_samples"):
+            return
+        samples, dropped = repo.take_statement_samples()
+        if dropped:
+            ProgressLogger.warn(f"{db}: dropped {dropped} statement samples over the per-iteration limit")
+        overflows = repo.take_timing_overflows() if hasattr(repo, "take_timing_overflows") else 0
+        if overflows:
+            ProgressLogger.warn(
+                f"{db}: {overflows} statement timing windows lost to events_statements_history_long overflow "
+                f"in iteration {iteration} ({idx}); server time for this iteration is undercounted"
+            )
+            self.timing_overflows.append({"database": db, "indexes_type": idx, "iteration": iteration,
+                                          "overflows": overflows})
+        self.statement_samples.extend(
+            {"database": db, "indexes_type": idx, "iteration": iteration, **s.to_dict()} for s in samples
+        )
+
+    def _collect_histograms(self, db: str, idx: str, iteration: int) -> None:
+        for operation, histogram in self.testers[db].latency_histograms.items():
+            self.latency_histograms.append({
+                "database": db, "operation": operation, "indexes_type": idx, "iteration": iteration,
+                "histogram": histogram,
+            })
+
+    def _save_histograms(self, idx: str) -> None:
+        merged: Dict[tuple, LatencyHistogram] = {}
+        for entry in self.latency_histograms:
+            key = (entry["database"], entry["operation"])
+            merged.setdefault(key, LatencyHistogram()).merge(entry["histogram"])
+        iterations = [
+            {**{k: v for k, v in entry.items() if k != "histogram"}, "histogram": entry["histogram"].to_dict()}
+            for entry in self.latency_histograms
+        ]
+        summaries = [
+            {"database": db, "operation": operation, "indexes_type": idx, **histogram.summary(),
+             "histogram": histogram.to_dict()}
+            for (db, operation), histogram in merged.items()
+        ]
+        self.visualizer.save_latency_histograms(iterations, summaries, self.total_records, idx)
+        self.latency_histograms = []
+
+    def _record_profiler_checks(self, idx: str) -> None:
+        checks = {}
+        for db_name, tester in self.testers.items():
+            if not hasattr(tester.repository, "take_profiler_checks"):
+                continue
+            rows = tester.repository.take_profiler_checks()
+            if not rows:
+                continue
+            command_ms = sum(r["command_ms"] for r in rows)
+            profiler_ms = sum(r["profiler_ms"] for r in rows)
+            checks[db_name] = {
+                "samples": len(rows),
+                "mean_command_ms": command_ms / len(rows),
+                "mean_profiler_ms": profiler_ms / len(rows),
+                "profiler_to_command_ratio": profiler_ms / command_ms if command_ms else 0.0,
+            }
+            ProgressLogger.important_info(
+                f"{db_name} profiler cross-check: {len(rows)} operations, command monitor "
+                f"{checks[db_name]['mean_command_ms']:.3f} ms vs profiler {checks[db_name]['mean_profiler_ms']:.3f} ms"
+            )
+        if checks:
+            self.visualizer.set_metadata(f"profiler_cross_check_{idx}", checks)
+
+    def _run_open_loop(self, idx: str, test_data: Optional[ClientDataset]) -> None:
+        rows = []
+        for db_name, tester in self.testers.items():
+            try:
+                levels = tester.run_open_loop(idx, test_data)
+            except Exception as e:
+                ProgressLogger.error(f"Error running open-loop workload on {db_name} with {idx} index: {e}")
+                continue
+            for level in levels:
+                level["database"] = db_name
+                level["indexes_type"] = idx
+            rows.extend(levels)
+        self.visualizer.show_open_loop_results(rows, self.total_records, idx)
+
+    def _record_pool_metrics(self, idx: str) -> None:
+        pools = {}
+        for db_name, tester in self.testers.items():
+            if not hasattr(tester.repository, "pool_metrics"):
+                continue
+            metrics = tester.repository.pool_metrics()
+            pools[db_name] = metrics
+            ProgressLogger.important_info(
+                f"{db_name} pool: size {metrics['pool_size']}, max in use {metrics['max_in_use']}, "
+                f"created {metrics['created']}, mean wait {metrics['mean_wait_ms']:.2f} ms, "
+                f"max wait {metrics['max_wait_ms']:.2f} ms, timeouts {metrics['timeouts']}"
+            )
+        self.visualizer.set_metadata(f"connection_pools_{idx}", pools)
+
+    def _run_workloads(self, idx: str, test_data: Optional[ClientDataset]) -> None:
+        rows = []
+        for db_name, tester in self.testers.items():
+            try:
+                results = tester.run_workloads(idx, test_data)
+            except Exception as e:
+                ProgressLogger.error(f"Error running workloads on {db_name} with {idx} index: {e}")
+                continue
+            for row in results:
+                row["database"] = db_name
+                row["indexes_type"] = idx
+            rows.extend(results)
+        self.visualizer.show_workload_results(rows, self.total_records, idx)
 
     def run(self) -> bool:
+        test_data = self._load_test_data()
+
         for idx in self.index_types:
             ProgressLogger.important_info(f"Starting tests for index type: {idx.upper()}")
             self.clean_databases()
 
-            test_data_cache = {}
-
             for i in range(1, self.iterations + 1):
                 ProgressLogger.important_info(f"Running iteration {i} for index type {idx.upper()}")
 
@@ -99,8 +276,9 @@ class TestRunner:
                     ProgressLogger.important_info(f"Testing {db_name} - Iteration {i}")
 
                     tester.repository.clear_collection()
+                    tester.phase_metrics.clear()
+                    tester.latency_histograms.clear()
 
-                    test_data = test_data_cache.get(i)
                     try:
                         insert_t, fetch_t, inserted, results, generated_data = tester.test_fetch_all_users(
                             iteration=i,
@@ -116,6 +294,9 @@ class TestRunner:
                         generated_data = None
 
                     self._save_results(db_name, idx, i, insert_t, fetch_t, inserted, results)
+                    self.warm_ups.append({
+                        "database": db_name, "indexes_type": idx, "iteration": i, "warm_up_ms": tester.warm_up_ms
+                    })
 
                     test_update = self.config_manager.get('test_update', 'True').lower() == 'true'
                     if test_update:
@@ -143,11 +324,30 @@ class TestRunner:
                         except Exception as e:
                             ProgressLogger.error(f"Error testing delete on {db_name} with {idx} index: {e}")
 
-                    if generated_data is not None and i not in test_data_cache:
-                        test_data_cache[i] = generated_data
+                    self._collect_statement_samples(db_name, idx, i)
+                    self._collect_histograms(db_name, idx, i)
+
+                    if test_data is None and generated_data is not None:
+                        test_data = generated_data
 
                     gc.collect()
 
+            if str(self.config_manager.get('open_loop', 'False')).lower() == 'true':
+                self._run_open_loop(idx, test_data)
+
+            if self.config_manager.get('workload'):
+                self._run_workloads(idx, test_data)
+
+            self._record_pool_metrics(idx)
+            self._record_profiler_checks(idx)
+            for db_name in self.testers:
+                self._collect_statement_samples(db_name, idx, 0)
+            self.visualizer.save_statement_samples(self.statement_samples, self.total_records, idx)
+            self.statement_samples = []
+            self._save_histograms(idx)
+            if self.payload_cache is not None:
+                self.visualizer.set_metadata(f"payload_cache_{idx}", self.payload_cache.stats())
+
             for tester in self.testers.values():
                 self._drop_test_collections(tester)
 
@@ -174,4 +374,7 @@ class TestRunner:
 
         self.testers.clear()
         self.client_results.clear()
+        if self.payload_cache is not None:
+            self.payload_cache.clear()
+        ResourceRegistry.close_all()
         gc.collect()
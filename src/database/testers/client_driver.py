@@ -0,0 +1,371 @@
+import asyncio
+import multiprocessing as mp
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, astuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..common.config_manager import ConfigManager
+from ..common.latency_histogram import LatencyHistogram
+from ..common.timing_overhead import TimingOverhead
+from ..repositories.async_user_repository import AsyncUserRepository
+from ..repositories.database_type import DatabaseType
+from ..repositories.user_repository import UserRepository
+
+
+@dataclass
+class ClientTiming:
+    client_id: int
+    records: int
+    server_time: float
+    started_ns: int
+    finished_ns: int
+    overhead_ns: int = 0
+
+    @property
+    def wall_time(self) -> float:
+        return (self.finished_ns - self.started_ns - self.overhead_ns) / 1e6
+
+    def to_result(self) -> Dict[str, Any]:
+        return {
+            "client_id": self.client_id,
+            "records": self.records,
+            "time": self.server_time,
+            "wall_time": self.wall_time,
+        }
+
+
+@dataclass
+class PhaseMetrics:
+    server_time: float = 0.0
+    records: int = 0
+    wall_time: float = 0.0
+    ops_per_sec: float = 0.0
+    rows_per_sec: float = 0.0
+    fairness: float = 0.0
+    client_driver: str = ''
+    insert_strategy: str = ''
+    commit_time: float = 0.0
+    commits: int = 0
+    producer_wait_time: float = 0.0
+    fetch_mode: str = ''
+    transfer_time: float = 0.0
+    decode_time: float = 0.0
+    round_trips: float = 0.0
+    first_row_time: float = 0.0
+    drain_time: float = 0.0
+    failed_records: int = 0
+    client_latency: float = 0.0
+    server_latency: float = 0.0
+    queue_time: float = 0.0
+    driver_time: float = 0.0
+    unattributed_time: float = 0.0
+    p50: float = 0.0
+    p90: float = 0.0
+    p99: float = 0.0
+    p999: float = 0.0
+    max_latency: float = 0.0
+
+    @classmethod
+    def from_timings(cls, timings: List[ClientTiming], client_driver: str) -> 'PhaseMetrics':
+        if not timings:
+            return cls(client_driver=client_driver)
+        records = sum(t.records for t in timings)
+        wall_ns = max(t.finished_ns for t in timings) - min(t.started_ns for t in timings)
+        wall_s = wall_ns / 1e9
+        return cls(
+            server_time=sum(t.server_time for t in timings) / len(timings),
+            records=records,
+            wall_time=wall_ns / 1e6,
+            ops_per_sec=len(timings) / wall_s if wall_s > 0 else 0.0,
+            rows_per_sec=records / wall_s if wall_s > 0 else 0.0,
+            fairness=cls._jain_index(timings),
+            client_driver=client_driver,
+            client_latency=sum(t.wall_time for t in timings) / len(timings),
+            server_latency=sum(t.server_time for t in timings) / len(timings),
+        )
+
+    def apply_histogram(self, histogram: LatencyHistogram) -> None:
+        summary = histogram.summary()
+        self.p50 = summary['p50']
+        self.p90 = summary['p90']
+        self.p99 = summary['p99']
+        self.p999 = summary['p999']
+        self.max_latency = summary['max']
+
+    def attribute_latency(self, queue_time: Optional[float] = None) -> None:
+        if queue_time is not None:
+            self.queue_time = queue_time
+        self.driver_time = self.decode_time
+        self.unattributed_time = max(
+            0.0, self.client_latency - self.server_latency - self.queue_time - self.driver_time
+        )
+
+    @staticmethod
+    def _jain_index(timings: List[ClientTiming]) -> float:
+        rates = [
+            (t.records or 1) / (t.wall_time / 1000)
+            for t in timings if t.wall_time > 0
+        ]
+        if not rates:
+            return 1.0
+        return sum(rates) ** 2 / (len(rates) * sum(r * r for r in rates))
+
+    def as_result_fields(self) -> Dict[str, Any]:
+        fields = asdict(self)
+        del fields['server_time']
+        del fields['records']
+        return fields
+
+
+def count_records(result: Any) -> int:
+    if isinstance(result, int):
+        return result
+    if isinstance(result, list):
+        return len(result)
+    return 0
+
+
+class ClientDriver(ABC):
+    name = ''
+
+    def __init__(self, config_manager: Optional[ConfigManager] = None):
+        self.config_manager = config_manager
+
+    @abstractmethod
+    def run(self, repository: UserRepository, targets: List[int], method: str,
+            kwargs: Dict[str, Any]) -> List[ClientTiming]:
+        pass
+
+    @staticmethod
+    def _call(repository: UserRepository, client_id: int, method: str, kwargs: Dict[str, Any]) -> ClientTiming:
+        with TimingOverhead.measure() as overhead:
+            started = time.perf_counter_ns()
+            result, server_time = getattr(repository, method)(client_id=client_id, **kwargs)
+            finished = time.perf_counter_ns()
+        return ClientTiming(client_id, count_records(result), server_time, started, finished, overhead.ns)
+
+    def close(self) -> None:
+        pass
+
+
+class SequentialClientDriver(ClientDriver):
+    name = 'sequential'
+
+    def run(self, repository: UserRepository, targets: List[int], method: str,
+            kwargs: Dict[str, Any]) -> List[ClientTiming]:
+        return [self._call(repository, cid, method, kwargs) for cid in targets]
+
+
+class ThreadClientDriver(ClientDriver):
+    name = 'thread'
+
+    def run(self, repository: UserRepository, targets: List[int], method: str,
+            kwargs: Dict[str, Any]) -> List[ClientTiming]:
+        if not targets:
+            return []
+        barrier = threading.Barrier(len(targets))
+
+        def _client(cid: int) -> ClientTiming:
+            barrier.wait()
+            return self._call(repository, cid, method, kwargs)
+
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="client") as executor:
+            futures = [executor.submit(_client, cid) for cid in targets]
+            return [future.result() for future in futures]
+
+
+def create_repository(db_type: str, name: str, config_manager: ConfigManager) -> UserRepository:
+    if db_type == DatabaseType.MYSQL.value:
+        from ..mysql.mysql_user_repository import MySQLUserRepository
+        return MySQLUserRepository(table_name=name, config_manager=config_manager)
+    from ..mongodb.mongodb_user_repository import MongoDBUserRepository
+    return MongoDBUserRepository(collection_name=name, config_manager=config_manager)
+
+
+def create_async_repository(db_type: str, name: str, config_manager: ConfigManager) -> AsyncUserRepository:
+    if db_type == DatabaseType.MYSQL.value:
+        from ..mysql.mysql_async_user_repository import MySQLAsyncUserRepository
+        return MySQLAsyncUserRepository(table_name=name, config_manager=config_manager)
+    from ..mongodb.mongodb_async_user_repository import MongoDBAsyncUserRepository
+    return MongoDBAsyncUserRepository(collection_name=name, config_manager=config_manager)
+
+
+def take_client_stats(repository: UserRepository) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {}
+    if hasattr(repository, 'commit_pending'):
+        stats['commits'] = repository.commit_pending()
+    if hasattr(repository, 'take_fetch_stats'):
+        stats['fetch_stats'] = repository.take_fetch_stats()
+    if hasattr(repository, 'take_statement_samples'):
+        stats['statement_samples'] = repository.take_statement_samples()
+    if hasattr(repository, 'take_timing_overflows'):
+        stats['timing_overflows'] = repository.take_timing_overflows()
+    if hasattr(repository, 'take_profiler_checks'):
+        stats['profiler_checks'] = repository.take_profiler_checks()
+    return stats
+
+
+def _process_client(
+        slot: int,
+        client_id: int,
+        spec: Tuple[str, str],
+        config_values: Dict[str, Any],
+        method: str,
+        kwargs: Dict[str, Any],
+        barrier,
+        results
+) -> None:
+    repository = None
+    reported = False
+    try:
+        config_manager = ConfigManager(**config_values)
+        repository = create_repository(*spec, config_manager)
+        barrier.wait()
+        timing = ClientDriver._call(repository, client_id, method, kwargs)
+        results.put((slot, astuple(timing), take_client_stats(repository)))
+        reported = True
+        barrier.wait()
+    except Exception as e:
+        barrier.abort()
+        if not reported:
+            results.put((slot, None, repr(e)))
+    finally:
+        if repository is not None:
+            repository.close()
+
+
+class ProcessClientDriver(ClientDriver):
+    name = 'process'
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, config_manager: Optional[ConfigManager] = None):
+        super().__init__(config_manager or ConfigManager())
+        timeout = self.config_manager.get('client_timeout')
+        self.timeout = float(timeout) if timeout else None
+        self._context = mp.get_context('spawn')
+
+    def _collect(self, processes: List[mp.Process], results) -> Dict[int, Tuple[Tuple, Dict[str, Any]]]:
+        reports: Dict[int, Tuple[Tuple, Dict[str, Any]]] = {}
+        pending = set(range(len(processes)))
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        exited = False
+        while pending:
+            try:
+                slot, timing, stats = results.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                dead = [slot for slot in pending if processes[slot].exitcode is not None]
+                if dead and exited:
+                    process = processes[dead[0]]
+                    raise RuntimeError(
+                        f"{len(dead)} client process(es) exited without a result: "
+                        f"{process.name} exit code {process.exitcode}"
+                    )
+                exited = bool(dead)
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"{len(pending)} client process(es) did not finish within {self.timeout} s")
+                continue
+            if timing is None:
+                raise RuntimeError(f"Client process {processes[slot].name} failed: {stats}")
+            pending.discard(slot)
+            reports[slot] = (timing, stats)
+        return reports
+
+    def run(self, repository: UserRepository, targets: List[int], method: str,
+            kwargs: Dict[str, Any]) -> List[ClientTiming]:
+        if not targets:
+            return []
+        barrier = self._context.Barrier(len(targets))
+        results = self._context.Queue()
+        spec = repository.repository_spec()
+        config_values = self.config_manager.as_dict()
+
+        processes = [
+            self._context.Process(
+                target=_process_client,
+                args=(slot, cid, spec, config_values, method, kwargs, barrier, results),
+                name=f"client-{cid}",
+            )
+            for slot, cid in enumerate(targets)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            reports = self._collect(processes, results)
+        except Exception:
+            barrier.abort()
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        if hasattr(repository, 'merge_client_stats'):
+            for _, stats in reports.values():
+                repository.merge_client_stats(stats)
+        return [ClientTiming(*reports[slot][0]) for slot in sorted(reports)]
+
+
+class AsyncClientDriver(ClientDriver):
+    name = 'async'
+
+    def __init__(self, config_manager: Optional[ConfigManager] = None):
+        super().__init__(config_manager or ConfigManager())
+        self._loop = asyncio.new_event_loop()
+        self._repositories: Dict[str, AsyncUserRepository] = {}
+
+    def run(self, repository: UserRepository, targets: List[int], method: str,
+            kwargs: Dict[str, Any]) -> List[ClientTiming]:
+        if not targets:
+            return []
+        return self._loop.run_until_complete(self._run(repository.repository_spec(), targets, method, kwargs))
+
+    async def _repository(self, spec: Tuple[str, str]) -> AsyncUserRepository:
+        db_type, name = spec
+        repository = self._repositories.get(db_type)
+        if repository is None:
+            repository = create_async_repository(db_type, name, self.config_manager)
+            await repository.connect()
+            self._repositories[db_type] = repository
+        repository.use(name)
+        return repository
+
+    async def _run(self, spec: Tuple[str, str], targets: List[int], method: str,
+                   kwargs: Dict[str, Any]) -> List[ClientTiming]:
+        repository = await self._repository(spec)
+        barrier = asyncio.Barrier(len(targets))
+
+        async def _client(cid: int) -> ClientTiming:
+            await barrier.wait()
+            with TimingOverhead.measure() as overhead:
+                started = time.perf_counter_ns()
+                result, server_time = await getattr(repository, method)(client_id=cid, **kwargs)
+                finished = time.perf_counter_ns()
+            return ClientTiming(cid, count_records(result), server_time, started, finished, overhead.ns)
+
+        return list(await asyncio.gather(*(_client(cid) for cid in targets)))
+
+    async def _close(self) -> None:
+        for repository in self._repositories.values():
+            await repository.close()
+        self._repositories.clear()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._loop.run_until_complete(self._close())
+        self._loop.close()
+
+
+CLIENT_DRIVERS = {
+    SequentialClientDriver.name: SequentialClientDriver,
+    ThreadClientDriver.name: ThreadClientDriver,
+    ProcessClientDriver.name: ProcessClientDriver,
+    AsyncClientDriver.name: AsyncClientDriver,
+}
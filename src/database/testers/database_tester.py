@@ -1,21 +1,56 @@
 import gc
-from typing import List, Dict, Tuple, Optional
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import replace
+from typing import Any, Callable, List, Dict, Tuple, Optional, Iterable, Iterator
 
 from ..common import IndexType
+from ..common.latency_histogram import LatencyHistogram
 from ..common.record_types import RecordType
+from ..common.timing_overhead import TimingOverhead
+from ..data.batch_producer import BatchProducer
+from ..data.client_dataset import ClientDataset
 from ..data.data_generator import DataGenerator
+from ..data.distributions import DistributionConfig
 from ..data.multi_client_data_generator import MultiClientDataGenerator
+from ..data.payload_cache import PayloadCache, EncodedBatch
 from ..repositories.user_repository import UserRepository
+from .client_driver import CLIENT_DRIVERS, PhaseMetrics
+from ..workloads.open_loop import OpenLoopLoadGenerator, CONSTANT
+from ..workloads.workload_engine import WorkloadEngine, WORKLOAD_PRESETS
 from ..utils.logging_config import set_current_iteration, ProgressLogger
 from ..common.config_manager import ConfigManager
 
-class DatabaseTester:
+class DatabaseTester(ABC):
+    FETCH_PHASE = 1
+    UPDATE_PHASE = 2
+    DELETE_PHASE = 3
+
     def __init__(self, repository: UserRepository, db_name: str, max_batch_size: int, show_progress: bool, config_manager: ConfigManager):
         self.repository = repository
         self.db_name = db_name
         self.max_batch_size = max_batch_size
         self.show_progress = show_progress
         self.config_manager = config_manager
+        self.distribution = DistributionConfig.from_config(config_manager)
+        self.client_driver = CLIENT_DRIVERS[config_manager.get("client_driver", "thread")](config_manager)
+        self.phase_metrics: Dict[str, PhaseMetrics] = {}
+        self.latency_histograms: Dict[str, LatencyHistogram] = {}
+        self.warm_up_ms = 0.0
+        self.payload_cache: Optional[PayloadCache] = None
+
+    def _target_clients(self, phase: int, unique: bool = False) -> List[int]:
+        clients = self.config_manager.get("clients", 1)
+        return self.distribution.pick_targets(clients, self.config_manager.get("seed"), phase, unique)
+
+    def _warm_up(self) -> None:
+        self.warm_up_ms = 0.0
+        if str(self.config_manager.get("pool_warm_up", "True")).lower() != "true":
+            return
+        if hasattr(self.repository, "warm_up"):
+            self.warm_up_ms = self.repository.warm_up()
+            ProgressLogger.important_info(f"{self.db_name} connection pool warmed up in {self.warm_up_ms:.2f} ms")
 
     def _check_index(self, index_type: IndexType) -> None:
         if index_type != IndexType.NO_INDEXES:
@@ -26,79 +61,399 @@ class DatabaseTester:
                 table_or_collection_name = self.repository.collection.name
             self.repository.create_indexes(index_type, table_or_collection_name)
 
-    def _generate_users(self, records: int) -> List[Dict]:
+    def _generate_users(self, records: int) -> ClientDataset:
         record_type = self.config_manager.get("record_type")
         ProgressLogger.important_info(f"Generating test record with type: {record_type}")
         clients = self.config_manager.get("clients", 1)
-        data = MultiClientDataGenerator.generate_data_for_clients(records, clients, record_type)
-        return [u for batch in data for u in batch]
+        seed = self.config_manager.get("seed")
+        workers = self.config_manager.get("generator_workers")
+        return MultiClientDataGenerator.generate_dataset(
+            records, clients, record_type, seed, self.distribution, workers
+        )
+
+    def _insert_batches(self, batches: Iterable[Any],
+                        insert: Optional[Callable[[Any], Tuple[List[str], float]]] = None,
+                        insert_strategy: Optional[str] = None) -> Tuple[float, int]:
+        insert = self._client_timed(insert or self.repository.create_users_bulk)
+        inflight = max(1, int(self.config_manager.get("inflight_batches", 1)))
+        histogram = LatencyHistogram()
+        queue_before = self._queue_wait_ms()
+        started_ns = time.perf_counter_ns()
+        if inflight > 1:
+            total_time, total_count, batch_count, client_ms, producer_wait = self._insert_pipelined(
+                batches, inflight, insert, histogram
+            )
+        else:
+            total_time, total_count, batch_count, client_ms = 0.0, 0, 0, 0.0
+            waited_before = self._producer_wait(batches)
+            for chunk in batches:
+                ids, elapsed, latency = insert(chunk)
+                total_time += elapsed
+                total_count += len(ids)
+                batch_count += 1
+                client_ms += latency
+                histogram.record(latency)
+            producer_wait = self._producer_wait(batches) - waited_before
+        commit_time, commits = self._commit_pending()
+        wall_s = max(0.0, (time.perf_counter_ns() - started_ns) / 1e9 - producer_wait / 1000)
+        failed = self.repository.take_insert_failures() if hasattr(self.repository, "take_insert_failures") else 0
+
+        metrics = PhaseMetrics(
+            server_time=total_time,
+            records=total_count,
+            wall_time=wall_s * 1000,
+            ops_per_sec=batch_count / wall_s if wall_s > 0 else 0.0,
+            rows_per_sec=total_count / wall_s if wall_s > 0 else 0.0,
+            fairness=1.0,
+            client_driver=f"pipeline-{inflight}" if inflight > 1 else "sequential",
+            insert_strategy=insert_strategy or getattr(self.repository, "insert_strategy", ""),
+            commit_time=commit_time,
+            commits=commits,
+            producer_wait_time=producer_wait,
+            failed_records=failed,
+            client_latency=client_ms / batch_count if batch_count else 0.0,
+            server_latency=total_time / batch_count if batch_count else 0.0,
+        )
+        metrics.attribute_latency((self._queue_wait_ms() - queue_before) / batch_count if batch_count else 0.0)
+        metrics.apply_histogram(histogram)
+        self.phase_metrics["Insert"] = metrics
+        self.latency_histograms["Insert"] = histogram
+        ProgressLogger.important_info(
+            f"Insert: {total_count} rows in {metrics.wall_time:.2f} ms, {metrics.rows_per_sec:.2f} rows/s "
+            f"({batch_count} batches, {inflight} in flight, {metrics.insert_strategy})"
+        )
+        if producer_wait:
+            ProgressLogger.important_info(
+                f"Insert: {producer_wait:.2f} ms idle waiting for the generator, excluded from wall time and rates"
+            )
+        self._log_latency("Insert", metrics)
+        if failed:
+            ProgressLogger.warn(f"Insert: {failed} records failed to insert")
+        return total_time, total_count
 
-    def _insert_data(self, users: List[Dict]) -> Tuple[float, int]:
+    @staticmethod
+    def _client_timed(insert: Callable[[Any], Tuple[List[str], float]]) -> Callable[[Any], Tuple[List[str], float, float]]:
+        def _call(chunk: Any) -> Tuple[List[str], float, float]:
+            with TimingOverhead.measure() as overhead:
+                started_ns = time.perf_counter_ns()
+                ids, elapsed = insert(chunk)
+                finished_ns = time.perf_counter_ns()
+            return ids, elapsed, (finished_ns - started_ns - overhead.ns) / 1e6
+        return _call
+
+    def _queue_wait_ms(self) -> float:
+        if not hasattr(self.repository, "pool_metrics"):
+            return 0.0
+        metrics = self.repository.pool_metrics()
+        return metrics.get("total_wait_ms", 0.0) + metrics.get("executor_wait_ms", 0.0)
+
+    @staticmethod
+    def _log_latency(operation: str, metrics: PhaseMetrics) -> None:
+        ProgressLogger.important_info(
+            f"{operation} latency: client {metrics.client_latency:.3f} ms = server {metrics.server_latency:.3f} "
+            f"+ queue {metrics.queue_time:.3f} + driver {metrics.driver_time:.3f} + unattributed {metrics.unattributed_time:.3f}; "
+            f"p50 {metrics.p50:.3f}, p99 {metrics.p99:.3f}, p99.9 {metrics.p999:.3f}, max {metrics.max_latency:.3f} ms"
+        )
+
+    def _commit_pending(self) -> Tuple[float, int]:
+        if not hasattr(self.repository, "commit_pending"):
+            return 0.0, 0
+        commit_time, commits = self.repository.commit_pending()
+        if commits:
+            ProgressLogger.important_info(f"Committed {commits} transactions in {commit_time:.2f} ms")
+        return commit_time, commits
+
+    @staticmethod
+    def _producer_wait(batches: Iterable[Any]) -> float:
+        return getattr(batches, "wait_time", 0.0)
+
+    def _insert_pipelined(self, batches: Iterable[Any], inflight: int,
+                          insert: Callable[[Any], Tuple[List[str], float, float]],
+                          histogram: LatencyHistogram) -> Tuple[float, int, int, float, float]:
         total_time = 0.0
         total_count = 0
-        batch_size = min(self.max_batch_size, len(users))
-
-        for i in range(0, len(users), batch_size):
-            chunk = users[i:i + batch_size]
-            ids, elapsed = self.repository.create_users_bulk(chunk)
-            total_time += elapsed
-            total_count += len(ids)
+        batch_count = 0
+        client_ms = 0.0
+        busy: List[Tuple[int, int]] = []
 
-        return total_time, total_count
-
-    def _fetch_all_users(self) -> Tuple[float, int, List[Dict[str, int]]]:
+        def _insert(chunk: Any) -> Tuple[List[str], float, float]:
+            started_ns = time.perf_counter_ns()
+            try:
+                return insert(chunk)
+            finally:
+                busy.append((started_ns, time.perf_counter_ns()))
+
+        def _collect(done) -> None:
+            nonlocal total_time, total_count, client_ms
+            for future in done:
+                ids, elapsed, latency = future.result()
+                total_time += elapsed
+                total_count += len(ids)
+                client_ms += latency
+                histogram.record(latency)
+
+        waited_before = self._producer_wait(batches)
+        started_ns = time.perf_counter_ns()
+        with ThreadPoolExecutor(max_workers=inflight, thread_name_prefix="insert") as executor:
+            pending = set()
+            for chunk in batches:
+                if len(pending) >= inflight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+                pending.add(executor.submit(_insert, chunk))
+                batch_count += 1
+            _collect(wait(pending).done)
+        idle_ms = (time.perf_counter_ns() - started_ns - self._busy_ns(busy)) / 1e6
+        producer_wait = min(self._producer_wait(batches) - waited_before, max(0.0, idle_ms))
+
+        return total_time, total_count, batch_count, client_ms, producer_wait
+
+    @staticmethod
+    def _busy_ns(intervals: List[Tuple[int, int]]) -> int:
+        busy = 0
+        covered = None
+        for start, end in sorted(intervals):
+            if covered is None or start > covered:
+                busy += end - start
+                covered = end
+            elif end > covered:
+                busy += end - covered
+                covered = end
+        return busy
+
+    def _insert_data(self, users: ClientDataset) -> Tuple[float, int]:
+        if self.payload_cache is None or getattr(self.repository, "payload_encoding", None) is None:
+            return self._insert_batches(users.iter_batches(self.max_batch_size))
+        spans = self._encode_data(users)
+        return self._insert_batches(
+            self._encoded_batches(users, spans), self.repository.create_users_encoded,
+            self.repository.encoded_insert_strategy
+        )
+
+    def _batch_spans(self, users: ClientDataset) -> Iterator[Tuple[int, int, int]]:
+        size = max(1, self.max_batch_size)
+        for view in users.views:
+            for start in range(0, len(view), size):
+                yield view.client_id, start, min(start + size, len(view))
+
+    def _payload_key(self, users: ClientDataset, span: Tuple[int, int, int]) -> Tuple[Any, ...]:
+        return (self.db_name, self.repository.payload_encoding, users.key, *span)
+
+    def _encode_data(self, users: ClientDataset) -> List[Tuple[int, int, int]]:
+        spans = list(self._batch_spans(users))
+        encoded_rows = 0
+        encoded_bytes = 0
+        replayed = 0
+        started_ns = time.perf_counter_ns()
+        for span in spans:
+            key = self._payload_key(users, span)
+            if self.payload_cache.get(key) is not None:
+                replayed += 1
+                continue
+            batch = self.repository.encode_batch(users.client(span[0]).get_batch(span[1], span[2]))
+            self.payload_cache.put(key, batch)
+            encoded_rows += batch.rows
+            encoded_bytes += batch.nbytes
+        wall_s = (time.perf_counter_ns() - started_ns) / 1e9
+
+        self.phase_metrics["Encode"] = PhaseMetrics(
+            records=encoded_rows,
+            wall_time=wall_s * 1000,
+            ops_per_sec=(len(spans) - replayed) / wall_s if wall_s > 0 else 0.0,
+            rows_per_sec=encoded_rows / wall_s if wall_s > 0 else 0.0,
+            client_driver="payload-cache",
+            insert_strategy=self.repository.payload_encoding,
+        )
+        ProgressLogger.important_info(
+            f"Encode: {encoded_rows} rows ({encoded_bytes / 1024 / 1024:.2f} MB) in {wall_s * 1000:.2f} ms, "
+            f"{replayed}/{len(spans)} batches replayed from cache"
+        )
+        return spans
+
+    def _encoded_batches(self, users: ClientDataset, spans: List[Tuple[int, int, int]]) -> Iterator[EncodedBatch]:
+        for span in spans:
+            batch = self.payload_cache.get(self._payload_key(users, span))
+            if batch is None:
+                ProgressLogger.warn(f"Payload for batch {span} was evicted, encoding it inside the insert phase")
+                batch = self.repository.encode_batch(users.client(span[0]).get_batch(span[1], span[2]))
+            yield batch
+
+    def _generate_batches_stream(self, records: int) -> Iterator[List[Dict]]:
+        record_type = self.config_manager.get("record_type")
         clients = self.config_manager.get("clients", 1)
-        total_time = total_records = 0
-        results = []
-
-        for cid in range(clients):
-            users, t = self.repository.get_all_users(client_id=cid)
-            users = users if isinstance(users, list) else []
-            total_time += t
-            total_records += len(users)
-            results.append({"client_id": cid, "records": len(users), "time": t})
+        seed = self.config_manager.get("seed")
+        client_sizes = self.distribution.client_record_counts(records, clients, seed)
+        for cid, count in enumerate(client_sizes):
+            yield from DataGenerator.generate_batches_stream(
+                count, cid, record_type, self.max_batch_size, seed, self.distribution
+            )
+
+    def _insert_data_streaming(self, records: int) -> Tuple[float, int]:
+        queue_depth = int(self.config_manager.get("stream_queue_depth", 4))
+        producer = BatchProducer(self._generate_batches_stream(records), queue_depth)
+        producer.start()
+        try:
+            insert_t, inserted = self._insert_batches(producer)
+        finally:
+            producer.stop()
+        ProgressLogger.important_info(
+            f"Streamed {inserted} records (queue depth {queue_depth}, waited {producer.wait_time:.2f} ms for generator)"
+        )
+        return insert_t, inserted
+
+    def _run_clients(self, operation: str, targets: List[int], method: str,
+                     **kwargs) -> Tuple[float, int, List[Dict[str, int]]]:
+        queue_before = self._queue_wait_ms()
+        timings = self.client_driver.run(self.repository, targets, method, kwargs)
+        metrics = PhaseMetrics.from_timings(timings, self.client_driver.name)
+        metrics.attribute_latency((self._queue_wait_ms() - queue_before) / len(timings) if timings else 0.0)
+        histogram = LatencyHistogram()
+        for timing in timings:
+            histogram.record(timing.wall_time)
+        metrics.apply_histogram(histogram)
+        metrics.commit_time, metrics.commits = self._commit_pending()
+        self.phase_metrics[operation] = metrics
+        self.latency_histograms[operation] = histogram
+        ProgressLogger.important_info(
+            f"{operation}: {metrics.ops_per_sec:.2f} ops/s, {metrics.rows_per_sec:.2f} rows/s, "
+            f"fairness {metrics.fairness:.3f} ({len(targets)} clients, {self.client_driver.name})"
+        )
+        return metrics.server_time, metrics.records, [t.to_result() for t in timings]
 
-        return (total_time / clients if clients else 0), total_records, results
+    def _fetch_all_users(self) -> Tuple[float, int, List[Dict[str, int]]]:
+        targets = self._target_clients(self.FETCH_PHASE)
+        result = self._run_clients("Select", targets, "get_all_users")
+        self._record_fetch_stats(self.phase_metrics["Select"])
+        self._log_latency("Select", self.phase_metrics["Select"])
+        return result
+
+    def _record_fetch_stats(self, metrics: PhaseMetrics) -> None:
+        if not hasattr(self.repository, "take_fetch_stats"):
+            return
+        stats = self.repository.take_fetch_stats()
+        metrics.fetch_mode = self.repository.fetch_mode
+        metrics.transfer_time = stats.mean_transfer_time()
+        metrics.decode_time = stats.mean_decode_time()
+        metrics.round_trips = stats.mean_round_trips()
+        metrics.first_row_time = stats.mean_first_row_time()
+        metrics.drain_time = stats.mean_drain_time()
+        metrics.attribute_latency()
+        ProgressLogger.important_info(
+            f"Select ({metrics.fetch_mode}): {stats.rows} rows in {stats.batches} batches, "
+            f"server {stats.server_time:.2f} ms, transfer {stats.transfer_time:.2f} ms, "
+            f"decode {stats.decode_time:.2f} ms, round trips {stats.round_trips}"
+        )
+        if stats.drain_time:
+            ProgressLogger.important_info(
+                f"Select ({metrics.fetch_mode}): first batch after {stats.first_row_time:.2f} ms, "
+                f"rows drained in {stats.drain_time:.2f} ms (server time keeps running while rows are drained)"
+            )
 
     def _update_users(self) -> Tuple[float, int, List[Dict[str, int]]]:
-        clients = self.config_manager.get("clients", 1)
-        total_time = total_updated = 0
-        results = []
-
+        targets = self._target_clients(self.UPDATE_PHASE)
         record_type = self.config_manager.get("record_type", RecordType.BIG.value)
-
-        for cid in range(clients):
-            updated, t = self.repository.update_users(client_id=cid, record_type=record_type)
-            total_time += t
-            total_updated += updated
-
-            results.append({"client_id": cid, "records": updated, "time": t})
-
-        return (total_time / clients if clients else 0), total_updated, results
+        result = self._run_clients("Update", targets, "update_users", record_type=record_type)
+        self._log_latency("Update", self.phase_metrics["Update"])
+        return result
 
     def _delete_users(self) -> Tuple[float, int, List[Dict[str, int]]]:
-        clients = self.config_manager.get("clients")
-        total_time = total_deleted = 0
-        results = []
-
+        targets = self._target_clients(self.DELETE_PHASE, unique=True)
         record_type = self.config_manager.get("record_type", RecordType.BIG.value)
+        result = self._run_clients("Delete", targets, "delete_users", record_type=record_type)
+        self._log_latency("Delete", self.phase_metrics["Delete"])
+        return result
 
-        for cid in range(clients):
-            deleted, t = self.repository.delete_users(client_id=cid, record_type=record_type)
-            total_time += t
-            total_deleted += deleted
+    @abstractmethod
+    def use_repository(self, name: str) -> None:
+        pass
 
-            results.append({"client_id": cid, "records": deleted, "time": t})
+    @abstractmethod
+    def get_workload_name(self, index_type: str, workload: str) -> str:
+        pass
 
-        return (total_time / clients), total_deleted, results
+    def prepare_workload(self, index_type: str, workload: str, users: Optional[ClientDataset]) -> None:
+        self.use_repository(self.get_workload_name(index_type or IndexType.NO_INDEXES.value, workload))
+        self.repository.clear_collection()
+        self._warm_up()
+        self.repository.setup_profiling()
+        if users is not None:
+            self._insert_data(users)
+        else:
+            self._insert_data_streaming(self.config_manager.get("records"))
+        self._check_index(index_type)
+
+    def run_open_loop(self, index_type: str, users: Optional[ClientDataset]) -> List[Dict]:
+        ProgressLogger.important_info(f"Preparing open-loop workload on {self.db_name}")
+        self.prepare_workload(index_type, "open_loop", users)
+
+        rates = [float(r) for r in str(self.config_manager.get("open_loop_rates", "10")).split(",") if r]
+        operations = [o for o in str(self.config_manager.get("open_loop_operations", "select")).split(",") if o]
+        generator = OpenLoopLoadGenerator(
+            repository=self.repository,
+            database=self.db_name,
+            dataset=users,
+            clients=self.config_manager.get("clients", 1),
+            record_type=self.config_manager.get("record_type", RecordType.BIG.value),
+            batch_size=self.max_batch_size,
+            max_workers=int(self.config_manager.get("open_loop_workers", 64)),
+            arrival=self.config_manager.get("open_loop_arrival", CONSTANT),
+            seed=self.config_manager.get("seed"),
+        )
+        levels = generator.sweep(operations, rates, float(self.config_manager.get("open_loop_duration", 10)))
+        self._commit_pending()
+        return [level.to_dict() for level in levels]
+
+    def run_workloads(self, index_type: str, users: Optional[ClientDataset]) -> List[Dict]:
+        records = self.config_manager.get("records")
+        dataset = users if users is not None else self._generate_users(records)
+        record_type = self.config_manager.get("record_type", RecordType.BIG.value)
+        duration = float(self.config_manager.get("workload_duration", 10))
+        operations = int(self.config_manager.get("workload_operations", 0))
+        threads = int(self.config_manager.get("workload_threads") or self.config_manager.get("clients", 1))
+        distribution = self.config_manager.get("workload_distribution")
+
+        rows = []
+        for name in [w.strip().lower() for w in str(self.config_manager.get("workload", "")).split(",") if w.strip()]:
+            spec = WORKLOAD_PRESETS[name]
+            if distribution:
+                spec = replace(spec, request_distribution=distribution)
+            ProgressLogger.important_info(f"Loading workload {name.upper()} on {self.db_name} ({records} records)")
+            self.use_repository(self.get_workload_name(index_type or IndexType.NO_INDEXES.value, f"workload_{name}"))
+            self.repository.clear_collection()
+            self._warm_up()
+            self.repository.setup_profiling()
+            engine = WorkloadEngine(
+                repository=self.repository,
+                database=self.db_name,
+                spec=spec,
+                dataset=dataset,
+                record_type=record_type,
+                threads=threads,
+                seed=self.config_manager.get("seed"),
+                key_field=getattr(self.repository, "KEY_FIELD", "id"),
+            )
+            engine.load(records, self.max_batch_size)
+            self._commit_pending()
+            self._check_index(index_type)
+
+            ProgressLogger.important_info(f"Running workload {name.upper()} on {self.db_name} with {threads} threads")
+            results = engine.run(duration=duration, operations=operations)
+            self._commit_pending()
+            for r in results:
+                ProgressLogger.important_info(
+                    f"Workload {name.upper()} {self.db_name} {r.operation}: {r.ops_per_sec:.2f} ops/s, "
+                    f"p50 {r.p50:.2f} ms, p99 {r.p99:.2f} ms, errors {r.errors}"
+                )
+            rows.extend(r.to_dict() for r in results)
+        return rows
 
     def test_fetch_all_users(
             self,
             iteration: int,
             index_type: IndexType,
             number_of_records: int,
-            users: List[Dict],
-    ) -> Tuple[float, float, int, List[Dict], Optional[List[Dict]]]:
+            users: Optional[ClientDataset],
+    ) -> Tuple[float, float, int, List[Dict], Optional[ClientDataset]]:
         set_current_iteration(iteration)
         if index_type:
             ProgressLogger.important_info(f"Testing {self.db_name} with {index_type.upper()} indexes")
@@ -107,14 +462,19 @@ class DatabaseTester:
 
         self.repository.clear_collection()
 
-        if users is None:
+        streaming = users is None and self.config_manager.get("insert_mode", "batch") == "stream"
+        if users is None and not streaming:
             users = self._generate_users(number_of_records)
             ProgressLogger.important_info(f"Generated {len(users)} records")
 
+        self._warm_up()
         self.repository.setup_profiling()
 
         ProgressLogger.important_info(f"Start insert data")
-        insert_t, inserted = self._insert_data(users)
+        if streaming:
+            insert_t, inserted = self._insert_data_streaming(number_of_records)
+        else:
+            insert_t, inserted = self._insert_data(users)
 
         ProgressLogger.important_info(f"Check indexes")
         self._check_index(index_type)
@@ -130,7 +490,7 @@ class DatabaseTester:
             iteration: int,
             index_type: IndexType,
             number_of_records: int,
-            users: List[Dict],
+            users: Optional[ClientDataset],
     ) -> Tuple[float, int, List[Dict]]:
         set_current_iteration(iteration)
         if index_type:
@@ -155,7 +515,7 @@ class DatabaseTester:
             iteration: int,
             index_type: IndexType,
             number_of_records: int,
-            users: List[Dict],
+            users: Optional[ClientDataset],
     ) -> Tuple[float, int, List[Dict]]:
         set_current_iteration(iteration)
         if index_type:
@@ -176,6 +536,8 @@ class DatabaseTester:
         return delete_t, deleted, results
 
     def close(self):
+        if hasattr(self, 'client_driver') and self.client_driver:
+            self.client_driver.close()
         if hasattr(self, 'repository') and self.repository:
             try:
                 self.repository.close()
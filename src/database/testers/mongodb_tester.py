@@ -1,8 +1,10 @@
-from typing import Optional, List, Dict
+from typing import Optional
 from .database_tester import DatabaseTester
 from ..common import IndexType
 from ..mongodb.mongodb_user_repository import MongoDBUserRepository
 from ..common.config_manager import ConfigManager
+from ..common.resource_registry import ResourceRegistry
+from ..data.client_dataset import ClientDataset
 from ..repositories.database_type import DatabaseType
 
 
@@ -14,33 +16,37 @@ class MongoDBTester(DatabaseTester):
         db_name = self.config_manager.get('mongodb_database')
         self.base_collection_name = self.config_manager.get('mongodb_collection')
 
-        repository = MongoDBUserRepository(
-            connection_str=connection_str,
-            db_name=db_name,
-            collection_name=self.base_collection_name,
-            config_manager=self.config_manager
-        )
+        self.connection = ResourceRegistry.mongodb_connection(connection_str, db_name, self.config_manager)
+        repository = self._create_repository(self.base_collection_name)
 
         super().__init__(repository,  self.db_type.value, max_batch_size, show_progress, config_manager)
 
     def get_collection_name(self, index_type: str, iteration: int) -> str:
         return f"{self.base_collection_name}_test_{index_type}_iter_{iteration}"
 
+    def get_workload_name(self, index_type: str, workload: str) -> str:
+        return f"{self.base_collection_name}_test_{index_type}_{workload}"
+
+    def _create_repository(self, name: str) -> MongoDBUserRepository:
+        return MongoDBUserRepository(
+            collection_name=name,
+            config_manager=self.config_manager,
+            connection=self.connection,
+        )
+
+    def use_repository(self, name: str) -> None:
+        previous = self.repository
+        self.repository = self._create_repository(name)
+        previous.close()
+
     def test_fetch_all_users(
         self,
         iteration: int,
         index_type: IndexType,
         number_of_records: int,
-        users: List[Dict],
+        users: Optional[ClientDataset],
     ):
-        collection_name = self.get_collection_name(index_type, iteration)
-
-        self.repository = MongoDBUserRepository(
-            connection_str=self.repository.conn.connection_str,
-            db_name=self.repository.conn.db_name,
-            collection_name=collection_name,
-            config_manager=self.config_manager
-        )
+        self.use_repository(self.get_collection_name(index_type, iteration))
 
         return super().test_fetch_all_users(
             iteration=iteration,
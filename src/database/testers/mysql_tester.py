@@ -1,7 +1,9 @@
-from typing import List, Dict
+from typing import Optional
 from .database_tester import DatabaseTester
 from ..mysql.mysql_user_repository import MySQLUserRepository
 from ..common.config_manager import ConfigManager
+from ..common.resource_registry import ResourceRegistry
+from ..data.client_dataset import ClientDataset
 from ..repositories.database_type import DatabaseType
 
 
@@ -13,21 +15,36 @@ class MySQLTester(DatabaseTester):
         self.connection_str = self.config_manager.get_mysql_connection_string()
         self.base_table_name = self.config_manager.get('mysql_table')
 
-        repository = MySQLUserRepository(None, config_manager=self.config_manager)
+        repository = self._create_repository(None)
         super().__init__(repository, self.db_type.value, max_batch_size, show_progress, self.config_manager)
 
     def get_table_name(self, index_type: str, iteration: int) -> str:
         return f"{self.base_table_name}_test_{index_type}_iter_{iteration}"
 
+    def get_workload_name(self, index_type: str, workload: str) -> str:
+        return f"{self.base_table_name}_test_{index_type}_{workload}"
+
+    def _create_repository(self, name: Optional[str]) -> MySQLUserRepository:
+        return MySQLUserRepository(
+            table_name=name,
+            query_executor=ResourceRegistry.mysql_executor(self.config_manager),
+            config_manager=self.config_manager,
+            connection=ResourceRegistry.mysql_connection(self.config_manager),
+        )
+
+    def use_repository(self, name: str) -> None:
+        previous = self.repository
+        self.repository = self._create_repository(name)
+        previous.close()
+
     def test_fetch_all_users(
             self,
             iteration: int,
             index_type: str,
             number_of_records: int,
-            users: List[Dict],
+            users: Optional[ClientDataset],
     ):
-        table_name = self.get_table_name(index_type or "no_indexes", iteration)
-        self.repository = MySQLUserRepository(table_name=table_name, config_manager=self.config_manager)
+        self.use_repository(self.get_table_name(index_type or "no_indexes", iteration))
 
         return super().test_fetch_all_users(
             iteration=iteration,
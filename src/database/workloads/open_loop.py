@@ -0,0 +1,175 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..common.timing_overhead import TimingOverhead
+from ..data.client_dataset import ClientDataset
+from ..repositories.user_repository import UserRepository
+from ..utils.logging_config import ProgressLogger
+
+CONSTANT = 'constant'
+POISSON = 'poisson'
+ARRIVAL_PROCESSES = (CONSTANT, POISSON)
+OPEN_LOOP_OPERATIONS = ('insert', 'select', 'update', 'delete')
+
+
+def arrival_offsets_ns(rate: float, duration: float, process: str, rng: np.random.Generator) -> np.ndarray:
+    if rate <= 0 or duration <= 0:
+        return np.empty(0, dtype=np.int64)
+    if process == POISSON:
+        expected = int(rate * duration * 1.2) + 16
+        offsets = np.cumsum(rng.exponential(1.0 / rate, size=expected))
+        offsets = offsets[offsets < duration]
+    else:
+        offsets = np.arange(int(rate * duration)) / rate
+    return (offsets * 1e9).astype(np.int64)
+
+
+@dataclass
+class OpenLoopLevelResult:
+    database: str
+    operation: str
+    arrival: str
+    offered_rate: float
+    achieved_rate: float
+    requests: int
+    errors: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    service_p50: float
+    service_p99: float
+    server_time: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class OpenLoopLoadGenerator:
+    def __init__(
+            self,
+            repository: UserRepository,
+            database: str,
+            dataset: Optional[ClientDataset],
+            clients: int,
+            record_type: str,
+            batch_size: int,
+            max_workers: int,
+            arrival: str = CONSTANT,
+            seed: Optional[int] = None
+    ):
+        self.repository = repository
+        self.database = database
+        self.dataset = dataset
+        self.clients = max(1, clients)
+        self.record_type = record_type
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.arrival = arrival
+        self.rng = np.random.default_rng(seed)
+
+    def _operation(self, operation: str) -> Callable[[int], Any]:
+        if operation == 'insert':
+            return lambda cid: self.repository.create_users_bulk(self._insert_batch(cid))
+        if operation == 'select':
+            return lambda cid: self.repository.get_all_users(client_id=cid)
+        if operation == 'update':
+            return lambda cid: self.repository.update_users(client_id=cid, record_type=self.record_type)
+        if operation == 'delete':
+            return lambda cid: self.repository.delete_users(client_id=cid, record_type=self.record_type)
+        raise ValueError(f"Unknown open-loop operation: {operation}")
+
+    def _insert_batch(self, client_id: int) -> List[Dict[str, Any]]:
+        view = self.dataset.client(client_id)
+        return view.get_batch(0, min(self.batch_size, len(view)))
+
+    @staticmethod
+    def _sleep_until(deadline_ns: int) -> None:
+        while True:
+            remaining = deadline_ns - time.perf_counter_ns()
+            if remaining <= 0:
+                return
+            if remaining > 2_000_000:
+                time.sleep((remaining - 1_000_000) / 1e9)
+
+    def run_level(self, operation: str, rate: float, duration: float) -> OpenLoopLevelResult:
+        if operation == 'insert' and self.dataset is None:
+            raise ValueError("Open-loop insert needs a pre-generated dataset")
+        call = self._operation(operation)
+        offsets = arrival_offsets_ns(rate, duration, self.arrival, self.rng)
+        targets = self.rng.integers(0, self.clients, size=len(offsets))
+
+        latencies = np.zeros(len(offsets), dtype=np.int64)
+        service = np.zeros(len(offsets), dtype=np.int64)
+        server_times = np.zeros(len(offsets), dtype=np.float64)
+        failed = np.zeros(len(offsets), dtype=bool)
+        lock = threading.Lock()
+        last_finish = [0]
+
+        def _issue(slot: int, intended_ns: int, cid: int) -> None:
+            with TimingOverhead.measure() as overhead:
+                started = time.perf_counter_ns()
+                try:
+                    _, server_times[slot] = call(cid)
+                except Exception as e:
+                    failed[slot] = True
+                    ProgressLogger.error(f"Open-loop {operation} failed: {e}")
+                finished = time.perf_counter_ns()
+            latencies[slot] = finished - intended_ns - overhead.ns
+            service[slot] = finished - started - overhead.ns
+            with lock:
+                last_finish[0] = max(last_finish[0], finished)
+
+        start_ns = time.perf_counter_ns() + 10_000_000
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="open-loop") as executor:
+            for slot, (offset, cid) in enumerate(zip(offsets.tolist(), targets.tolist())):
+                intended = start_ns + offset
+                self._sleep_until(intended)
+                executor.submit(_issue, slot, intended, cid)
+
+        elapsed_s = (last_finish[0] - start_ns) / 1e9 if len(offsets) else 0.0
+        ok = ~failed
+        latency_ms = latencies[ok] / 1e6
+        service_ms = service[ok] / 1e6
+
+        def _pct(values: np.ndarray, q: float) -> float:
+            return float(np.percentile(values, q)) if len(values) else 0.0
+
+        return OpenLoopLevelResult(
+            database=self.database,
+            operation=operation,
+            arrival=self.arrival,
+            offered_rate=rate,
+            achieved_rate=int(ok.sum()) / elapsed_s if elapsed_s > 0 else 0.0,
+            requests=len(offsets),
+            errors=int(failed.sum()),
+            mean=float(latency_ms.mean()) if len(latency_ms) else 0.0,
+            p50=_pct(latency_ms, 50),
+            p90=_pct(latency_ms, 90),
+            p99=_pct(latency_ms, 99),
+            max=float(latency_ms.max()) if len(latency_ms) else 0.0,
+            service_p50=_pct(service_ms, 50),
+            service_p99=_pct(service_ms, 99),
+            server_time=float(server_times[ok].mean()) if ok.any() else 0.0,
+        )
+
+    def sweep(self, operations: List[str], rates: List[float], duration: float) -> List[OpenLoopLevelResult]:
+        results = []
+        for operation in operations:
+            for rate in rates:
+                ProgressLogger.important_info(
+                    f"Open-loop {self.database} {operation}: {rate:g} req/s ({self.arrival}) for {duration:g}s"
+                )
+                level = self.run_level(operation, rate, duration)
+                ProgressLogger.important_info(
+                    f"Open-loop {self.database} {operation}: achieved {level.achieved_rate:.2f} req/s, "
+                    f"p50 {level.p50:.2f} ms, p99 {level.p99:.2f} ms, errors {level.errors}"
+                )
+                results.append(level)
+        return results
@@ -0,0 +1,239 @@
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..common.timing_overhead import TimingOverhead
+from ..data.client_dataset import ClientDataset
+from ..data.distributions import UNIFORM, LATEST, zipf_weights
+from ..repositories.user_repository import UserRepository
+from ..utils.logging_config import ProgressLogger
+
+ZIPFIAN = 'zipfian'
+REQUEST_DISTRIBUTIONS = (UNIFORM, ZIPFIAN, LATEST)
+
+READ = 'read'
+UPDATE = 'update'
+INSERT = 'insert'
+SCAN = 'scan'
+READ_MODIFY_WRITE = 'read_modify_write'
+WORKLOAD_OPERATIONS = (READ, UPDATE, INSERT, SCAN, READ_MODIFY_WRITE)
+
+SCRAMBLE_PRIME = 2654435761
+
+
+@dataclass(frozen=True)
+class WorkloadSpec:
+    name: str
+    read: float = 0.0
+    update: float = 0.0
+    insert: float = 0.0
+    scan: float = 0.0
+    read_modify_write: float = 0.0
+    request_distribution: str = ZIPFIAN
+    zipf_skew: float = 0.99
+    max_scan_length: int = 100
+
+    def proportions(self) -> Dict[str, float]:
+        weights = {op: getattr(self, op) for op in WORKLOAD_OPERATIONS if getattr(self, op) > 0}
+        total = sum(weights.values())
+        if total <= 0:
+            raise ValueError(f"Workload {self.name} has no operations")
+        return {op: w / total for op, w in weights.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+WORKLOAD_PRESETS: Dict[str, WorkloadSpec] = {
+    'a': WorkloadSpec('a', read=0.5, update=0.5),
+    'b': WorkloadSpec('b', read=0.95, update=0.05),
+    'c': WorkloadSpec('c', read=1.0),
+    'd': WorkloadSpec('d', read=0.95, insert=0.05, request_distribution=LATEST),
+    'e': WorkloadSpec('e', scan=0.95, insert=0.05),
+    'f': WorkloadSpec('f', read=0.5, read_modify_write=0.5),
+}
+
+
+@dataclass
+class WorkloadOperationResult:
+    database: str
+    workload: str
+    operation: str
+    operations: int
+    errors: int
+    ops_per_sec: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    server_time: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class KeyChooser:
+    def __init__(self, distribution: str, record_count: int, skew: float):
+        self.distribution = distribution
+        self.record_count = max(1, record_count)
+        self._cdf = None
+        if distribution in (ZIPFIAN, LATEST):
+            self._cdf = np.cumsum(zipf_weights(self.record_count, skew))
+            self._cdf[-1] = 1.0
+
+    def _rank(self, rng: np.random.Generator) -> int:
+        return int(np.searchsorted(self._cdf, rng.random(), side='right'))
+
+    def next_key(self, rng: np.random.Generator, max_key: int) -> int:
+        if self.distribution == ZIPFIAN:
+            return (self._rank(rng) * SCRAMBLE_PRIME) % self.record_count + 1
+        if self.distribution == LATEST:
+            return max(1, max_key - self._rank(rng))
+        return int(rng.integers(1, max_key + 1))
+
+
+class WorkloadEngine:
+    def __init__(
+            self,
+            repository: UserRepository,
+            database: str,
+            spec: WorkloadSpec,
+            dataset: ClientDataset,
+            record_type: str,
+            threads: int,
+            seed: Optional[int] = None,
+            key_field: str = "id"
+    ):
+        self.repository = repository
+        self.database = database
+        self.spec = spec
+        self.dataset = dataset
+        self.record_type = record_type
+        self.threads = max(1, threads)
+        self.seed = seed
+        self.key_field = key_field
+        self.proportions = spec.proportions()
+        self.record_count = 0
+        self._max_key = 0
+        self._key_lock = threading.Lock()
+
+    def _record(self, key: int) -> Dict[str, Any]:
+        client_id = key % self.dataset.num_clients
+        view = self.dataset.client(client_id)
+        position = (key // self.dataset.num_clients) % len(view)
+        record = view.get_batch(position, position + 1)[0]
+        record[self.key_field] = key
+        return record
+
+    def load(self, records: int, batch_size: int) -> float:
+        total_time = 0.0
+        for start in range(1, records + 1, batch_size):
+            stop = min(start + batch_size, records + 1)
+            _, elapsed = self.repository.create_users_bulk([self._record(key) for key in range(start, stop)])
+            total_time += elapsed
+        self.record_count = records
+        self._max_key = records
+        return total_time
+
+    def _next_insert_key(self) -> int:
+        with self._key_lock:
+            self._max_key += 1
+            return self._max_key
+
+    def _operations(self, chooser: KeyChooser) -> Dict[str, Callable[[np.random.Generator], float]]:
+        def _read(rng):
+            return self.repository.read_user(chooser.next_key(rng, self._max_key))[1]
+
+        def _update(rng):
+            return self.repository.update_user(chooser.next_key(rng, self._max_key), self.record_type)[1]
+
+        def _insert(rng):
+            return self.repository.insert_user(self._record(self._next_insert_key()))[1]
+
+        def _scan(rng):
+            length = int(rng.integers(1, self.spec.max_scan_length + 1))
+            return self.repository.scan_users(chooser.next_key(rng, self._max_key), length)[1]
+
+        def _read_modify_write(rng):
+            key = chooser.next_key(rng, self._max_key)
+            _, read_time = self.repository.read_user(key)
+            _, update_time = self.repository.update_user(key, self.record_type)
+            return read_time + update_time
+
+        return {
+            READ: _read,
+            UPDATE: _update,
+            INSERT: _insert,
+            SCAN: _scan,
+            READ_MODIFY_WRITE: _read_modify_write,
+        }
+
+    def run(self, duration: float = 0.0, operations: int = 0) -> List[WorkloadOperationResult]:
+        if self.record_count <= 0:
+            raise ValueError("Workload needs loaded records, call load() first")
+        chooser = KeyChooser(self.spec.request_distribution, self.record_count, self.spec.zipf_skew)
+        handlers = self._operations(chooser)
+        names = list(self.proportions)
+        probabilities = np.array([self.proportions[n] for n in names])
+
+        seeds = np.random.SeedSequence(self.seed).spawn(self.threads)
+        quotas = [operations // self.threads + (1 if i < operations % self.threads else 0) for i in range(self.threads)]
+        samples: List[Dict[str, List]] = [{n: [] for n in names} for _ in range(self.threads)]
+        barrier = threading.Barrier(self.threads + 1)
+        deadline = [0]
+
+        def _worker(index: int) -> None:
+            rng = np.random.default_rng(seeds[index])
+            latencies = samples[index]
+            barrier.wait()
+            done = 0
+            while (operations and done < quotas[index]) or (not operations and time.perf_counter_ns() < deadline[0]):
+                name = names[int(rng.choice(len(names), p=probabilities))]
+                try:
+                    with TimingOverhead.measure() as overhead:
+                        started = time.perf_counter_ns()
+                        server_time = handlers[name](rng)
+                        finished = time.perf_counter_ns()
+                    latencies[name].append((finished - started - overhead.ns, server_time))
+                except Exception as e:
+                    latencies[name].append((-1, 0.0))
+                    ProgressLogger.error(f"Workload {self.spec.name} {name} failed: {e}")
+                done += 1
+
+        workers = [threading.Thread(target=_worker, args=(i,), name=f"workload-{i}") for i in range(self.threads)]
+        for w in workers:
+            w.start()
+        deadline[0] = time.perf_counter_ns() + int(duration * 1e9)
+        started_ns = time.perf_counter_ns()
+        barrier.wait()
+        for w in workers:
+            w.join()
+        elapsed_s = (time.perf_counter_ns() - started_ns) / 1e9
+
+        return [self._summarize(name, [s for t in samples for s in t[name]], elapsed_s) for name in names]
+
+    def _summarize(self, operation: str, samples: List, elapsed_s: float) -> WorkloadOperationResult:
+        latencies = np.array([s[0] for s in samples if s[0] >= 0], dtype=np.int64) / 1e6
+        server_times = [s[1] for s in samples if s[0] >= 0]
+
+        def _pct(q: float) -> float:
+            return float(np.percentile(latencies, q)) if len(latencies) else 0.0
+
+        return WorkloadOperationResult(
+            database=self.database,
+            workload=self.spec.name,
+            operation=operation,
+            operations=len(latencies),
+            errors=len(samples) - len(latencies),
+            ops_per_sec=len(latencies) / elapsed_s if elapsed_s > 0 else 0.0,
+            mean=float(latencies.mean()) if len(latencies) else 0.0,
+            p50=_pct(50),
+            p90=_pct(90),
+            p99=_pct(99),
+            max=float(latencies.max()) if len(latencies) else 0.0,
+            server_time=float(np.mean(server_times)) if server_times else 0.0,
+        )
@@ -5,10 +5,15 @@ import json
 import csv
 import argparse
 from datetime import datetime
-from typing import Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional
 
+from database.common.latency_histogram import LatencyHistogram
 from database.utils.logging_config import ProgressLogger
 
+PERCENTILE_DATABASES = ('MongoDB', 'MySQL')
+PERCENTILE_OPERATIONS = (('Insert', 'Insert'), ('Select', 'Fetch'), ('Update', 'Update'), ('Delete', 'Delete'))
+PERCENTILE_COLUMNS = (('p50', 'p50'), ('p90', 'p90'), ('p99', 'p99'), ('p999', 'p99.9'), ('max', 'max'))
+
 
 class ReportGenerator:
     @staticmethod
@@ -48,6 +53,18 @@ class ReportGenerator:
         except Exception:
             return 0, 0, 0, 0, 0, 0, 0, 0
 
+    @staticmethod
+    def extract_latency_percentiles(histograms_path: str) -> Dict[Tuple[str, str], Dict[str, float]]:
+        try:
+            with open(histograms_path, 'r', encoding='utf-8') as file:
+                merged = json.load(file).get('merged', [])
+            return {
+                (entry['database'], entry['operation']): LatencyHistogram.from_dict(entry['histogram']).summary()
+                for entry in merged
+            }
+        except Exception:
+            return {}
+
     @staticmethod
     def get_absolute_results_path(relative_path: str) -> str:
         return relative_path if os.path.isabs(relative_path) else os.path.join('results', relative_path)
@@ -86,6 +103,11 @@ class ReportGenerator:
             'MongoDB Insert', 'MongoDB Fetch', 'MongoDB Update', 'MongoDB Delete',
             'MySQL Insert', 'MySQL Fetch', 'MySQL Update', 'MySQL Delete',
             'Porownanie Insert', 'Porownanie Fetch', 'Porownanie Update', 'Porownanie Delete'
+        ] + [
+            f"{database} {label} {p_label}"
+            for database in PERCENTILE_DATABASES
+            for _, label in PERCENTILE_OPERATIONS
+            for _, p_label in PERCENTILE_COLUMNS
         ]
 
         summary_lines = [
@@ -117,12 +139,22 @@ class ReportGenerator:
                 index_type_name = folder.split('_', 1)[1] if '_' in folder else folder
                 formatted_index_type = cls.prettify_index_type(index_type_name)
 
+                percentiles = cls.extract_latency_percentiles(
+                    os.path.join(full_path, folder, f'latency_histograms_{record_count}.json')
+                )
+                percentile_values = [
+                    f"{percentiles.get((database, operation), {}).get(column, 0):.3f}"
+                    for database in PERCENTILE_DATABASES
+                    for operation, _ in PERCENTILE_OPERATIONS
+                    for column, _ in PERCENTILE_COLUMNS
+                ]
+
                 writer.writerow([
                     formatted_index_type,
                     f"{mongodb_insert_time:.2f}", f"{mongodb_fetch_time:.2f}", f"{mongodb_update_time:.2f}", f"{mongodb_delete_time:.2f}",
                     f"{mysql_insert_time:.2f}", f"{mysql_fetch_time:.2f}", f"{mysql_update_time:.2f}", f"{mysql_delete_time:.2f}",
                     insert_cmp, fetch_cmp, update_cmp, delete_cmp
-                ])
+                ] + percentile_values)
 
                 summary_lines.extend([
                     f"Typ indeksu: {formatted_index_type}",
@@ -136,6 +168,12 @@ class ReportGenerator:
                     if comparison != 'N/A':
                         summary_lines.append(f"  {label}: {comparison}")
 
+                for (database, operation), summary in sorted(percentiles.items()):
+                    summary_lines.append(
+                        f"  {database} {operation} opóźnienie klienta: "
+                        + ", ".join(f"{p_label} {summary[column]:.3f} ms" for column, p_label in PERCENTILE_COLUMNS)
+                    )
+
                 summary_lines.extend(["", "-" * 80, ""])
 
             txt_file.write("\n".join(summary_lines))
@@ -12,7 +12,36 @@ from database.utils.logging_config import (
 from database.common.index_types import IndexType
 from database.common.record_types import RecordType
 from database.common.config_manager import ConfigManager
+from database.data.distributions import CLIENT_SIZE_DISTRIBUTIONS, VALUE_DISTRIBUTIONS, ACCESS_DISTRIBUTIONS
 from database.test_runner import TestRunner
+from database.testers.client_driver import CLIENT_DRIVERS
+from database.common.fetch_stats import DICT, TUPLE, STREAM, MONGO_FETCH_MODES
+from database.common.transaction_batcher import AUTOCOMMIT, TRANSACTION, BATCHES, COMMIT_UNITS, TRANSACTION_MODES
+from database.mongodb.mongodb_command_monitor import COMMAND, MONGO_TIMING_MODES
+from database.mongodb.mongodb_user_repository import ORDERED, MONGO_INSERT_MODES
+from database.mysql.mysql_bulk_loader import EXECUTEMANY, INSERT_STRATEGIES
+from database.workloads.open_loop import ARRIVAL_PROCESSES, OPEN_LOOP_OPERATIONS
+from database.workloads.workload_engine import WORKLOAD_PRESETS, REQUEST_DISTRIBUTIONS
+
+
+def check_transaction_writers(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.transaction_mode != TRANSACTION:
+        return
+    writers = {'--inflight-batches': max(1, args.inflight_batches)}
+    if args.client_driver == 'thread' and 'true' in (args.test_update.lower(), args.test_delete.lower()):
+        writers['--clients (thread client driver)'] = args.clients
+    if args.workload:
+        writers['--workload-threads'] = args.workload_threads or args.clients
+    write_operations = {'insert', 'update', 'delete'}
+    if args.open_loop.lower() == 'true' and write_operations & set(args.open_loop_operations.split(',')):
+        writers['--open-loop-workers'] = args.open_loop_workers
+    option, count = max(writers.items(), key=lambda item: item[1])
+    if count > args.mysql_pool_size:
+        parser.error(
+            f"--transaction-mode {TRANSACTION} keeps one MySQL pool connection per writer thread until commit, "
+            f"but {option} gives {count} writers and --mysql-pool-size is {args.mysql_pool_size}; "
+            f"raise --mysql-pool-size or lower {option.split()[0]}"
+        )
 
 
 def main():
@@ -28,6 +57,14 @@ def main():
     parser.add_argument('--clients', type=int, default=3, help='Number of parallel clients')
     parser.add_argument('--iterations', type=int, default=3, help='Number of test iterations')
     parser.add_argument('--mysql-pool-size', type=int, default=20, help='MySQL connection pool size')
+    parser.add_argument('--pool-warm-up', type=str, default='True',
+                        help='Open and validate all pool connections before measured work (True/False)')
+    parser.add_argument('--mysql-pool-timeout', type=float, default=30.0,
+                        help='Seconds to wait for a free MySQL pool connection before failing')
+    parser.add_argument('--mysql-pool-max-lifetime', type=float, default=0.0,
+                        help='Recycle MySQL pool connections older than this many seconds (0 = never)')
+    parser.add_argument('--mysql-pool-idle-timeout', type=float, default=0.0,
+                        help='Close MySQL pool connections idle longer than this many seconds (0 = never)')
     parser.add_argument('--mongo-pool-size', type=int, default=125, help='MongoDB connection pool size')
     parser.add_argument('--log-progress', type=str, default='True', help='Show progress (True/False)')
     parser.add_argument('--indexes-type', type=str, default=IndexType.ALL.value,
@@ -36,11 +73,101 @@ def main():
                         help=f'Record type ({RecordType.BIG.value}/{RecordType.SMALL.value}). Big records contain full personal data, small records contain only numeric value and client_id')
     parser.add_argument('--test-update', type=str, default='True', help='Test update operations (True/False)')
     parser.add_argument('--test-delete', type=str, default='True', help='Test delete operations (True/False)')
+    parser.add_argument('--client-driver', type=str, default='thread', choices=list(CLIENT_DRIVERS),
+                        help='How clients run fetch/update/delete: thread (concurrent, synchronized start), '
+                             'process (one process and repository per client), async (asyncio engine with '
+                             'aiomysql/AsyncMongoClient, one coroutine per client) or sequential')
+    parser.add_argument('--client-timeout', type=float, default=None,
+                        help='Seconds to wait for all client processes of a phase to report (process driver; '
+                             'a client process that dies is detected without it)')
+    parser.add_argument('--open-loop', type=str, default='False',
+                        help='Run open-loop latency-vs-load sweep after the standard tests (True/False)')
+    parser.add_argument('--open-loop-rates', type=str, default='10,50,100',
+                        help='Comma separated offered loads (requests/s) for the open-loop sweep')
+    parser.add_argument('--open-loop-operations', type=str, default='select,update',
+                        help=f'Comma separated open-loop operations ({", ".join(OPEN_LOOP_OPERATIONS)})')
+    parser.add_argument('--open-loop-duration', type=float, default=10.0, help='Seconds per open-loop load level')
+    parser.add_argument('--open-loop-arrival', type=str, default='constant', choices=list(ARRIVAL_PROCESSES),
+                        help='Request arrival process for the open-loop sweep')
+    parser.add_argument('--open-loop-workers', type=int, default=64,
+                        help='Maximum number of open-loop requests in flight')
+    parser.add_argument('--workload', type=str, default=None,
+                        help=f'Comma separated YCSB-style workload presets to run ({", ".join(WORKLOAD_PRESETS)})')
+    parser.add_argument('--workload-duration', type=float, default=10.0, help='Seconds per mixed workload')
+    parser.add_argument('--workload-operations', type=int, default=0,
+                        help='Operation count per mixed workload (overrides --workload-duration when > 0)')
+    parser.add_argument('--workload-threads', type=int, default=None,
+                        help='Threads issuing the mixed workload (defaults to --clients)')
+    parser.add_argument('--workload-distribution', type=str, default=None, choices=list(REQUEST_DISTRIBUTIONS),
+                        help='Override the key request distribution of the workload presets')
+    parser.add_argument('--mysql-insert-strategy', type=str, default=EXECUTEMANY, choices=list(INSERT_STRATEGIES),
+                        help='MySQL bulk insert path: executemany, multi_values (capped by max_allowed_packet), '
+                             'load_data (LOAD DATA LOCAL INFILE) or prepared (server-side prepared batches)')
+    parser.add_argument('--transaction-mode', type=str, default=AUTOCOMMIT, choices=list(TRANSACTION_MODES),
+                        help='Commit every write separately (autocommit) or group writes into explicit transactions')
+    parser.add_argument('--commit-interval', type=int, default=1,
+                        help='Commit a transaction after this many batches/rows (see --commit-unit)')
+    parser.add_argument('--commit-unit', type=str, default=BATCHES, choices=list(COMMIT_UNITS),
+                        help='Unit of --commit-interval')
+    parser.add_argument('--fetch-mode', type=str, default=DICT, choices=[DICT, TUPLE, STREAM],
+                        help='MySQL fetch path: buffered dict rows, buffered tuple rows, '
+                             'or unbuffered SSCursor streaming that counts and discards rows')
+    parser.add_argument('--fetch-size', type=int, default=10000, help='Rows per fetchmany() call in stream fetch mode')
+    parser.add_argument('--mongo-fetch-mode', type=str, default=DICT, choices=list(MONGO_FETCH_MODES),
+                        help='MongoDB fetch path: dict (default codec, list(find())), raw (RawBSONDocument) lists, '
+                             'or stream/raw_stream consumers that count documents without materialising them')
+    parser.add_argument('--mongo-batch-size', type=int, default=0,
+                        help='MongoDB cursor batch_size (0 = server default)')
+    parser.add_argument('--mongo-timing', type=str, default=COMMAND, choices=list(MONGO_TIMING_MODES),
+                        help='MongoDB timing source: command monitoring (duration_micros) or the database profiler (millis)')
+    parser.add_argument('--mongo-profiler-sample-rate', type=float, default=0.0,
+                        help='Fraction of MongoDB operations cross-checked against the profiler in command timing mode')
+    parser.add_argument('--mongo-projection', type=str, default=None,
+                        help='Comma separated fields returned by MongoDB fetches (default: whole document)')
+    parser.add_argument('--mongo-insert-mode', type=str, default=ORDERED, choices=list(MONGO_INSERT_MODES),
+                        help='MongoDB insert_many mode: ordered, unordered, or parallel (unordered sub-batches '
+                             'sent concurrently across the client pool)')
+    parser.add_argument('--mongo-insert-splits', type=int, default=4,
+                        help='Number of concurrent sub-batches per batch in parallel MongoDB insert mode')
+    parser.add_argument('--timing-max-samples', type=int, default=100000,
+                        help='Maximum MySQL per-statement timing samples kept per iteration (saved to statement_samples)')
+    parser.add_argument('--inflight-batches', type=int, default=1,
+                        help='Insert batches kept in flight concurrently across pooled connections (1 = sequential)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for test data generation (random when omitted)')
+    parser.add_argument('--insert-mode', type=str, default='batch', choices=['batch', 'stream'],
+                        help='Insert mode: batch (pre-generated dataset) or stream (generator thread feeding a bounded queue)')
+    parser.add_argument('--stream-queue-depth', type=int, default=4, help='Number of batches buffered in stream insert mode')
+    parser.add_argument('--dataset-cache', type=str, default='True', help='Reuse generated datasets from results/cache (True/False, only for runs with --seed)')
+    parser.add_argument('--generator-workers', type=int, default=None,
+                        help='Number of processes generating test data (defaults to CPU count)')
+    parser.add_argument('--client-size-dist', type=str, default='uniform', choices=list(CLIENT_SIZE_DISTRIBUTIONS),
+                        help='Distribution of record counts between clients (--records is the mean per client)')
+    parser.add_argument('--client-size-skew', type=float, default=1.2, help='Zipf exponent or Pareto shape for client sizes')
+    parser.add_argument('--value-dist', type=str, default='uniform', choices=list(VALUE_DISTRIBUTIONS),
+                        help='Distribution of generated values (SMALL value, BIG name/address/age)')
+    parser.add_argument('--value-skew', type=float, default=1.1, help='Zipf exponent for value popularity')
+    parser.add_argument('--access-dist', type=str, default='uniform', choices=list(ACCESS_DISTRIBUTIONS),
+                        help='Distribution used to pick target clients in fetch/update/delete phases '
+                             '(delete draws the same way but deletes each picked client once)')
+    parser.add_argument('--access-skew', type=float, default=1.1, help='Zipf exponent for access distribution')
+    parser.add_argument('--first-name-cardinality', type=int, default=0, help='Number of distinct first names (0 = built-in list)')
+    parser.add_argument('--last-name-cardinality', type=int, default=0, help='Number of distinct last names (0 = built-in list)')
+    parser.add_argument('--address-cardinality', type=int, default=0, help='Number of distinct addresses (0 = built-in list)')
+    parser.add_argument('--dataset-cache-size-mb', type=int, default=2048, help='Maximum total size of the dataset cache in MB')
+    parser.add_argument('--payload-cache', type=str, default='False',
+                        help='Encode insert batches once into their wire form and replay them across iterations (True/False)')
+    parser.add_argument('--payload-cache-size-mb', type=int, default=1024,
+                        help='Maximum in-memory size of encoded insert payloads in MB (least recently used are evicted)')
 
     args = parser.parse_args()
+    check_transaction_writers(parser, args)
 
     config_manager = ConfigManager(
         mysql_pool_size=args.mysql_pool_size,
+        pool_warm_up=args.pool_warm_up,
+        mysql_pool_timeout=args.mysql_pool_timeout,
+        mysql_pool_max_lifetime=args.mysql_pool_max_lifetime,
+        mysql_pool_idle_timeout=args.mysql_pool_idle_timeout,
         mongodb_pool_size=args.mongo_pool_size,
         records=args.records,
         batch_size=args.batch_size,
@@ -51,6 +178,51 @@ def main():
         record_type=args.record_type,
         test_update=args.test_update,
         test_delete=args.test_delete,
+        client_driver=args.client_driver,
+        client_timeout=args.client_timeout,
+        open_loop=args.open_loop,
+        open_loop_rates=args.open_loop_rates,
+        open_loop_operations=args.open_loop_operations,
+        open_loop_duration=args.open_loop_duration,
+        open_loop_arrival=args.open_loop_arrival,
+        open_loop_workers=args.open_loop_workers,
+        workload=args.workload,
+        workload_duration=args.workload_duration,
+        workload_operations=args.workload_operations,
+        workload_threads=args.workload_threads,
+        workload_distribution=args.workload_distribution,
+        mysql_insert_strategy=args.mysql_insert_strategy,
+        transaction_mode=args.transaction_mode,
+        commit_interval=args.commit_interval,
+        commit_unit=args.commit_unit,
+        fetch_mode=args.fetch_mode,
+        fetch_size=args.fetch_size,
+        mongo_fetch_mode=args.mongo_fetch_mode,
+        mongo_batch_size=args.mongo_batch_size,
+        mongo_projection=args.mongo_projection,
+        mongo_timing=args.mongo_timing,
+        mongo_profiler_sample_rate=args.mongo_profiler_sample_rate,
+        mongo_insert_mode=args.mongo_insert_mode,
+        mongo_insert_splits=args.mongo_insert_splits,
+        timing_max_samples=args.timing_max_samples,
+        inflight_batches=args.inflight_batches,
+        seed=args.seed,
+        insert_mode=args.insert_mode,
+        stream_queue_depth=args.stream_queue_depth,
+        dataset_cache=args.dataset_cache,
+        dataset_cache_size_mb=args.dataset_cache_size_mb,
+        payload_cache=args.payload_cache,
+        payload_cache_size_mb=args.payload_cache_size_mb,
+        generator_workers=args.generator_workers,
+        client_size_dist=args.client_size_dist,
+        client_size_skew=args.client_size_skew,
+        value_dist=args.value_dist,
+        value_skew=args.value_skew,
+        access_dist=args.access_dist,
+        access_skew=args.access_skew,
+        first_name_cardinality=args.first_name_cardinality,
+        last_name_cardinality=args.last_name_cardinality,
+        address_cardinality=args.address_cardinality,
     )
 
     show_progress = config_manager.get('show_progress')